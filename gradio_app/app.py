@@ -49,8 +49,25 @@ def send_message(temperature, timestamp, index, community_level, response_type,
         )
         history[-1][-1] = f"***数据库：{timestamp}，搜索方法：{QUERY_TYPES_CN[QUERY_TYPES.index(model)]}，社区层级：{community_level}。***\n"
         if stream:
-            for chunk in response.iter_lines(None):
-                choice = json.loads(chunk)["choices"][0]
+            event = None
+            for line in response.iter_lines(None, decode_unicode=True):
+                # server-sent events: "event: <name>" (optional) followed by "data: <json>", separated by blank lines
+                if not line:
+                    event = None
+                    continue
+                if line.startswith("event:"):
+                    event = line.removeprefix("event:").strip()
+                    continue
+                data = line.removeprefix("data:").strip()
+                if event == "error":
+                    history[-1][-1] += f"请求失败: {json.loads(data)['message']}"
+                    yield history
+                    continue
+                if event is not None:
+                    continue
+                if data == "[DONE]":
+                    break
+                choice = json.loads(data)["choices"][0]
                 if choice["finish_reason"]:
                     history[-1][-1] = f"***数据库：{timestamp}，搜索方法：{QUERY_TYPES_CN[QUERY_TYPES.index(model)]}，社区层级：{community_level}。***\n"
                 history[-1][-1] += choice["delta"]["content"]
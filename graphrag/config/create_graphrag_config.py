@@ -350,6 +350,9 @@ def create_graphrag_config(
                 connection_string=reader.str(Fragment.conn_string),
                 storage_account_blob_url=reader.str(Fragment.storage_account_blob_url),
                 container_name=reader.str(Fragment.container_name),
+                concurrency=reader.int("concurrency") or defs.INPUT_CONCURRENCY,
+                streaming=reader.bool("streaming") or defs.INPUT_STREAMING,
+                batch_size=reader.int("batch_size") or defs.INPUT_BATCH_SIZE,
             )
         with reader.envvar_prefix(Section.cache), reader.use(values.get("cache")):
             c_type = reader.str(Fragment.type)
@@ -539,6 +542,11 @@ def create_graphrag_config(
                 reduce_max_tokens=reader.int("reduce_max_tokens")
                 or defs.GLOBAL_SEARCH_REDUCE_MAX_TOKENS,
                 concurrency=reader.int("concurrency") or defs.GLOBAL_SEARCH_CONCURRENCY,
+                map_deadline=reader.float("map_deadline")
+                or defs.GLOBAL_SEARCH_MAP_DEADLINE,
+                map_quorum=reader.float("map_quorum") or defs.GLOBAL_SEARCH_MAP_QUORUM,
+                map_min_score=reader.int("map_min_score")
+                or defs.GLOBAL_SEARCH_MAP_MIN_SCORE,
             )
 
         encoding_model = reader.str(Fragment.encoding_model) or defs.ENCODING_MODEL
@@ -65,6 +65,9 @@ INPUT_FILE_ENCODING = "utf-8"
 INPUT_TEXT_COLUMN = "text"
 INPUT_CSV_PATTERN = ".*\\.csv$"
 INPUT_TEXT_PATTERN = ".*\\.txt$"
+INPUT_CONCURRENCY = 32
+INPUT_STREAMING = False
+INPUT_BATCH_SIZE = 1000
 PARALLELIZATION_STAGGER = 0.3
 PARALLELIZATION_NUM_THREADS = 50
 NODE2VEC_ENABLED = False
@@ -104,3 +107,6 @@ GLOBAL_SEARCH_DATA_MAX_TOKENS = 12_000
 GLOBAL_SEARCH_MAP_MAX_TOKENS = 1000
 GLOBAL_SEARCH_REDUCE_MAX_TOKENS = 2_000
 GLOBAL_SEARCH_CONCURRENCY = 32
+GLOBAL_SEARCH_MAP_DEADLINE = None
+GLOBAL_SEARCH_MAP_QUORUM = 1.0
+GLOBAL_SEARCH_MAP_MIN_SCORE = 0
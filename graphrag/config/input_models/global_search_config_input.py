@@ -14,3 +14,6 @@ class GlobalSearchConfigInput(TypedDict):
     map_max_tokens: NotRequired[int | str | None]
     reduce_max_tokens: NotRequired[int | str | None]
     concurrency: NotRequired[int | str | None]
+    map_deadline: NotRequired[float | str | None]
+    map_quorum: NotRequired[float | str | None]
+    map_min_score: NotRequired[int | str | None]
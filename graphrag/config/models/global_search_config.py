@@ -43,3 +43,15 @@ class GlobalSearchConfig(BaseModel):
         description="The number of concurrent requests.",
         default=defs.GLOBAL_SEARCH_CONCURRENCY,
     )
+    map_deadline: float | None = Field(
+        description="The number of seconds to wait for map responses before reducing the ones received so far.",
+        default=defs.GLOBAL_SEARCH_MAP_DEADLINE,
+    )
+    map_quorum: float = Field(
+        description="The fraction of map responses to wait for before starting the reduce.",
+        default=defs.GLOBAL_SEARCH_MAP_QUORUM,
+    )
+    map_min_score: int = Field(
+        description="The map points with a score not above this value are dropped before the reduce.",
+        default=defs.GLOBAL_SEARCH_MAP_MIN_SCORE,
+    )
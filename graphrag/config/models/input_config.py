@@ -58,3 +58,15 @@ class InputConfig(BaseModel):
     document_attribute_columns: list[str] = Field(
         description="The document attribute columns to use.", default=[]
     )
+    concurrency: int = Field(
+        description="The number of input files to read at once.",
+        default=defs.INPUT_CONCURRENCY,
+    )
+    streaming: bool = Field(
+        description="Whether to chunk the input documents in batches while they are loaded.",
+        default=defs.INPUT_STREAMING,
+    )
+    batch_size: int = Field(
+        description="The number of documents in a streamed input batch.",
+        default=defs.INPUT_BATCH_SIZE,
+    )
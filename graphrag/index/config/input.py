@@ -70,6 +70,22 @@ class PipelineInputConfig(BaseModel, Generic[T]):
     )
     """The encoding for the input files."""
 
+    concurrency: int | None = pydantic_Field(
+        description="The number of input files to read at once.", default=None
+    )
+    """The number of input files to read at once."""
+
+    streaming: bool | None = pydantic_Field(
+        description="Whether to chunk the input documents in batches while they are loaded.",
+        default=None,
+    )
+    """Whether to chunk the input documents in batches while they are loaded."""
+
+    batch_size: int | None = pydantic_Field(
+        description="The number of documents in a streamed input batch.", default=None
+    )
+    """The number of documents in a streamed input batch."""
+
 
 class PipelineCSVInputConfig(PipelineInputConfig[Literal[InputFileType.csv]]):
     """Represent the configuration for a CSV input."""
@@ -469,6 +469,9 @@ def _get_pipeline_input_config(
                 connection_string=settings.input.connection_string,
                 storage_account_blob_url=settings.input.storage_account_blob_url,
                 container_name=settings.input.container_name,
+                concurrency=settings.input.concurrency,
+                streaming=settings.input.streaming,
+                batch_size=settings.input.batch_size,
             )
         case InputFileType.text:
             return PipelineTextInputConfig(
@@ -479,6 +482,9 @@ def _get_pipeline_input_config(
                 connection_string=settings.input.connection_string,
                 storage_account_blob_url=settings.input.storage_account_blob_url,
                 container_name=settings.input.container_name,
+                concurrency=settings.input.concurrency,
+                streaming=settings.input.streaming,
+                batch_size=settings.input.batch_size,
             )
         case _:
             msg = f"Unknown input type: {file_type}"
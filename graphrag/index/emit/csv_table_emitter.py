@@ -8,6 +8,7 @@ import logging
 import pandas as pd
 
 from graphrag.index.storage import PipelineStorage
+from graphrag.index.utils import graphml_columns
 
 from .table_emitter import TableEmitter
 
@@ -29,5 +30,5 @@ class CSVTableEmitter(TableEmitter):
         log.info("emitting CSV table %s", filename)
         await self._storage.set(
             filename,
-            data.to_csv(),
+            graphml_columns(data).to_csv(),
         )
@@ -8,6 +8,7 @@ import logging
 import pandas as pd
 
 from graphrag.index.storage import PipelineStorage
+from graphrag.index.utils import graphml_columns
 
 from .table_emitter import TableEmitter
 
@@ -30,5 +31,7 @@ class JsonTableEmitter(TableEmitter):
         log.info("emitting JSON table %s", filename)
         await self._storage.set(
             filename,
-            data.to_json(orient="records", lines=True, force_ascii=False),
+            graphml_columns(data).to_json(
+                orient="records", lines=True, force_ascii=False
+            ),
         )
@@ -11,6 +11,7 @@ from pyarrow.lib import ArrowInvalid, ArrowTypeError
 
 from graphrag.index.storage import PipelineStorage
 from graphrag.index.typing import ErrorHandlerFn
+from graphrag.index.utils import encode_graph_columns
 
 from .table_emitter import TableEmitter
 
@@ -37,7 +38,8 @@ class ParquetTableEmitter(TableEmitter):
         filename = f"{name}.parquet"
         log.info("emitting parquet table %s", filename)
         try:
-            await self._storage.set(filename, data.to_parquet())
+            # graph columns are stored as arrow node and edge tables
+            await self._storage.set(filename, encode_graph_columns(data).to_parquet())
         except ArrowTypeError as e:
             log.exception("Error while emitting parquet table")
             self._on_error(
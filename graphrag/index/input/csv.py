@@ -5,16 +5,20 @@
 
 import logging
 import re
+from collections.abc import AsyncIterator
 from io import BytesIO
 from typing import cast
 
 import pandas as pd
 
+import graphrag.config.defaults as defs
 from graphrag.index.config import PipelineCSVInputConfig, PipelineInputConfig
 from graphrag.index.progress import ProgressReporter
 from graphrag.index.storage import PipelineStorage
 from graphrag.index.utils import gen_md5_hash
 
+from .file_loader import FileLoader
+
 log = logging.getLogger(__name__)
 
 DEFAULT_FILE_PATTERN = re.compile(r"(?P<filename>[^\\/]).csv$")
@@ -28,6 +32,20 @@ async def load(
     storage: PipelineStorage,
 ) -> pd.DataFrame:
     """Load csv inputs from a directory."""
+    batches = [batch async for batch in load_batches(config, progress, storage)]
+    result = pd.concat(batches)
+    total_files_log = f"Total number of unfiltered csv rows: {len(result)}"
+    log.info(total_files_log)
+    return result
+
+
+async def load_batches(
+    config: PipelineInputConfig,
+    progress: ProgressReporter | None,
+    storage: PipelineStorage,
+    batch_size: int | None = None,
+) -> AsyncIterator[pd.DataFrame]:
+    """Load csv inputs from a directory, yielding batches of about batch_size rows as they are read."""
     csv_config = cast(PipelineCSVInputConfig, config)
     log.info("Loading csv files from %s", csv_config.base_dir)
 
@@ -111,28 +129,27 @@ async def load(
         if config.file_pattern is not None
         else DEFAULT_FILE_PATTERN
     )
-    files = list(
-        storage.find(
-            file_pattern,
-            progress=progress,
-            file_filter=config.file_filter,
-        )
+    files = storage.find(
+        file_pattern,
+        progress=progress,
+        file_filter=config.file_filter,
     )
-
-    if len(files) == 0:
+    loader = FileLoader(
+        load_file, config.concurrency or defs.INPUT_CONCURRENCY, "csv file"
+    )
+    batch: list[pd.DataFrame] = []
+    num_rows = 0
+    async for loaded in loader.load(files):
+        batch.extend(loaded)
+        num_rows += sum(len(data) for data in loaded)
+        if batch_size is not None and num_rows >= batch_size:
+            yield pd.concat(batch)
+            batch = []
+            num_rows = 0
+
+    if loader.num_files == 0:
         msg = f"No CSV files found in {config.base_dir}"
         raise ValueError(msg)
-
-    files_loaded = []
-
-    for file, group in files:
-        try:
-            files_loaded.append(await load_file(file, group))
-        except Exception:  # noqa: BLE001 (catching Exception is fine here)
-            log.warning("Warning! Error loading csv file %s. Skipping...", file)
-
-    log.info("Found %d csv files, loading %d", len(files), len(files_loaded))
-    result = pd.concat(files_loaded)
-    total_files_log = f"Total number of unfiltered csv rows: {len(result)}"
-    log.info(total_files_log)
-    return result
+    log.info("Found %d csv files, loading %d", loader.num_files, loader.num_loaded)
+    if batch:
+        yield pd.concat(batch)
@@ -0,0 +1,70 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""A module containing the FileLoader class, used by the input loaders to read files concurrently."""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from itertools import islice
+from typing import Any, Generic, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class FileLoader(Generic[T]):
+    """Load the files found in a storage, up to `concurrency` files at once.
+
+    The found files are consumed lazily, so the first files are read while the storage is still
+    being searched. Files that fail to load are logged and skipped.
+    """
+
+    num_files: int
+    """The number of files found so far."""
+
+    num_loaded: int
+    """The number of files loaded so far."""
+
+    def __init__(
+        self,
+        load_file: Callable[[str, dict | None], Awaitable[T]],
+        concurrency: int,
+        description: str = "file",
+    ):
+        """Init method definition."""
+        if concurrency < 1:
+            msg = f"Concurrency must be positive, got {concurrency}"
+            raise ValueError(msg)
+        self._load_file = load_file
+        self._concurrency = concurrency
+        self._description = description
+        self.num_files = 0
+        self.num_loaded = 0
+
+    async def load(
+        self, files: Iterable[tuple[str, dict[str, Any]]]
+    ) -> AsyncIterator[list[T]]:
+        """Load the files a chunk at a time, yielding the loaded files of each chunk in order."""
+        found = iter(files)
+        while chunk := list(islice(found, self._concurrency)):
+            self.num_files += len(chunk)
+            results = await asyncio.gather(
+                *(self._load_file(path, group) for path, group in chunk),
+                return_exceptions=True,
+            )
+            loaded = []
+            for (path, _), result in zip(chunk, results, strict=True):
+                if isinstance(result, Exception):
+                    log.warning(
+                        "Warning! Error loading %s %s. Skipping...",
+                        self._description,
+                        path,
+                    )
+                elif isinstance(result, BaseException):
+                    raise result
+                else:
+                    loaded.append(result)
+            self.num_loaded += len(loaded)
+            yield loaded
@@ -4,30 +4,38 @@
 """A module containing load_input method definition."""
 
 import logging
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
 from pathlib import Path
 from typing import cast
 
 import pandas as pd
 
+import graphrag.config.defaults as defs
 from graphrag.config import InputConfig, InputType
 from graphrag.index.config import PipelineInputConfig
 from graphrag.index.progress import NullProgressReporter, ProgressReporter
 from graphrag.index.storage import (
     BlobPipelineStorage,
     FilePipelineStorage,
+    PipelineStorage,
 )
 
 from .csv import input_type as csv
 from .csv import load as load_csv
+from .csv import load_batches as load_csv_batches
 from .text import input_type as text
 from .text import load as load_text
+from .text import load_batches as load_text_batches
 
 log = logging.getLogger(__name__)
 loaders: dict[str, Callable[..., Awaitable[pd.DataFrame]]] = {
     text: load_text,
     csv: load_csv,
 }
+batch_loaders: dict[str, Callable[..., AsyncIterator[pd.DataFrame]]] = {
+    text: load_text_batches,
+    csv: load_csv_batches,
+}
 
 
 async def load_input(
@@ -40,6 +48,48 @@ async def load_input(
     log.info("loading input from root_dir=%s", config.base_dir)
     progress_reporter = progress_reporter or NullProgressReporter()
 
+    storage = _create_storage(config, root_dir)
+
+    if config.file_type in loaders:
+        progress = progress_reporter.child(
+            f"Loading Input ({config.file_type})", transient=False
+        )
+        loader = loaders[config.file_type]
+        results = await loader(config, progress, storage)
+        return cast(pd.DataFrame, results)
+
+    msg = f"Unknown input type {config.file_type}"
+    raise ValueError(msg)
+
+
+async def load_input_batches(
+    config: PipelineInputConfig | InputConfig,
+    progress_reporter: ProgressReporter | None = None,
+    root_dir: str | None = None,
+) -> AsyncIterator[pd.DataFrame]:
+    """Load the input data for a pipeline in batches, yielding each batch as soon as it is read."""
+    root_dir = root_dir or ""
+    log.info("streaming input from root_dir=%s", config.base_dir)
+    progress_reporter = progress_reporter or NullProgressReporter()
+    storage = _create_storage(config, root_dir)
+
+    if config.file_type not in batch_loaders:
+        msg = f"Unknown input type {config.file_type}"
+        raise ValueError(msg)
+
+    progress = progress_reporter.child(
+        f"Loading Input ({config.file_type})", transient=False
+    )
+    batch_size = config.batch_size or defs.INPUT_BATCH_SIZE
+    async for batch in batch_loaders[config.file_type](
+        config, progress, storage, batch_size
+    ):
+        yield batch
+
+
+def _create_storage(
+    config: PipelineInputConfig | InputConfig, root_dir: str
+) -> PipelineStorage:
     if config is None:
         msg = "No input specified!"
         raise ValueError(msg)
@@ -56,7 +106,7 @@ async def load_input(
             ):
                 msg = "Connection string or storage account blob url required for blob storage"
                 raise ValueError(msg)
-            storage = BlobPipelineStorage(
+            return BlobPipelineStorage(
                 connection_string=config.connection_string,
                 storage_account_blob_url=config.storage_account_blob_url,
                 container_name=config.container_name,
@@ -64,22 +114,11 @@ async def load_input(
             )
         case InputType.file:
             log.info("using file storage for input")
-            storage = FilePipelineStorage(
+            return FilePipelineStorage(
                 root_dir=str(Path(root_dir) / (config.base_dir or ""))
             )
         case _:
             log.info("using file storage for input")
-            storage = FilePipelineStorage(
+            return FilePipelineStorage(
                 root_dir=str(Path(root_dir) / (config.base_dir or ""))
             )
-
-    if config.file_type in loaders:
-        progress = progress_reporter.child(
-            f"Loading Input ({config.file_type})", transient=False
-        )
-        loader = loaders[config.file_type]
-        results = await loader(config, progress, storage)
-        return cast(pd.DataFrame, results)
-
-    msg = f"Unknown input type {config.file_type}"
-    raise ValueError(msg)
@@ -5,16 +5,20 @@
 
 import logging
 import re
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any
 
 import pandas as pd
 
+import graphrag.config.defaults as defs
 from graphrag.index.config import PipelineInputConfig
 from graphrag.index.progress import ProgressReporter
 from graphrag.index.storage import PipelineStorage
 from graphrag.index.utils import gen_md5_hash
 
+from .file_loader import FileLoader
+
 DEFAULT_FILE_PATTERN = re.compile(
     r".*[\\/](?P<source>[^\\/]+)[\\/](?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})_(?P<author>[^_]+)_\d+\.txt"
 )
@@ -28,6 +32,17 @@ async def load(
     storage: PipelineStorage,
 ) -> pd.DataFrame:
     """Load text inputs from a directory."""
+    batches = [batch async for batch in load_batches(config, progress, storage)]
+    return pd.concat(batches, ignore_index=True) if batches else pd.DataFrame()
+
+
+async def load_batches(
+    config: PipelineInputConfig,
+    progress: ProgressReporter | None,
+    storage: PipelineStorage,
+    batch_size: int | None = None,
+) -> AsyncIterator[pd.DataFrame]:
+    """Load text inputs from a directory, yielding batches of about batch_size documents as they are read."""
 
     async def load_file(
         path: str, group: dict | None = None, _encoding: str = "utf-8"
@@ -40,27 +55,27 @@ async def load(
         new_item["title"] = str(Path(path).name)
         return new_item
 
-    files = list(
-        storage.find(
-            re.compile(config.file_pattern),
-            progress=progress,
-            file_filter=config.file_filter,
-        )
+    files = storage.find(
+        re.compile(config.file_pattern),
+        progress=progress,
+        file_filter=config.file_filter,
     )
-    if len(files) == 0:
+    loader = FileLoader(load_file, config.concurrency or defs.INPUT_CONCURRENCY)
+    batch: list[dict[str, Any]] = []
+    async for loaded in loader.load(files):
+        batch.extend(loaded)
+        if batch_size is not None and len(batch) >= batch_size:
+            yield pd.DataFrame(batch)
+            batch = []
+
+    if loader.num_files == 0:
         msg = f"No text files found in {config.base_dir}"
         raise ValueError(msg)
-    found_files = f"found text files from {config.base_dir}, found {files}"
-    log.info(found_files)
-
-    files_loaded = []
-
-    for file, group in files:
-        try:
-            files_loaded.append(await load_file(file, group))
-        except Exception:  # noqa: BLE001 (catching Exception is fine here)
-            log.warning("Warning! Error loading file %s. Skipping...", file)
-
-    log.info("Found %d files, loading %d", len(files), len(files_loaded))
-
-    return pd.DataFrame(files_loaded)
+    log.info(
+        "Found %d text files in %s, loading %d",
+        loader.num_files,
+        config.base_dir,
+        loader.num_loaded,
+    )
+    if batch:
+        yield pd.DataFrame(batch)
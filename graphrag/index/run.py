@@ -8,7 +8,7 @@ import json
 import logging
 import time
 import traceback
-from collections.abc import AsyncIterable
+from collections.abc import AsyncIterable, Callable
 from dataclasses import asdict
 from io import BytesIO
 from pathlib import Path
@@ -44,7 +44,7 @@ from .config import (
 )
 from .context import PipelineRunContext, PipelineRunStats
 from .emit import TableEmitterType, create_table_emitters
-from .input import load_input
+from .input import load_input, load_input_batches
 from .load_pipeline_config import load_pipeline_config
 from .progress import NullProgressReporter, ProgressReporter
 from .reporting import (
@@ -63,6 +63,10 @@ from .workflows import (
     create_workflow,
     load_workflows,
 )
+from .workflows.typing import WorkflowToRun
+from .workflows.v1.create_base_text_units import (
+    workflow_name as create_base_text_units,
+)
 
 log = logging.getLogger(__name__)
 
@@ -70,7 +74,7 @@ log = logging.getLogger(__name__)
 async def run_pipeline_with_config(
     config_or_path: PipelineConfig | str,
     workflows: list[PipelineWorkflowReference] | None = None,
-    dataset: pd.DataFrame | None = None,
+    dataset: pd.DataFrame | AsyncIterable[pd.DataFrame] | None = None,
     storage: PipelineStorage | None = None,
     cache: PipelineCache | None = None,
     callbacks: WorkflowCallbacks | None = None,
@@ -126,10 +130,12 @@ async def run_pipeline_with_config(
 
     async def _create_input(
         config: PipelineInputConfigTypes | None,
-    ) -> pd.DataFrame | None:
+    ) -> pd.DataFrame | AsyncIterable[pd.DataFrame] | None:
         if config is None:
             return None
 
+        if config.streaming:
+            return load_input_batches(config, progress_reporter, root_dir)
         return await load_input(config, progress_reporter, root_dir)
 
     def _create_postprocess_steps(
@@ -170,7 +176,7 @@ async def run_pipeline_with_config(
 
 async def run_pipeline(
     workflows: list[PipelineWorkflowReference],
-    dataset: pd.DataFrame,
+    dataset: pd.DataFrame | AsyncIterable[pd.DataFrame],
     storage: PipelineStorage | None = None,
     cache: PipelineCache | None = None,
     callbacks: WorkflowCallbacks | None = None,
@@ -192,6 +198,8 @@ async def run_pipeline(
             - text - The text of the document
             - title - The title of the document
             These must exist after any post process steps are run if there are any!
+            It can also be an async iterable of dataframes, to run create_base_text_units on each
+            batch of documents as it is loaded.
         - storage - The storage to use for the pipeline
         - cache - The cache to use for the pipeline
         - reporter - The reporter to use for the pipeline
@@ -250,7 +258,7 @@ async def run_pipeline(
             raise
 
     async def inject_workflow_data_dependencies(workflow: Workflow) -> None:
-        workflow.add_table(DEFAULT_INPUT_NAME, dataset)
+        workflow.add_table(DEFAULT_INPUT_NAME, input_table)
         deps = workflow_dependencies[workflow.name]
         log.info("dependencies for %s: %s", workflow.name, deps)
         for id in deps:
@@ -288,15 +296,56 @@ async def run_pipeline(
             await emitter.emit(workflow.name, output)
         return output
 
-    dataset = await _run_post_process_steps(
-        input_post_process_steps, dataset, context, callbacks
+    streamed_outputs: dict[str, pd.DataFrame] = {}
+    if isinstance(dataset, pd.DataFrame):
+        input_table = dataset
+    else:
+        streamed = _find_streamed_workflow(
+            workflows,
+            workflows_to_run,
+            workflow_dependencies,
+            input_post_process_steps,
+        )
+        if (
+            streamed is not None
+            and streamed.name is not None
+            and not (is_resume_run and await storage.has(f"{streamed.name}.parquet"))
+        ):
+
+            def create_streamed_workflow() -> Workflow:
+                return (
+                    load_workflows(
+                        [cast(PipelineWorkflowReference, streamed)],
+                        additional_verbs=additional_verbs,
+                        additional_workflows=additional_workflows,
+                        memory_profile=memory_profile,
+                    )
+                    .workflows[0]
+                    .workflow
+                )
+
+            workflow_start_time = time.time()
+            input_table, output = await _run_streamed_workflow(
+                create_streamed_workflow, dataset, context, callbacks
+            )
+            stats.workflows[streamed.name] = {
+                "overall": time.time() - workflow_start_time
+            }
+            streamed_outputs[streamed.name] = output
+        else:
+            input_table = pd.concat(
+                [batch async for batch in dataset], ignore_index=True
+            )
+
+    input_table = await _run_post_process_steps(
+        input_post_process_steps, input_table, context, callbacks
     )
 
     # Make sure the incoming data is valid
-    _validate_dataset(dataset)
+    _validate_dataset(input_table)
 
-    log.info("Final # of rows loaded: %s", len(dataset))
-    stats.num_documents = len(dataset)
+    log.info("Final # of rows loaded: %s", len(input_table))
+    stats.num_documents = len(input_table)
     last_workflow = "input"
 
     try:
@@ -318,6 +367,18 @@ async def run_pipeline(
                 log.info("Skipping %s because it already exists", workflow_name)
                 continue
 
+            if workflow_name in streamed_outputs:
+                # already run on the input batches while they were loaded
+                output = streamed_outputs.pop(workflow_name)
+                for emitter in emitters:
+                    await emitter.emit(workflow_name, output)
+                await dump_stats()
+                yield PipelineRunResult(workflow_name, output, None)
+                output = None
+                workflow.dispose()
+                workflow = None
+                continue
+
             stats.workflows[workflow_name] = {"overall": 0.0}
             await inject_workflow_data_dependencies(workflow)
 
@@ -408,6 +469,69 @@ async def _run_post_process_steps(
     return dataset
 
 
+def _find_streamed_workflow(
+    workflows: list[PipelineWorkflowReference],
+    workflows_to_run: list[WorkflowToRun],
+    workflow_dependencies: dict[str, list[str]],
+    post_process: list[PipelineWorkflowStep] | None,
+) -> PipelineWorkflowReference | None:
+    """Find the workflow that can be run on each batch of a streamed input.
+
+    That is create_base_text_units when documents are chunked one at a time (chunk_by=["id"]),
+    so that chunking a batch gives the same text units as chunking the whole dataset. Post
+    process steps may need the whole dataset, so the input isn't streamed if there are any.
+    """
+    if post_process:
+        return None
+    for workflow_to_run in workflows_to_run:
+        name = workflow_to_run.workflow.name
+        if (
+            name == create_base_text_units
+            and not workflow_dependencies.get(name)
+            and workflow_to_run.config.get("chunk_by") == ["id"]
+        ):
+            return next((w for w in workflows if w.name == name), None)
+    return None
+
+
+async def _run_streamed_workflow(
+    workflow_factory: Callable[[], Workflow],
+    batches: AsyncIterable[pd.DataFrame],
+    context: PipelineRunContext,
+    callbacks: WorkflowCallbacks,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Run a workflow on each batch of documents as it is loaded.
+
+    A workflow can only run once, so a new one is created for every batch.
+
+    Returns
+    -------
+        - dataset - All the loaded documents
+        - output - The workflow outputs, in the order of a run on the whole dataset
+    """
+    documents = []
+    outputs = []
+    async for batch in batches:
+        _validate_dataset(batch)
+        workflow = workflow_factory()
+        log.info("Running %s on %d documents", workflow.name, len(batch))
+        workflow.add_table(DEFAULT_INPUT_NAME, batch)
+        await workflow.run(context, callbacks)
+        documents.append(batch)
+        outputs.append(cast(pd.DataFrame, workflow.output()))
+        workflow.dispose()
+
+    if len(documents) == 0:
+        msg = "No documents loaded!"
+        raise ValueError(msg)
+    dataset = pd.concat(documents, ignore_index=True)
+    output = pd.concat(outputs, ignore_index=True)
+    # each batch is sorted by document id, sort the text units of all the batches the same way
+    document_ids = output["document_ids"].map(lambda ids: ids[0])
+    output = output.iloc[document_ids.argsort(kind="stable")]
+    return dataset, output.reset_index(drop=True)
+
+
 def _validate_dataset(dataset: pd.DataFrame):
     """Validate the dataset for the pipeline.
 
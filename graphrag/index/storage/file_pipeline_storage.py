@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import Any, cast
 
 import aiofiles
+import regex
 from aiofiles.os import remove
 from aiofiles.ospath import exists
 from datashaper import Progress
@@ -53,28 +54,42 @@ class FilePipelineStorage(PipelineStorage):
 
         search_path = Path(self._root_dir) / (base_dir or "")
         log.info("search %s for files matching %s", search_path, file_pattern.pattern)
-        all_files = list(search_path.rglob("**/*"))
+        prefix_pattern = _prefix_pattern(file_pattern)
         num_loaded = 0
-        num_total = len(all_files)
+        num_total = 0
         num_filtered = 0
-        for file in all_files:
-            match = file_pattern.match(f"{file}")
-            if match:
-                group = match.groupdict()
-                if item_filter(group):
-                    filename = f"{file}".replace(self._root_dir, "")
-                    if filename.startswith(os.sep):
-                        filename = filename[1:]
-                    yield (filename, group)
-                    num_loaded += 1
-                    if max_count > 0 and num_loaded >= max_count:
-                        break
+        for dirpath, dirnames, filenames in os.walk(search_path):
+            if prefix_pattern is not None:
+                # skip the directories no file path below could match
+                dirnames[:] = [
+                    name
+                    for name in dirnames
+                    if prefix_pattern.match(
+                        f"{Path(dirpath, name)}{os.sep}", partial=True
+                    )
+                ]
+            num_total += len(filenames)
+            for name in filenames:
+                file = Path(dirpath, name)
+                match = file_pattern.match(f"{file}")
+                if match:
+                    group = match.groupdict()
+                    if item_filter(group):
+                        filename = f"{file}".replace(self._root_dir, "")
+                        if filename.startswith(os.sep):
+                            filename = filename[1:]
+                        yield (filename, group)
+                        num_loaded += 1
+                        if max_count > 0 and num_loaded >= max_count:
+                            return
+                    else:
+                        num_filtered += 1
                 else:
                     num_filtered += 1
-            else:
-                num_filtered += 1
-            if progress is not None:
-                progress(_create_progress_status(num_loaded, num_filtered, num_total))
+                if progress is not None:
+                    progress(
+                        _create_progress_status(num_loaded, num_filtered, num_total)
+                    )
 
     async def get(
         self, key: str, as_bytes: bool | None = False, encoding: str | None = None
@@ -155,6 +170,23 @@ def create_file_storage(out_dir: str | None) -> PipelineStorage:
     return FilePipelineStorage(out_dir)
 
 
+def _prefix_pattern(file_pattern: re.Pattern[str]) -> regex.Pattern[str] | None:
+    """Compile the file pattern with the regex package, which can match path prefixes.
+
+    Returns None (no directory is skipped) if regex can't compile the pattern.
+    """
+    flags = 0
+    for flag in re.RegexFlag:
+        name = flag.name
+        if name is not None and file_pattern.flags & flag and hasattr(regex, name):
+            flags |= getattr(regex, name)
+    try:
+        return regex.compile(file_pattern.pattern, flags)
+    except regex.error:
+        log.debug("can't skip directories for file pattern %s", file_pattern.pattern)
+        return None
+
+
 def _create_progress_status(
     num_loaded: int, num_filtered: int, num_total: int
 ) -> Progress:
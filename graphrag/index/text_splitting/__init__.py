@@ -6,6 +6,7 @@
 from .check_token_limit import check_token_limit
 from .text_splitting import (
     DecodeFn,
+    EncodeBatchFn,
     EncodedText,
     EncodeFn,
     LengthFn,
@@ -20,6 +21,7 @@ from .text_splitting import (
 
 __all__ = [
     "DecodeFn",
+    "EncodeBatchFn",
     "EncodeFn",
     "EncodedText",
     "LengthFn",
@@ -19,6 +19,7 @@ from graphrag.index.utils import num_tokens_from_string
 EncodedText = list[int]
 DecodeFn = Callable[[EncodedText], str]
 EncodeFn = Callable[[str], EncodedText]
+EncodeBatchFn = Callable[[list[str]], list[EncodedText]]
 LengthFn = Callable[[str], int]
 
 log = logging.getLogger(__name__)
@@ -36,6 +37,8 @@ class Tokenizer:
     """ Function to decode a list of token ids to a string"""
     encode: EncodeFn
     """ Function to encode a string to a list of token ids"""
+    encode_batch: EncodeBatchFn | None = None
+    """ Optional function to encode several strings at once, e.g. tiktoken's encode_batch"""
 
 
 class TextSplitter(ABC):
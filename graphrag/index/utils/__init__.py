@@ -4,6 +4,13 @@
 """Utils methods definition."""
 
 from .dicts import dict_has_keys_with_types
+from .graph_table import (
+    decode_graph,
+    encode_graph,
+    encode_graph_columns,
+    graphml_columns,
+    to_graphml,
+)
 from .hashing import gen_md5_hash
 from .is_null import is_null
 from .load_graph import load_graph
@@ -14,12 +21,17 @@ from .uuid import gen_uuid
 
 __all__ = [
     "clean_str",
+    "decode_graph",
     "dict_has_keys_with_types",
+    "encode_graph",
+    "encode_graph_columns",
     "gen_md5_hash",
     "gen_uuid",
+    "graphml_columns",
     "is_null",
     "load_graph",
     "num_tokens_from_string",
     "string_from_tokens",
+    "to_graphml",
     "topological_sort",
 ]
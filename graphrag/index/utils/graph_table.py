@@ -0,0 +1,186 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Arrow node and edge tables used to store networkx graphs in workflow outputs."""
+
+import json
+import logging
+import struct
+from typing import Any
+
+import networkx as nx
+import pandas as pd
+import pyarrow as pa
+
+log = logging.getLogger(__name__)
+
+GRAPH_TABLE_MAGIC = b"GRAPHTBL"
+_LENGTH = struct.Struct("<Q")
+
+
+def graph_to_tables(graph: nx.Graph) -> tuple[pa.Table, pa.Table]:
+    """Convert a graph to a node table and an edge table.
+
+    The first column of the node table holds the node labels and the first two columns of the
+    edge table the edge endpoints, every other column is an attribute. Missing attributes are null.
+    """
+    labels, node_data = (
+        zip(*graph.nodes(data=True), strict=True) if len(graph) else ((), ())
+    )
+    edges = list(graph.edges(data=True))
+    sources = [source for source, _, _ in edges]
+    targets = [target for _, target, _ in edges]
+    edge_data = [data for _, _, data in edges]
+    metadata = {
+        b"directed": b"1" if graph.is_directed() else b"0",
+        # the graph attributes are missing from the networkx stubs
+        b"graph": json.dumps(getattr(graph, "graph", {})).encode(),
+    }
+    nodes = _table([list(labels)], list(node_data), metadata)
+    edge_table = _table([sources, targets], edge_data, None)
+    return nodes, edge_table
+
+
+def tables_to_graph(nodes: pa.Table, edges: pa.Table) -> nx.Graph:
+    """Build a graph from the tables created by graph_to_tables."""
+    metadata = nodes.schema.metadata or {}
+    attributes = json.loads(metadata[b"graph"]) if b"graph" in metadata else {}
+    graph_type = nx.DiGraph if metadata.get(b"directed") == b"1" else nx.Graph
+    graph = graph_type(**attributes)
+    graph.add_nodes_from(_rows(nodes, 1))
+    graph.add_edges_from(_rows(edges, 2))
+    return graph
+
+
+def encode_graph(graph: nx.Graph) -> bytes:
+    """Encode a graph as bytes, to store it in a parquet column.
+
+    Graphs whose attributes can't be stored in Arrow columns (e.g. an attribute that is a number
+    on some nodes and a string on others) are encoded as GraphML instead.
+    """
+    if graph.is_multigraph():
+        log.debug("storing multigraph as graphml")
+        return to_graphml(graph).encode()
+    try:
+        nodes, edges = graph_to_tables(graph)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError) as e:
+        log.debug("storing graph as graphml: %s", e)
+        return to_graphml(graph).encode()
+    node_bytes = _serialize(nodes)
+    return (
+        GRAPH_TABLE_MAGIC
+        + _LENGTH.pack(len(node_bytes))
+        + node_bytes
+        + _serialize(edges)
+    )
+
+
+def decode_graph(data: bytes) -> nx.Graph:
+    """Decode a graph encoded with encode_graph."""
+    if not is_encoded_graph(data):
+        return nx.parse_graphml(data)
+    start = len(GRAPH_TABLE_MAGIC)
+    (node_length,) = _LENGTH.unpack_from(data, start)
+    start += _LENGTH.size
+    buffer = pa.py_buffer(data)
+    nodes = pa.ipc.open_stream(buffer.slice(start, node_length)).read_all()
+    edges = pa.ipc.open_stream(buffer.slice(start + node_length)).read_all()
+    return tables_to_graph(nodes, edges)
+
+
+def is_encoded_graph(value: Any) -> bool:
+    """Check if a value is a graph encoded with encode_graph."""
+    return isinstance(value, bytes) and value.startswith(GRAPH_TABLE_MAGIC)
+
+
+def to_graphml(graph: str | bytes | nx.Graph) -> str:
+    """Get the GraphML text of a graph, e.g. for a snapshot."""
+    if isinstance(graph, str):
+        return graph
+    if isinstance(graph, bytes):
+        graph = decode_graph(graph)
+    return "\n".join(nx.generate_graphml(graph))
+
+
+def encode_graph_columns(data: pd.DataFrame) -> pd.DataFrame:
+    """Encode the columns of a table holding networkx graphs with encode_graph.
+
+    The input table is not modified.
+    """
+    columns = _graph_columns(data)
+    if not columns:
+        return data
+    data = data.copy(deep=False)
+    for column in columns:
+        data[column] = data[column].map(
+            lambda value: encode_graph(value) if isinstance(value, nx.Graph) else value
+        )
+    return data
+
+
+def graphml_columns(data: pd.DataFrame) -> pd.DataFrame:
+    """Convert the columns of a table holding networkx graphs to GraphML text.
+
+    The input table is not modified.
+    """
+    columns = _graph_columns(data)
+    if not columns:
+        return data
+    data = data.copy(deep=False)
+    for column in columns:
+        data[column] = data[column].map(
+            lambda value: to_graphml(value) if isinstance(value, nx.Graph) else value
+        )
+    return data
+
+
+def _graph_columns(data: pd.DataFrame) -> list[str]:
+    columns = []
+    for column in data.columns:
+        values = data[column]
+        if values.dtype != object:
+            continue
+        first = values.first_valid_index()
+        if first is not None and isinstance(values[first], nx.Graph):
+            columns.append(column)
+    return columns
+
+
+def _table(
+    key_columns: list[list[Any]],
+    records: list[dict[str, Any]],
+    metadata: dict[bytes, bytes] | None,
+) -> pa.Table:
+    names = list(dict.fromkeys(name for record in records for name in record))
+    arrays = [pa.array(column) for column in key_columns]
+    arrays += [pa.array([record.get(name) for record in records]) for name in names]
+    fields = [
+        pa.field(f"_key{index}", array.type)
+        for index, array in enumerate(arrays[: len(key_columns)])
+    ]
+    fields += [
+        pa.field(name, array.type)
+        for name, array in zip(names, arrays[len(key_columns) :], strict=True)
+    ]
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields, metadata=metadata))
+
+
+def _rows(table: pa.Table, num_keys: int):
+    names = table.column_names[num_keys:]
+    columns = [column.to_pylist() for column in table.columns]
+    for row in zip(*columns, strict=True):
+        yield (
+            *row[:num_keys],
+            {
+                name: value
+                for name, value in zip(names, row[num_keys:], strict=True)
+                if value is not None
+            },
+        )
+
+
+def _serialize(table: pa.Table) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
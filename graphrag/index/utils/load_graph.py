@@ -5,7 +5,16 @@
 
 import networkx as nx
 
+from .graph_table import decode_graph
 
-def load_graph(graphml: str | nx.Graph) -> nx.Graph:
-    """Load a graph from a graphml file or a networkx graph."""
-    return nx.parse_graphml(graphml) if isinstance(graphml, str) else graphml
+
+def load_graph(graphml: str | bytes | nx.Graph, copy: bool = False) -> nx.Graph:
+    """Load a graph from a graphml string, an encoded graph table or a networkx graph.
+
+    Set copy when the graph is going to be modified, so a networkx graph passed in is left unchanged.
+    """
+    if isinstance(graphml, nx.Graph):
+        return graphml.copy() if copy else graphml
+    if isinstance(graphml, bytes):
+        return decode_graph(graphml)
+    return nx.parse_graphml(graphml)
@@ -13,6 +13,7 @@ from .graph import (
     embed_graph,
     layout_graph,
     merge_graphs,
+    snapshot_clustered_graph,
     unpack_graph,
 )
 from .overrides import aggregate, concat, merge
@@ -38,6 +39,7 @@ __all__ = [
     "merge",
     "merge_graphs",
     "snapshot",
+    "snapshot_clustered_graph",
     "snapshot_rows",
     "spread_json",
     "summarize_descriptions",
@@ -7,9 +7,11 @@ from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from typing import Any
 
+import networkx as nx
 from datashaper import VerbCallbacks
 
 from graphrag.index.cache import PipelineCache
+from graphrag.index.utils import to_graphml
 
 ExtractedEntity = dict[str, Any]
 StrategyConfig = dict[str, Any]
@@ -29,7 +31,13 @@ class EntityExtractionResult:
     """Entity extraction result class definition."""
 
     entities: list[ExtractedEntity]
-    graphml_graph: str | None
+    graph: nx.Graph | str | None
+    """The extracted graph, custom strategies may return it as graphml."""
+
+    @property
+    def graphml_graph(self) -> str | None:
+        """The extracted graph as graphml."""
+        return to_graphml(self.graph) if self.graph is not None else None
 
 
 EntityExtractStrategy = Callable[
@@ -3,7 +3,7 @@
 
 """The Indexing Engine graph package root."""
 
-from .clustering import cluster_graph
+from .clustering import cluster_graph, snapshot_clustered_graph
 from .compute_edge_combined_degree import compute_edge_combined_degree
 from .create import DEFAULT_EDGE_ATTRIBUTES, DEFAULT_NODE_ATTRIBUTES, create_graph
 from .embed import embed_graph
@@ -32,5 +32,6 @@ __all__ = [
     "prepare_community_reports_claims",
     "prepare_community_reports_edges",
     "restore_community_hierarchy",
+    "snapshot_clustered_graph",
     "unpack_graph",
 ]
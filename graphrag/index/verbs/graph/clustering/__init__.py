@@ -4,5 +4,6 @@
 """The Indexing Engine graph clustering package root."""
 
 from .cluster_graph import GraphCommunityStrategyType, cluster_graph
+from .snapshot_clustered_graph import snapshot_clustered_graph
 
-__all__ = ["GraphCommunityStrategyType", "cluster_graph"]
+__all__ = ["GraphCommunityStrategyType", "cluster_graph", "snapshot_clustered_graph"]
@@ -27,18 +27,22 @@ def cluster_graph(
     column: str,
     to: str,
     level_to: str | None = None,
+    membership_to: str = "membership",
     **_kwargs,
 ) -> TableContainer:
     """
-    Apply a hierarchical clustering algorithm to a graph. The graph is expected to be in graphml format. The verb outputs a new column containing the clustered graph, and a new column containing the level of the graph.
+    Apply a hierarchical clustering algorithm to a graph. The graph is expected to be a networkx graph, or in graphml format. The verb outputs a new column containing the clustered graph, a new column containing the levels of the clustering, and a new column containing the community of every node at each level.
+
+    The clustered graph is a single graph for all the levels, the communities are kept in the membership column as a table with the columns label, level and cluster. unpack_graph and layout_graph read the levels from it.
 
     ## Usage
     ```yaml
     verb: cluster_graph
     args:
-        column: entity_graph # The name of the column containing the graph, should be a graphml graph
+        column: entity_graph # The name of the column containing the graph
         to: clustered_graph # The name of the column to output the clustered graph to
-        level_to: level # The name of the column to output the level to
+        level_to: level # The name of the column to output the levels to
+        membership_to: membership # Optional, the name of the column to output the community membership to, default: membership
         strategy: <strategy config> # See strategies section below
     ```
 
@@ -58,70 +62,44 @@ def cluster_graph(
     ```
     """
     output_df = cast(pd.DataFrame, input.get_input())
-    results = output_df[column].apply(lambda graph: run_layout(strategy, graph))
-
-    community_map_to = "communities"
-    output_df[community_map_to] = results
-
     level_to = level_to or f"{to}_level"
-    output_df[level_to] = output_df.apply(
-        lambda x: list({level for level, _, _ in x[community_map_to]}), axis=1
-    )
-    output_df[to] = [None] * len(output_df)
-
     num_total = len(output_df)
 
-    # Go through each of the rows
-    graph_level_pairs_column: list[list[tuple[int, str]]] = []
-    for _, row in progress_iterable(
-        output_df.iterrows(), callbacks.progress, num_total
-    ):
-        levels = row[level_to]
-        graph_level_pairs: list[tuple[int, str]] = []
-
-        # For each of the levels, get the graph and add it to the list
-        for level in levels:
-            graph = "\n".join(
-                nx.generate_graphml(
-                    apply_clustering(
-                        cast(str, row[column]),
-                        cast(Communities, row[community_map_to]),
-                        level,
-                    )
-                )
-            )
-            graph_level_pairs.append((level, graph))
-        graph_level_pairs_column.append(graph_level_pairs)
-    output_df[to] = graph_level_pairs_column
-
-    # explode the list of (level, graph) pairs into separate rows
-    output_df = output_df.explode(to, ignore_index=True)
-
-    # split the (level, graph) pairs into separate columns
-    # TODO: There is probably a better way to do this
-    output_df[[level_to, to]] = pd.DataFrame(
-        output_df[to].tolist(), index=output_df.index
-    )
-
-    # clean up the community map
-    output_df.drop(columns=[community_map_to], inplace=True)
-
+    clustered_graphs: list[nx.Graph] = []
+    levels_column: list[list[int]] = []
+    membership_column: list[dict[str, list[Any]]] = []
+    for graph in progress_iterable(output_df[column], callbacks.progress, num_total):
+        graph = load_graph(cast(str | nx.Graph, graph), copy=True)
+        communities = run_layout(strategy, graph)
+        levels_column.append(list({level for level, _, _ in communities}))
+        membership_column.append(_community_membership(communities))
+        clustered_graphs.append(_add_graph_ids(graph))
+
+    output_df[level_to] = levels_column
+    output_df[to] = clustered_graphs
+    output_df[membership_to] = membership_column
     return TableContainer(table=output_df)
 
 
-# TODO: This should support str | nx.Graph as a graphml param
 def apply_clustering(
-    graphml: str, communities: Communities, level=0, seed=0xF001
+    graphml: str | nx.Graph, communities: Communities, level=0, seed=0xF001
 ) -> nx.Graph:
-    """Apply clustering to a graphml string."""
-    random = Random(seed)  # noqa S311
-    graph = nx.parse_graphml(graphml)
+    """Apply the clustering of one level to a copy of a graph, or to a graphml string."""
+    graph = load_graph(graphml, copy=True)
     for community_level, community_id, nodes in communities:
         if level == community_level:
             for node in nodes:
                 graph.nodes[node]["cluster"] = community_id
                 graph.nodes[node]["level"] = level
 
+    _add_graph_ids(graph, seed)
+    for edge in graph.edges():
+        graph.edges[edge]["level"] = level
+    return graph
+
+
+def _add_graph_ids(graph: nx.Graph, seed=0xF001) -> nx.Graph:
+    random = Random(seed)  # noqa S311
     # add node degree
     for node_degree in graph.degree:
         graph.nodes[str(node_degree[0])]["degree"] = int(node_degree[1])
@@ -135,10 +113,35 @@ def apply_clustering(
     for index, edge in enumerate(graph.edges()):
         graph.edges[edge]["id"] = str(gen_uuid(random))
         graph.edges[edge]["human_readable_id"] = index
-        graph.edges[edge]["level"] = level
     return graph
 
 
+def _community_membership(communities: Communities) -> dict[str, list[Any]]:
+    """Flatten the communities into label, level and cluster columns, one entry per node and level."""
+    membership: dict[str, list[Any]] = {"label": [], "level": [], "cluster": []}
+    for level, community_id, nodes in communities:
+        membership["label"].extend(nodes)
+        membership["level"].extend([level] * len(nodes))
+        membership["cluster"].extend([community_id] * len(nodes))
+    return membership
+
+
+def membership_communities(membership: dict[str, Any]) -> Communities:
+    """Rebuild the communities of a membership column, in level order."""
+    nodes_by_community: dict[tuple[int, Any], list[str]] = {}
+    for label, level, cluster in zip(
+        membership["label"], membership["level"], membership["cluster"], strict=True
+    ):
+        nodes_by_community.setdefault((int(level), cluster), []).append(label)
+    return sorted(
+        (
+            (level, cluster, nodes)
+            for (level, cluster), nodes in nodes_by_community.items()
+        ),
+        key=lambda community: community[0],
+    )
+
+
 class GraphCommunityStrategyType(str, Enum):
     """GraphCommunityStrategyType class definition."""
 
@@ -0,0 +1,59 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""A module containing snapshot_clustered_graph method definition."""
+
+from typing import Any, cast
+
+import networkx as nx
+import pandas as pd
+from datashaper import TableContainer, VerbInput, verb
+
+from graphrag.index.storage import PipelineStorage
+from graphrag.index.utils import to_graphml
+
+from .cluster_graph import apply_clustering, membership_communities
+
+
+@verb(name="snapshot_clustered_graph")
+async def snapshot_clustered_graph(
+    input: VerbInput,
+    column: str,
+    base_name: str,
+    storage: PipelineStorage,
+    membership_column: str = "membership",
+    **_kwargs: dict,
+) -> TableContainer:
+    """
+    Write a GraphML snapshot of a graph clustered by cluster_graph for each of its levels.
+
+    Each snapshot has the cluster and level attributes of the nodes at its level. The snapshots are named as
+    snapshot_rows names the rows of one graph per level: `<base_name>.<index>.graphml`, or `<base_name>.graphml`
+    if there is a single level.
+
+    ## Usage
+    ```yaml
+    verb: snapshot_clustered_graph
+    args:
+        column: clustered_graph # The name of the column containing the clustered graph
+        base_name: clustered_graph # The base name of the snapshot files
+        membership_column: membership # Optional, the column containing the community membership, default: membership
+    ```
+    """
+    data = cast(pd.DataFrame, input.get_input())
+    level_graphs: list[nx.Graph] = []
+    for _, row in data.iterrows():
+        communities = membership_communities(
+            cast(dict[str, Any], row[membership_column])
+        )
+        levels = sorted({level for level, _, _ in communities})
+        graph = cast(str | nx.Graph, row[column])
+        level_graphs.extend(
+            apply_clustering(graph, communities, level) for level in levels
+        )
+
+    for index, graph in enumerate(level_graphs):
+        name = base_name if len(level_graphs) == 1 else f"{base_name}.{index}"
+        await storage.set(f"{name}.graphml", to_graphml(graph))
+
+    return TableContainer(table=data)
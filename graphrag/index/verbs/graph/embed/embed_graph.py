@@ -35,13 +35,13 @@ async def embed_graph(
     **kwargs,
 ) -> TableContainer:
     """
-    Embed a graph into a vector space. The graph is expected to be in graphml format. The verb outputs a new column containing a mapping between node_id and vector.
+    Embed a graph into a vector space. The graph is expected to be a networkx graph, or in graphml format. The verb outputs a new column containing a mapping between node_id and vector.
 
     ## Usage
     ```yaml
     verb: embed_graph
     args:
-        column: clustered_graph # The name of the column containing the graph, should be a graphml graph
+        column: clustered_graph # The name of the column containing the graph
         to: embeddings # The name of the column to output the embeddings to
         strategy: <strategy config> # See strategies section below
     ```
@@ -3,18 +3,20 @@
 
 """A module containing create_community_reports and load_strategy methods definition."""
 
+import asyncio
 import logging
+import traceback
+from collections import defaultdict
+from collections.abc import Callable, Coroutine
 from enum import Enum
-from typing import cast
+from typing import Any, cast
 
 import pandas as pd
 from datashaper import (
-    AsyncType,
-    NoopVerbCallbacks,
     TableContainer,
     VerbCallbacks,
     VerbInput,
-    derive_from_rows,
+    VerbParallelizationError,
     progress_ticker,
     verb,
 )
@@ -49,11 +51,14 @@ async def create_community_reports(
     callbacks: VerbCallbacks,
     cache: PipelineCache,
     strategy: dict,
-    async_mode: AsyncType = AsyncType.AsyncIO,
     num_threads: int = 4,
     **_kwargs,
 ) -> TableContainer:
-    """Generate entities for each row, and optionally a graph of those entities."""
+    """Generate entities for each row, and optionally a graph of those entities.
+
+    The reports are generated on the event loop, at most num_threads at a time.
+    An async_mode in the verb config is accepted and ignored.
+    """
     log.debug("create_community_reports strategy=%s", strategy)
     local_contexts = cast(pd.DataFrame, input.get_input())
     nodes_ctr = get_required_input_table(input, "nodes")
@@ -62,46 +67,238 @@ async def create_community_reports(
     community_hierarchy = cast(pd.DataFrame, community_hierarchy_ctr.table)
 
     levels = get_levels(nodes)
-    reports: list[CommunityReport | None] = []
     tick = progress_ticker(callbacks.progress, len(local_contexts))
     runner = load_strategy(strategy["type"])
+    semaphore = asyncio.Semaphore(num_threads or 4)
 
-    for level in levels:
-        level_contexts = prep_community_report_context(
-            pd.DataFrame(reports),
-            local_context_df=local_contexts,
-            community_hierarchy_df=community_hierarchy,
-            level=level,
-            max_tokens=strategy.get(
-                "max_input_tokens", defaults.COMMUNITY_REPORT_MAX_INPUT_LENGTH
-            ),
-        )
-
-        async def run_generate(record):
-            result = await _generate_report(
-                runner,
-                community_id=record[schemas.NODE_COMMUNITY],
-                community_level=record[schemas.COMMUNITY_LEVEL],
-                community_context=record[schemas.CONTEXT_STRING],
-                cache=cache,
-                callbacks=callbacks,
-                strategy=strategy,
-            )
-            tick()
-            return result
-
-        local_reports = await derive_from_rows(
-            level_contexts,
-            run_generate,
-            callbacks=NoopVerbCallbacks(),
-            num_threads=num_threads,
-            scheduling_type=async_mode,
-        )
-        reports.extend([lr for lr in local_reports if lr is not None])
+    async def run_generate(record: pd.Series) -> CommunityReport | None:
+        async with semaphore:
+            try:
+                return await _generate_report(
+                    runner,
+                    community_id=cast(int | str, record[schemas.NODE_COMMUNITY]),
+                    community_level=cast(int, record[schemas.COMMUNITY_LEVEL]),
+                    community_context=cast(str, record[schemas.CONTEXT_STRING]),
+                    cache=cache,
+                    callbacks=callbacks,
+                    strategy=strategy,
+                )
+            finally:
+                tick()
+
+    scheduler = _ReportScheduler(
+        levels,
+        local_contexts,
+        community_hierarchy,
+        max_tokens=strategy.get(
+            "max_input_tokens", defaults.COMMUNITY_REPORT_MAX_INPUT_LENGTH
+        ),
+    )
+    reports = await scheduler.run(run_generate)
+    tick.done()
+
+    for error, stack in scheduler.errors:
+        callbacks.error("parallel transformation error", error, stack)
+    if len(scheduler.errors) > 0:
+        raise VerbParallelizationError(len(scheduler.errors))
 
     return TableContainer(table=pd.DataFrame(reports))
 
 
+class _ReportScheduler:
+    """Generate the community reports of all levels at once.
+
+    A community whose local context fits within max_tokens (or has no sub-communities to
+    substitute) starts right away. An oversized community waits only for the reports of its own
+    sub-communities, and its context is then prepared as prep_community_report_context does.
+    The reports are returned level by level, in the order of a level by level run.
+    A community is not started if one of its sub-community reports failed with an error.
+    """
+
+    def __init__(
+        self,
+        levels: list[int],
+        local_contexts: pd.DataFrame,
+        community_hierarchy: pd.DataFrame,
+        max_tokens: int,
+    ):
+        self._levels = levels
+        self._local_contexts = local_contexts
+        self._community_hierarchy = community_hierarchy
+        self._max_tokens = max_tokens
+        self._order: dict[Any, tuple[int, int]] = {}
+        self._level_of: dict[Any, int] = {}
+        self._parent: dict[Any, Any] = {}
+        self._children: dict[Any, set] = {}
+        self._waiting_for: dict[Any, set] = {}
+        self._reports: dict[Any, CommunityReport | None] = {}
+        self._failed: set = set()
+        self.errors: list[tuple[BaseException, str]] = []
+
+    async def run(
+        self,
+        generate: Callable[[pd.Series], Coroutine[Any, Any, CommunityReport | None]],
+    ) -> list[CommunityReport]:
+        """Generate every report, returning the reports that are not None."""
+        tasks: dict[asyncio.Task, Any] = {}
+
+        def start(contexts: pd.DataFrame) -> None:
+            for _, record in contexts.iterrows():
+                task = asyncio.create_task(generate(record))
+                tasks[task] = record[schemas.NODE_COMMUNITY]
+
+        start(self._independent_contexts())
+        ready = [c for c, waiting in self._waiting_for.items() if len(waiting) == 0]
+        while tasks or ready:
+            if ready:
+                start(self._dependent_contexts(ready))
+                ready = []
+                if not tasks:
+                    continue
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                community = tasks.pop(task)
+                self._reports[community] = self._result(task, community)
+                parent = self._parent.get(community)
+                if parent is None or parent not in self._waiting_for:
+                    continue
+                waiting = self._waiting_for[parent]
+                waiting.discard(community)
+                if len(waiting) == 0 and self._failed.isdisjoint(
+                    self._children[parent]
+                ):
+                    ready.append(parent)
+
+        return [
+            report
+            for community, report in sorted(
+                self._reports.items(), key=lambda item: self._order[item[0]]
+            )
+            if report is not None
+        ]
+
+    def _independent_contexts(self) -> pd.DataFrame:
+        """Prepare the contexts of the communities that need no sub-community reports."""
+        hierarchy = self._community_hierarchy
+        contexts = []
+        for level_index, level in enumerate(self._levels):
+            level_contexts = cast(
+                pd.DataFrame,
+                self._local_contexts[
+                    self._local_contexts[schemas.COMMUNITY_LEVEL] == level
+                ],
+            )
+            communities = level_contexts[schemas.NODE_COMMUNITY].tolist()
+            for community in communities:
+                self._level_of[community] = level
+            exceeding = level_contexts[schemas.CONTEXT_EXCEED_FLAG] == 1
+            dependent = pd.Series(False, index=level_contexts.index)
+            if level_index > 0 and len(hierarchy) > 0:
+                level_hierarchy = cast(
+                    pd.DataFrame,
+                    hierarchy[hierarchy[schemas.COMMUNITY_LEVEL] == level],
+                )
+                dependent = exceeding & level_contexts[schemas.NODE_COMMUNITY].isin(
+                    level_hierarchy[schemas.NODE_COMMUNITY]
+                )
+                self._add_dependencies(
+                    level_contexts[dependent][schemas.NODE_COMMUNITY].tolist(),
+                    level_hierarchy,
+                )
+
+            # a level by level run lists the fitting communities, then the substituted ones,
+            # then the trimmed ones
+            ordered = [
+                *level_contexts[~exceeding][schemas.NODE_COMMUNITY],
+                *pd.Series(
+                    level_contexts[dependent][schemas.NODE_COMMUNITY]
+                ).sort_values(),
+                *level_contexts[exceeding & ~dependent][schemas.NODE_COMMUNITY],
+            ]
+            for position, community in enumerate(ordered):
+                self._order[community] = (level_index, position)
+
+            independent = cast(pd.DataFrame, level_contexts[~dependent])
+            if len(independent) > 0:
+                contexts.append(
+                    prep_community_report_context(
+                        None,
+                        local_context_df=independent,
+                        community_hierarchy_df=hierarchy,
+                        level=level,
+                        max_tokens=self._max_tokens,
+                    )
+                )
+        return pd.concat(contexts) if contexts else pd.DataFrame()
+
+    def _add_dependencies(
+        self, communities: list[Any], level_hierarchy: pd.DataFrame
+    ) -> None:
+        with_context = set(self._level_of)
+        children = defaultdict(set)
+        for community, sub_community in zip(
+            level_hierarchy[schemas.NODE_COMMUNITY],
+            level_hierarchy[schemas.SUB_COMMUNITY],
+            strict=True,
+        ):
+            # only the sub-communities with a local context get a report
+            if sub_community in with_context:
+                children[community].add(sub_community)
+        for community in communities:
+            self._children[community] = children[community]
+            self._waiting_for[community] = set(children[community])
+            for child in children[community]:
+                self._parent[child] = community
+
+    def _dependent_contexts(self, communities: list[Any]) -> pd.DataFrame:
+        """Prepare the contexts of oversized communities whose sub-community reports are done."""
+        by_level = defaultdict(list)
+        for community in communities:
+            del self._waiting_for[community]
+            by_level[self._level_of[community]].append(community)
+
+        contexts = []
+        for level, level_communities in by_level.items():
+            children = [
+                child
+                for community in level_communities
+                for child in self._children[community]
+            ]
+            reports = [
+                self._reports[child]
+                for child in children
+                if self._reports.get(child) is not None
+            ]
+            local_contexts = self._local_contexts
+            contexts.append(
+                prep_community_report_context(
+                    pd.DataFrame(reports),
+                    local_context_df=cast(
+                        pd.DataFrame,
+                        local_contexts[
+                            local_contexts[schemas.NODE_COMMUNITY].isin([
+                                *level_communities,
+                                *children,
+                            ])
+                        ],
+                    ),
+                    community_hierarchy_df=self._community_hierarchy,
+                    level=level,
+                    max_tokens=self._max_tokens,
+                )
+            )
+        return pd.concat(contexts)
+
+    def _result(self, task: asyncio.Task, community: Any) -> CommunityReport | None:
+        try:
+            return task.result()
+        except Exception as e:
+            log.exception("parallel transformation error")
+            self.errors.append((e, traceback.format_exc()))
+            self._failed.add(community)
+            return None
+
+
 async def _generate_report(
     runner: CommunityReportsStrategy,
     cache: PipelineCache,
@@ -22,19 +22,26 @@ def unpack_graph(
     type: str,  # noqa A002
     copy: list[str] | None = None,
     embeddings_column: str = "embeddings",
+    membership_column: str | None = "membership",
+    level: int | None = None,
     **kwargs,
 ) -> TableContainer:
     """
-    Unpack nodes or edges from a graphml graph, into a list of nodes or edges.
+    Unpack nodes or edges from a graph, into a list of nodes or edges.
 
     This verb will create columns for each attribute in a node or edge.
 
+    A graph clustered by cluster_graph is unpacked once per level of its membership column, with the level,
+    and for nodes the cluster, of each item at that level.
+
     ## Usage
     ```yaml
     verb: unpack_graph
     args:
         type: node # The type of data to unpack, one of: node, edge. node will create a node list, edge will create an edge list
-        column: <column name> # The name of the column containing the graph, should be a graphml graph
+        column: <column name> # The name of the column containing the graph
+        membership_column: membership # Optional, the column containing the community membership of a clustered graph, null to unpack the graph only once, default: membership
+        level: 0 # Optional, only unpack this level of a clustered graph, default: all the levels
     ```
     """
     if copy is None:
@@ -44,6 +51,9 @@ def unpack_graph(
     result = []
     copy = [col for col in copy if col in input_df.columns]
     has_embeddings = embeddings_column in input_df.columns
+    has_membership = (
+        membership_column is not None and membership_column in input_df.columns
+    )
 
     for _, row in progress_iterable(input_df.iterrows(), callbacks.progress, num_total):
         # merge the original row with the unpacked graph item
@@ -54,6 +64,21 @@ def unpack_graph(
             else {}
         )
 
+        if has_membership:
+            items = _run_unpack(
+                cast(str | nx.Graph, row[column]), type, embeddings, kwargs
+            )
+            for item_level, clusters in _clusters_by_level(
+                cast(dict[str, Any], row[membership_column]), level
+            ):
+                result.extend(
+                    _with_level(cleaned_row, item, item_level, clusters)
+                    for item in items
+                )
+            continue
+        if level is not None and cleaned_row.get("level", level) != level:
+            continue
+
         result.extend([
             {**cleaned_row, **graph_id}
             for graph_id in _run_unpack(
@@ -68,6 +93,35 @@ def unpack_graph(
     return TableContainer(table=output_df)
 
 
+def _clusters_by_level(
+    membership: dict[str, Any], level: int | None
+) -> list[tuple[int, dict[str, str]]]:
+    """Get the cluster of every node at each level, in level order."""
+    by_level: dict[int, dict[str, str]] = {}
+    for label, item_level, cluster in zip(
+        membership["label"], membership["level"], membership["cluster"], strict=True
+    ):
+        by_level.setdefault(int(item_level), {})[label] = cluster
+    if level is not None:
+        return [(level, by_level[level])] if level in by_level else []
+    return sorted(by_level.items())
+
+
+def _with_level(
+    row: dict[str, Any],
+    item: dict[str, Any],
+    level: int,
+    clusters: dict[str, str],
+) -> dict[str, Any]:
+    result = {**row, "level": level, **item}
+    if "label" in item:
+        cluster = clusters.get(item["label"])
+        if cluster is not None:
+            result["cluster"] = cluster
+        result["graph_embedding"] = result.pop("graph_embedding")
+    return result
+
+
 def _run_unpack(
     graphml_or_graph: str | nx.Graph,
     unpack_type: str,
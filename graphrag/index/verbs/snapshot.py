@@ -3,9 +3,13 @@
 
 """A module containing snapshot method definition."""
 
+from typing import cast
+
+import pandas as pd
 from datashaper import TableContainer, VerbInput, verb
 
 from graphrag.index.storage import PipelineStorage
+from graphrag.index.utils import encode_graph_columns, graphml_columns
 
 
 @verb(name="snapshot")
@@ -17,14 +21,17 @@ async def snapshot(
     **_kwargs: dict,
 ) -> TableContainer:
     """Take a entire snapshot of the tabular data."""
-    data = input.get_input()
+    data = cast(pd.DataFrame, input.get_input())
 
     for fmt in formats:
         if fmt == "parquet":
-            await storage.set(name + ".parquet", data.to_parquet())
+            await storage.set(
+                name + ".parquet", encode_graph_columns(data).to_parquet()
+            )
         elif fmt == "json":
             await storage.set(
-                name + ".json", data.to_json(orient="records", lines=True)
+                name + ".json",
+                graphml_columns(data).to_json(orient="records", lines=True),
             )
 
     return TableContainer(table=data)
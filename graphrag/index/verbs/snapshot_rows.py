@@ -7,9 +7,11 @@ import json
 from dataclasses import dataclass
 from typing import Any
 
+import networkx as nx
 from datashaper import TableContainer, VerbInput, verb
 
 from graphrag.index.storage import PipelineStorage
+from graphrag.index.utils import to_graphml
 
 
 @dataclass
@@ -59,7 +61,10 @@ async def snapshot_rows(
                 if column is None:
                     msg = "column must be specified for text format"
                     raise ValueError(msg)
-                await storage.set(f"{row_name}.{extension}", str(row[column]))
+                value = row[column]
+                if isinstance(value, nx.Graph):
+                    value = to_graphml(value)
+                await storage.set(f"{row_name}.{extension}", str(value))
 
     return TableContainer(table=data)
 
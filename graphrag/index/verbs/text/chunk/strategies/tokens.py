@@ -3,9 +3,11 @@
 
 """A module containing run and split_text_on_tokens methods definition."""
 
-from collections.abc import Iterable
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
 from typing import Any
 
+import numpy as np
 import tiktoken
 from datashaper import ProgressTicker
 
@@ -13,6 +15,9 @@ import graphrag.config.defaults as defs
 from graphrag.index.text_splitting import Tokenizer
 from graphrag.index.verbs.text.chunk.typing import TextChunk
 
+# number of texts encoded at once by tiktoken's thread pool
+ENCODE_BATCH_SIZE = 64
+
 
 def run(
     input: list[str], args: dict[str, Any], tick: ProgressTicker
@@ -28,6 +33,11 @@ def run(
             text = f"{text}"
         return enc.encode(text)
 
+    def encode_batch(texts: list[str]) -> list[list[int]]:
+        return enc.encode_batch([
+            text if isinstance(text, str) else f"{text}" for text in texts
+        ])
+
     def decode(tokens: list[int]) -> str:
         return enc.decode(tokens)
 
@@ -38,6 +48,7 @@ def run(
             tokens_per_chunk=tokens_per_chunk,
             encode=encode,
             decode=decode,
+            encode_batch=encode_batch,
         ),
         tick,
     )
@@ -47,35 +58,58 @@ def run(
 # So we could have better control over the chunking process
 def split_text_on_tokens(
     texts: list[str], enc: Tokenizer, tick: ProgressTicker
-) -> list[TextChunk]:
-    """Split incoming text and return chunks."""
-    result = []
-    mapped_ids = []
-
-    for source_doc_idx, text in enumerate(texts):
-        encoded = enc.encode(text)
-        tick(1)
-        mapped_ids.append((source_doc_idx, encoded))
-
-    input_ids: list[tuple[int, int]] = [
-        (source_doc_idx, id) for source_doc_idx, ids in mapped_ids for id in ids
-    ]
-
-    start_idx = 0
-    cur_idx = min(start_idx + enc.tokens_per_chunk, len(input_ids))
-    chunk_ids = input_ids[start_idx:cur_idx]
-    while start_idx < len(input_ids):
-        chunk_text = enc.decode([id for _, id in chunk_ids])
-        doc_indices = list({doc_idx for doc_idx, _ in chunk_ids})
-        result.append(
-            TextChunk(
-                text_chunk=chunk_text,
-                source_doc_indices=doc_indices,
-                n_tokens=len(chunk_ids),
-            )
+) -> Iterator[TextChunk]:
+    """Split incoming text and yield chunks.
+
+    The texts are encoded in batches as the chunks reach them. Their tokens are kept in an int32
+    array, and the documents as the offsets where their tokens start, so only the tokens of the
+    current batch and of the chunk being cut are held in memory.
+    """
+    encode_batch = enc.encode_batch or (
+        lambda batch: [enc.encode(text) for text in batch]
+    )
+    step = enc.tokens_per_chunk - enc.chunk_overlap
+    tokens = np.zeros(0, dtype=np.int32)
+    # position of tokens[0] among the tokens of all the texts
+    offset = 0
+    # start position and index of every text with at least one token
+    doc_starts: list[int] = []
+    doc_indices: list[int] = []
+    num_tokens = 0
+    start = 0
+
+    def cut_chunk() -> TextChunk:
+        end = min(start + enc.tokens_per_chunk, num_tokens)
+        first_doc = bisect_right(doc_starts, start) - 1
+        last_doc = bisect_left(doc_starts, end, lo=first_doc)
+        chunk_ids = tokens[start - offset : end - offset]
+        return TextChunk(
+            text_chunk=enc.decode(chunk_ids.tolist()),
+            source_doc_indices=list(set(doc_indices[first_doc:last_doc])),
+            n_tokens=len(chunk_ids),
         )
-        start_idx += enc.tokens_per_chunk - enc.chunk_overlap
-        cur_idx = min(start_idx + enc.tokens_per_chunk, len(input_ids))
-        chunk_ids = input_ids[start_idx:cur_idx]
 
-    return result
+    for batch_start in range(0, len(texts), ENCODE_BATCH_SIZE):
+        batch = texts[batch_start : batch_start + ENCODE_BATCH_SIZE]
+        encoded = []
+        for doc_idx, ids in enumerate(encode_batch(batch), start=batch_start):
+            tick(1)
+            if len(ids) == 0:
+                continue
+            doc_starts.append(num_tokens)
+            doc_indices.append(doc_idx)
+            num_tokens += len(ids)
+            encoded.append(np.asarray(ids, dtype=np.int32))
+        tokens = np.concatenate([tokens, *encoded])
+
+        # the chunks that end before the last token can't change anymore
+        while start + enc.tokens_per_chunk <= num_tokens:
+            yield cut_chunk()
+            start += step
+        drop = min(start, num_tokens) - offset
+        tokens = tokens[drop:]
+        offset += drop
+
+    while start < num_tokens:
+        yield cut_chunk()
+        start += step
@@ -46,16 +46,18 @@ def build_steps(
                 "column": "entity_graph",
                 "to": "clustered_graph",
                 "level_to": "level",
+                "membership_to": "membership",
             },
             "input": ({"source": "workflow:create_summarized_entities"}),
         },
         {
-            "verb": "snapshot_rows",
+            # one snapshot per level, with the communities of that level
+            "verb": "snapshot_clustered_graph",
             "enabled": graphml_snapshot_enabled,
             "args": {
                 "base_name": "clustered_graph",
                 "column": "clustered_graph",
-                "formats": [{"format": "text", "extension": "graphml"}],
+                "membership_column": "membership",
             },
         },
         {
@@ -82,9 +84,9 @@ def build_steps(
                 # only selecting for documentation sake, so we know what is contained in
                 # this workflow
                 "columns": (
-                    ["level", "clustered_graph", "embeddings"]
+                    ["level", "clustered_graph", "membership", "embeddings"]
                     if embed_graph_enabled
-                    else ["level", "clustered_graph"]
+                    else ["level", "clustered_graph", "membership"]
                 ),
             },
         },
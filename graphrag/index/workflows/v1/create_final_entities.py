@@ -35,6 +35,8 @@ def build_steps(
             "args": {
                 "column": "clustered_graph",
                 "type": "nodes",
+                # the entities are the same at every level, unpack them once
+                "membership_column": None,
             },
             "input": {"source": "workflow:create_base_entity_graph"},
         },
@@ -22,21 +22,12 @@ def build_steps(
     _compute_top_level_node_positions = [
         {
             "verb": "unpack_graph",
-            "args": {"column": "positioned_graph", "type": "nodes"},
-            "input": {"source": "laid_out_entity_graph"},
-        },
-        {
-            "verb": "filter",
             "args": {
-                "column": "level",
-                "criteria": [
-                    {
-                        "type": "value",
-                        "operator": "equals",
-                        "value": config.get("level_for_node_positions", 0),
-                    }
-                ],
+                "column": "positioned_graph",
+                "type": "nodes",
+                "level": config.get("level_for_node_positions", 0),
             },
+            "input": {"source": "laid_out_entity_graph"},
         },
         {
             "verb": "select",
@@ -29,6 +29,7 @@ def build_steps(
             "args": {
                 "column": "clustered_graph",
                 "type": "edges",
+                "level": 0,
             },
             "input": {"source": "workflow:create_base_entity_graph"},
         },
@@ -36,13 +37,6 @@ def build_steps(
             "verb": "rename",
             "args": {"columns": {"source_id": "text_unit_ids"}},
         },
-        {
-            "verb": "filter",
-            "args": {
-                "column": "level",
-                "criteria": [{"type": "value", "operator": "equals", "value": 0}],
-            },
-        },
         {
             "verb": "text_embed",
             "enabled": not skip_description_embedding,
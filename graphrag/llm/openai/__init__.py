@@ -9,6 +9,11 @@ from .factories import (
     create_openai_completion_llm,
     create_openai_embedding_llm,
 )
+from .http_clients import (
+    aclose_http_clients,
+    get_async_http_client,
+    get_sync_http_client,
+)
 from .openai_chat_llm import OpenAIChatLLM
 from .openai_completion_llm import OpenAICompletionLLM
 from .openai_configuration import OpenAIConfiguration
@@ -21,8 +26,11 @@ __all__ = [
     "OpenAICompletionLLM",
     "OpenAIConfiguration",
     "OpenAIEmbeddingsLLM",
+    "aclose_http_clients",
     "create_openai_chat_llm",
     "create_openai_client",
     "create_openai_completion_llm",
     "create_openai_embedding_llm",
+    "get_async_http_client",
+    "get_sync_http_client",
 ]
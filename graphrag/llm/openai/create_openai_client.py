@@ -9,6 +9,7 @@ from functools import cache
 from azure.identity import DefaultAzureCredential, get_bearer_token_provider
 from openai import AsyncAzureOpenAI, AsyncOpenAI
 
+from .http_clients import get_async_http_client
 from .openai_configuration import OpenAIConfiguration
 from .types import OpenAIClientTypes
 
@@ -52,6 +53,10 @@ def create_openai_client(
             # Timeout/Retry Configuration - Use Tenacity for Retries, so disable them here
             timeout=configuration.request_timeout or 180.0,
             max_retries=0,
+            # Connections are pooled per endpoint and shared by every client of it
+            http_client=get_async_http_client(
+                api_base, max_connections=configuration.concurrent_requests
+            ),
         )
 
     log.info("Creating OpenAI client base_url=%s", configuration.api_base)
@@ -62,4 +67,8 @@ def create_openai_client(
         # Timeout/Retry Configuration - Use Tenacity for Retries, so disable them here
         timeout=configuration.request_timeout or 180.0,
         max_retries=0,
+        # Connections are pooled per endpoint and shared by every client of it
+        http_client=get_async_http_client(
+            configuration.api_base, max_connections=configuration.concurrent_requests
+        ),
     )
@@ -0,0 +1,140 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Shared HTTP connection pools for the OpenAI clients."""
+
+import asyncio
+import importlib.util
+import logging
+from threading import Lock
+from weakref import WeakKeyDictionary
+
+import httpx
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+_async_clients: dict[tuple, httpx.AsyncClient] = {}
+_sync_clients: dict[tuple, httpx.Client] = {}
+_lock = Lock()
+
+
+class LoopLocalTransport(httpx.AsyncBaseTransport):
+    """An async transport that keeps one connection pool per event loop.
+
+    Pooled connections belong to the event loop that opened them, so a client shared by several
+    asyncio.run calls (the CLI, tests, notebooks) must not reuse a pool of a closed loop.
+    The pools of loops that are garbage collected are dropped with them.
+    """
+
+    def __init__(self, limits: httpx.Limits, http2: bool):
+        self._limits = limits
+        self._http2 = http2
+        self._transports: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport
+        ] = WeakKeyDictionary()
+        self._lock = Lock()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send the request through the pool of the running event loop."""
+        return await self._transport().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close the pool of the running event loop and drop the others."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.pop(loop, None)
+            self._transports.clear()
+        if transport is not None:
+            await transport.aclose()
+
+    def _transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                transport = httpx.AsyncHTTPTransport(
+                    limits=self._limits, http2=self._http2
+                )
+                self._transports[loop] = transport
+            return transport
+
+
+def http2_available() -> bool:
+    """Return True if the optional h2 package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_async_http_client(
+    api_base: str | None,
+    max_connections: int | None = None,
+    http2: bool | None = None,
+) -> httpx.AsyncClient:
+    """Get the async HTTP client shared by every OpenAI client of the given endpoint.
+
+    Connections are kept alive between requests and pooled up to max_connections,
+    so concurrent calls (e.g. the global search map phase) reuse warm TLS connections.
+    HTTP/2 is used when http2 is True, or when it is None and h2 is installed.
+    The client can be used from several event loops, each one gets its own pool.
+    """
+    key, limits, http2 = _pool_options(api_base, max_connections, http2)
+    with _lock:
+        client = _async_clients.get(key)
+        if client is None or client.is_closed:
+            log.info("Creating shared async HTTP pool for %s (%s)", api_base, limits)
+            client = DefaultAsyncHttpxClient(
+                transport=LoopLocalTransport(limits, http2)
+            )
+            _async_clients[key] = client
+        return client
+
+
+def get_sync_http_client(
+    api_base: str | None,
+    max_connections: int | None = None,
+    http2: bool | None = None,
+) -> httpx.Client:
+    """Get the sync HTTP client shared by every OpenAI client of the given endpoint."""
+    key, limits, http2 = _pool_options(api_base, max_connections, http2)
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None or client.is_closed:
+            log.info("Creating shared sync HTTP pool for %s (%s)", api_base, limits)
+            client = DefaultHttpxClient(limits=limits, http2=http2)
+            _sync_clients[key] = client
+        return client
+
+
+async def aclose_http_clients() -> None:
+    """Close the shared HTTP clients, e.g. on application shutdown."""
+    with _lock:
+        async_clients = list(_async_clients.values())
+        sync_clients = list(_sync_clients.values())
+        _async_clients.clear()
+        _sync_clients.clear()
+    for client in async_clients:
+        await client.aclose()
+    for client in sync_clients:
+        client.close()
+
+
+def _pool_options(
+    api_base: str | None, max_connections: int | None, http2: bool | None
+) -> tuple[tuple, httpx.Limits, bool]:
+    max_connections = max_connections or DEFAULT_MAX_CONNECTIONS
+    if http2 is None:
+        http2 = http2_available()
+    elif http2 and not http2_available():
+        log.warning(
+            "HTTP/2 requested but the h2 package is not installed, using HTTP/1.1"
+        )
+        http2 = False
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+    )
+    return (api_base or "", max_connections, http2), limits, http2
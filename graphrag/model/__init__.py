@@ -16,16 +16,30 @@ from .entity import Entity
 from .identified import Identified
 from .named import Named
 from .relationship import Relationship
+from .store import (
+    CommunityReportTable,
+    EntityTable,
+    RelationshipTable,
+    RowView,
+    Table,
+    TextUnitTable,
+)
 from .text_unit import TextUnit
 
 __all__ = [
     "Community",
     "CommunityReport",
+    "CommunityReportTable",
     "Covariate",
     "Document",
     "Entity",
+    "EntityTable",
     "Identified",
     "Named",
     "Relationship",
+    "RelationshipTable",
+    "RowView",
+    "Table",
     "TextUnit",
+    "TextUnitTable",
 ]
@@ -0,0 +1,606 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Columnar stores of knowledge model objects.
+
+A table keeps one array per field instead of one object per row: strings are interned,
+list fields (e.g. text unit ids) are stored flat with row offsets and embeddings are stored
+as one contiguous float32 matrix. Rows are exposed as light `__slots__` views with the same
+attributes as the corresponding dataclass, so tables can be passed wherever the retrieval
+and context-building code expects a list of Entity, Relationship, TextUnit or CommunityReport.
+"""
+
+import sys
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
+from dataclasses import fields
+from typing import Any, Generic, TypeVar, cast, overload
+
+import numpy as np
+import pandas as pd
+
+from .community_report import CommunityReport
+from .entity import Entity
+from .relationship import Relationship
+from .text_unit import TextUnit
+
+
+class Column(ABC):
+    """A column of a table; values set on rows after loading are kept as overrides."""
+
+    def __init__(self):
+        self._overrides: dict[int, Any] = {}
+
+    def get(self, row: int) -> Any:
+        """Get the value of a row."""
+        if row in self._overrides:
+            return self._overrides[row]
+        return self._get(row)
+
+    def set(self, row: int, value: Any) -> None:
+        """Set the value of a row."""
+        self._overrides[row] = value
+
+    @abstractmethod
+    def _get(self, row: int) -> Any:
+        """Get the loaded value of a row."""
+
+
+class ValueColumn(Column):
+    """A column of scalar values."""
+
+    def __init__(self, values: np.ndarray):
+        super().__init__()
+        self.values = values
+
+    def _get(self, row: int) -> Any:
+        value = self.values[row]
+        return value.item() if isinstance(value, np.generic) else value
+
+
+class ListColumn(Column):
+    """A column of lists, stored as one flat array and the offsets of each row."""
+
+    def __init__(self, flat: np.ndarray, offsets: np.ndarray, present: np.ndarray):
+        super().__init__()
+        self.flat = flat
+        self.offsets = offsets
+        self.present = present
+
+    def _get(self, row: int) -> list | None:
+        if not self.present[row]:
+            return None
+        return self.flat[self.offsets[row] : self.offsets[row + 1]].tolist()
+
+
+class EmbeddingColumn(Column):
+    """A column of embeddings, stored as one float32 matrix.
+
+    Rows are returned as read-only views of the matrix; rows without an embedding return None.
+    """
+
+    def __init__(self, matrix: np.ndarray, present: np.ndarray):
+        super().__init__()
+        self.matrix = matrix
+        self.matrix.flags.writeable = False
+        self.present = present
+
+    def _get(self, row: int) -> np.ndarray | None:
+        return self.matrix[row] if self.present[row] else None
+
+
+class AttributeColumn(Column):
+    """The attributes dict of each row, built from attribute columns on first access.
+
+    The dict of a row is kept once built, so in-place updates (e.g. ranking attributes added by
+    the context builders) are seen by later reads, as with the dataclasses.
+    """
+
+    def __init__(self, columns: dict[str, ValueColumn]):
+        super().__init__()
+        self.columns = columns
+
+    def _get(self, row: int) -> dict[str, Any]:
+        attributes = {name: column.get(row) for name, column in self.columns.items()}
+        self._overrides[row] = attributes
+        return attributes
+
+
+class _Field:
+    """A field of a row view, read from the column of the same name."""
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, view: "RowView | None", owner: type) -> Any:
+        if view is None:
+            return self
+        column = view._table.columns.get(self.name)  # noqa: SLF001
+        return None if column is None else column.get(view._row)  # noqa: SLF001
+
+    def __set__(self, view: "RowView", value: Any) -> None:
+        view._table.column_for_update(self.name).set(view._row, value)  # noqa: SLF001
+
+
+class RowView:
+    """A row of a table."""
+
+    __slots__ = ("_row", "_table")
+
+    model_type: type
+
+    def __init__(self, table: "Table", row: int):
+        self._table = table
+        self._row = row
+
+    def __eq__(self, other: object) -> bool:
+        """Compare two views by table and row."""
+        if not isinstance(other, RowView):
+            return NotImplemented
+        return self._table is other._table and self._row == other._row
+
+    def __hash__(self) -> int:
+        """Hash the view by table and row."""
+        return hash((id(self._table), self._row))
+
+    def __repr__(self) -> str:
+        """Get a string representation."""
+        return f"{type(self).__name__}(id={self.id!r}, row={self._row})"  # type: ignore
+
+    def to_model(self) -> Any:
+        """Copy the row into a knowledge model object."""
+        values = {
+            field.name: getattr(self, field.name) for field in fields(self.model_type)
+        }
+        return self.model_type(**{
+            name: value.tolist() if isinstance(value, np.ndarray) else value
+            for name, value in values.items()
+        })
+
+
+class EntityView(RowView):
+    """A row of an EntityTable."""
+
+    __slots__ = ()
+    model_type = Entity
+
+    id = _Field()
+    short_id = _Field()
+    title = _Field()
+    type = _Field()
+    description = _Field()
+    description_embedding = _Field()
+    name_embedding = _Field()
+    graph_embedding = _Field()
+    community_ids = _Field()
+    text_unit_ids = _Field()
+    document_ids = _Field()
+    rank = _Field()
+    attributes = _Field()
+
+
+class RelationshipView(RowView):
+    """A row of a RelationshipTable."""
+
+    __slots__ = ()
+    model_type = Relationship
+
+    id = _Field()
+    short_id = _Field()
+    source = _Field()
+    target = _Field()
+    weight = _Field()
+    description = _Field()
+    description_embedding = _Field()
+    text_unit_ids = _Field()
+    document_ids = _Field()
+    attributes = _Field()
+
+
+class TextUnitView(RowView):
+    """A row of a TextUnitTable."""
+
+    __slots__ = ()
+    model_type = TextUnit
+
+    id = _Field()
+    short_id = _Field()
+    text = _Field()
+    text_embedding = _Field()
+    entity_ids = _Field()
+    relationship_ids = _Field()
+    covariate_ids = _Field()
+    n_tokens = _Field()
+    document_ids = _Field()
+    attributes = _Field()
+
+
+class CommunityReportView(RowView):
+    """A row of a CommunityReportTable."""
+
+    __slots__ = ()
+    model_type = CommunityReport
+
+    id = _Field()
+    short_id = _Field()
+    title = _Field()
+    community_id = _Field()
+    summary = _Field()
+    full_content = _Field()
+    rank = _Field()
+    summary_embedding = _Field()
+    full_content_embedding = _Field()
+    attributes = _Field()
+
+
+V = TypeVar("V", bound=RowView)
+
+
+class Table(Sequence, Generic[V]):
+    """A columnar collection of knowledge model rows."""
+
+    view_type: type[V]
+
+    def __init__(self, columns: dict[str, Column | None], size: int):
+        self.columns = {
+            name: column for name, column in columns.items() if column is not None
+        }
+        self._size = size
+        self._rows_by_id: dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        """Get the number of rows."""
+        return self._size
+
+    @overload
+    def __getitem__(self, index: int) -> V: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[V]: ...
+
+    def __getitem__(self, index: int | slice) -> V | list[V]:
+        """Get the view of a row, or the views of a slice of rows."""
+        if isinstance(index, slice):
+            return [
+                self.view_type(self, row) for row in range(*index.indices(self._size))
+            ]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            msg = f"row {index} out of range"
+            raise IndexError(msg)
+        return self.view_type(self, index)
+
+    def __iter__(self) -> Iterator[V]:
+        """Iterate over the views of all rows."""
+        view_type = self.view_type
+        for row in range(self._size):
+            yield view_type(self, row)
+
+    def get_by_id(self, id: str) -> V | None:
+        """Get a row by id."""
+        if self._rows_by_id is None:
+            ids = self.columns["id"]
+            self._rows_by_id = {ids.get(row): row for row in range(self._size)}
+        row = self._rows_by_id.get(id)
+        return None if row is None else self.view_type(self, row)
+
+    def embeddings(self, name: str) -> tuple[np.ndarray, np.ndarray]:
+        """Get the embedding matrix of a field and the mask of rows that have an embedding."""
+        column = self.columns.get(name)
+        if not isinstance(column, EmbeddingColumn):
+            msg = f"{name} is not an embedding column"
+            raise TypeError(msg)
+        return column.matrix, column.present
+
+    def column_for_update(self, name: str) -> Column:
+        """Get the column of a field, adding an empty one if the table has none."""
+        column = self.columns.get(name)
+        if column is None:
+            column = ValueColumn(np.full(self._size, None, dtype=object))
+            self.columns[name] = column
+        return column
+
+    def to_models(self) -> list:
+        """Copy all rows into knowledge model objects."""
+        return [view.to_model() for view in self]
+
+
+class EntityTable(Table[EntityView]):
+    """A columnar collection of entities."""
+
+    view_type = EntityView
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        id_col: str = "id",
+        short_id_col: str | None = "short_id",
+        title_col: str = "title",
+        type_col: str | None = "type",
+        description_col: str | None = "description",
+        name_embedding_col: str | None = "name_embedding",
+        description_embedding_col: str | None = "description_embedding",
+        graph_embedding_col: str | None = "graph_embedding",
+        community_col: str | None = "community_ids",
+        text_unit_ids_col: str | None = "text_unit_ids",
+        document_ids_col: str | None = "document_ids",
+        rank_col: str | None = "degree",
+        attributes_cols: list[str] | None = None,
+    ) -> "EntityTable":
+        """Build an entity table from a dataframe, with the column options of read_entities."""
+        return cls(
+            {
+                "id": _str_column(df, id_col, intern=True),
+                "short_id": _short_id_column(df, short_id_col),
+                "title": _str_column(df, title_col, intern=True),
+                "type": _optional_str_column(df, type_col, intern=True),
+                "description": _optional_str_column(df, description_col),
+                "name_embedding": _embedding_column(df, name_embedding_col),
+                "description_embedding": _embedding_column(
+                    df, description_embedding_col
+                ),
+                "graph_embedding": _embedding_column(df, graph_embedding_col),
+                "community_ids": _list_column(df, community_col, str),
+                "text_unit_ids": _list_column(df, text_unit_ids_col),
+                "document_ids": _list_column(df, document_ids_col),
+                "rank": _optional_number_column(df, rank_col, int),
+                "attributes": _attribute_column(df, attributes_cols),
+            },
+            len(df),
+        )
+
+
+class RelationshipTable(Table[RelationshipView]):
+    """A columnar collection of relationships."""
+
+    view_type = RelationshipView
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        id_col: str = "id",
+        short_id_col: str | None = "short_id",
+        source_col: str = "source",
+        target_col: str = "target",
+        description_col: str | None = "description",
+        description_embedding_col: str | None = "description_embedding",
+        weight_col: str | None = "weight",
+        text_unit_ids_col: str | None = "text_unit_ids",
+        document_ids_col: str | None = "document_ids",
+        attributes_cols: list[str] | None = None,
+    ) -> "RelationshipTable":
+        """Build a relationship table from a dataframe, with the column options of read_relationships."""
+        return cls(
+            {
+                "id": _str_column(df, id_col, intern=True),
+                "short_id": _short_id_column(df, short_id_col),
+                "source": _str_column(df, source_col, intern=True),
+                "target": _str_column(df, target_col, intern=True),
+                "description": _optional_str_column(df, description_col),
+                "description_embedding": _embedding_column(
+                    df, description_embedding_col
+                ),
+                "weight": _optional_number_column(df, weight_col, float),
+                "text_unit_ids": _list_column(df, text_unit_ids_col, str),
+                "document_ids": _list_column(df, document_ids_col, str),
+                "attributes": _attribute_column(df, attributes_cols),
+            },
+            len(df),
+        )
+
+
+class TextUnitTable(Table[TextUnitView]):
+    """A columnar collection of text units."""
+
+    view_type = TextUnitView
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        id_col: str = "id",
+        short_id_col: str | None = "short_id",
+        text_col: str = "text",
+        entities_col: str | None = "entity_ids",
+        relationships_col: str | None = "relationship_ids",
+        covariates_col: str | None = "covariate_ids",
+        tokens_col: str | None = "n_tokens",
+        document_ids_col: str | None = "document_ids",
+        embedding_col: str | None = "text_embedding",
+        attributes_cols: list[str] | None = None,
+    ) -> "TextUnitTable":
+        """Build a text unit table from a dataframe, with the column options of read_text_units."""
+        return cls(
+            {
+                "id": _str_column(df, id_col, intern=True),
+                "short_id": _short_id_column(df, short_id_col),
+                "text": _str_column(df, text_col),
+                "entity_ids": _list_column(df, entities_col, str),
+                "relationship_ids": _list_column(df, relationships_col, str),
+                "covariate_ids": _object_column(df, covariates_col),
+                "text_embedding": _embedding_column(df, embedding_col),
+                "n_tokens": _optional_number_column(df, tokens_col, int),
+                "document_ids": _list_column(df, document_ids_col, str),
+                "attributes": _attribute_column(df, attributes_cols),
+            },
+            len(df),
+        )
+
+
+class CommunityReportTable(Table[CommunityReportView]):
+    """A columnar collection of community reports."""
+
+    view_type = CommunityReportView
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        id_col: str = "id",
+        short_id_col: str | None = "short_id",
+        title_col: str = "title",
+        community_col: str = "community",
+        summary_col: str = "summary",
+        content_col: str = "full_content",
+        rank_col: str | None = "rank",
+        summary_embedding_col: str | None = "summary_embedding",
+        content_embedding_col: str | None = "full_content_embedding",
+        attributes_cols: list[str] | None = None,
+    ) -> "CommunityReportTable":
+        """Build a community report table from a dataframe, with the column options of read_community_reports."""
+        return cls(
+            {
+                "id": _str_column(df, id_col, intern=True),
+                "short_id": _short_id_column(df, short_id_col),
+                "title": _str_column(df, title_col),
+                "community_id": _str_column(df, community_col, intern=True),
+                "summary": _str_column(df, summary_col),
+                "full_content": _str_column(df, content_col),
+                "rank": _optional_number_column(df, rank_col, float),
+                "summary_embedding": _embedding_column(df, summary_embedding_col),
+                "full_content_embedding": _embedding_column(df, content_embedding_col),
+                "attributes": _attribute_column(df, attributes_cols),
+            },
+            len(df),
+        )
+
+
+def _require(df: pd.DataFrame, column_name: str | None) -> pd.Series:
+    if column_name is None:
+        msg = "Column name is None"
+        raise ValueError(msg)
+    if column_name not in df.columns:
+        msg = f"Column {column_name} not found in data"
+        raise ValueError(msg)
+    return cast(pd.Series, df[column_name])
+
+
+def _str_column(
+    df: pd.DataFrame, column_name: str | None, intern: bool = False
+) -> ValueColumn:
+    convert = (lambda v: sys.intern(str(v))) if intern else str
+    return ValueColumn(_object_array([convert(v) for v in _require(df, column_name)]))
+
+
+def _optional_str_column(
+    df: pd.DataFrame, column_name: str | None, intern: bool = False
+) -> ValueColumn | None:
+    if column_name is None:
+        return None
+    convert = (lambda v: sys.intern(str(v))) if intern else str
+    return ValueColumn(
+        _object_array([
+            None if v is None else convert(v) for v in _require(df, column_name)
+        ])
+    )
+
+
+def _short_id_column(df: pd.DataFrame, column_name: str | None) -> ValueColumn | None:
+    if column_name is None:
+        return ValueColumn(_object_array([str(idx) for idx in df.index]))
+    return _optional_str_column(df, column_name)
+
+
+def _optional_number_column(
+    df: pd.DataFrame, column_name: str | None, number_type: type
+) -> ValueColumn | None:
+    if column_name is None:
+        return None
+    values = [None if v is None else number_type(v) for v in _require(df, column_name)]
+    if any(v is None for v in values):
+        return ValueColumn(_object_array(values))
+    return ValueColumn(
+        np.asarray(values, dtype=np.int64 if number_type is int else np.float64)
+    )
+
+
+def _object_column(df: pd.DataFrame, column_name: str | None) -> ValueColumn | None:
+    if column_name is None:
+        return None
+    return ValueColumn(_object_array(list(_require(df, column_name))))
+
+
+def _list_column(
+    df: pd.DataFrame, column_name: str | None, item_type: type | None = None
+) -> ListColumn | None:
+    if column_name is None or column_name not in df.columns:
+        return None
+    series = df[column_name]
+    present = np.fromiter(
+        (v is not None for v in series), dtype=bool, count=len(series)
+    )
+    lengths = np.zeros(len(series), dtype=np.int64)
+    items = []
+    for row, value in enumerate(series):
+        if value is None:
+            continue
+        if not isinstance(value, list | np.ndarray):
+            msg = f"value is not a list: {value} ({type(value)})"
+            # the same error as the list loaders raise for these values
+            raise ValueError(msg)  # noqa: TRY004
+        lengths[row] = len(value)
+        items.extend(value.tolist() if isinstance(value, np.ndarray) else value)
+    if item_type is not None:
+        for item in items:
+            if not isinstance(item, item_type):
+                msg = (
+                    f"list item has item that is not {item_type}: {item} ({type(item)})"
+                )
+                raise TypeError(msg)
+    flat = _object_array([sys.intern(v) if isinstance(v, str) else v for v in items])
+    offsets = np.zeros(len(series) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return ListColumn(flat, offsets, present)
+
+
+def _embedding_column(
+    df: pd.DataFrame, column_name: str | None
+) -> EmbeddingColumn | None:
+    if column_name is None or column_name not in df.columns:
+        return None
+    series = df[column_name]
+    present = np.fromiter(
+        (v is not None for v in series), dtype=bool, count=len(series)
+    )
+    dims = {len(v) for v in series if v is not None}
+    if len(dims) > 1:
+        msg = f"Embeddings in column {column_name} have different dimensions: {sorted(dims)}"
+        raise ValueError(msg)
+    dim = dims.pop() if dims else 0
+    vectors = series[present].tolist()
+    if len(vectors) == len(series):
+        # every row has an embedding, stack them straight into the matrix
+        return EmbeddingColumn(_stack(vectors, dim), present)
+    matrix = np.zeros((len(series), dim), dtype=np.float32)
+    if vectors:
+        matrix[present] = _stack(vectors, dim)
+    return EmbeddingColumn(matrix, present)
+
+
+def _stack(vectors: list, dim: int) -> np.ndarray:
+    if not vectors:
+        return np.zeros((0, dim), dtype=np.float32)
+    return np.asarray(vectors, dtype=np.float32).reshape(len(vectors), dim)
+
+
+def _attribute_column(
+    df: pd.DataFrame, attributes_cols: list[str] | None
+) -> AttributeColumn | None:
+    if not attributes_cols:
+        return None
+    return AttributeColumn({
+        col: ValueColumn(
+            _object_array(list(df[col]))
+            if col in df.columns
+            else np.full(len(df), None, dtype=object)
+        )
+        for col in attributes_cols
+    })
+
+
+def _object_array(values: list) -> np.ndarray:
+    # fromiter keeps list values as items instead of broadcasting them into a 2d array
+    return np.fromiter(values, dtype=object, count=len(values))
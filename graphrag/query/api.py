@@ -335,7 +335,7 @@ def _get_embedding_description_store(
         store_entity_semantic_embeddings(
             entities=entities, vectorstore=description_embedding_store
         )
-    else:
+    elif vector_store_type != VectorStoreType.Numpy:
         # load description embeddings to an in-memory lancedb vectorstore
         # and connect to a remote db, specify url and port values.
         description_embedding_store = LanceDBVectorStore(
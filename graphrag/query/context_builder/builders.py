@@ -3,7 +3,9 @@
 
 """Base classes for global and local context builders."""
 
+import asyncio
 from abc import ABC, abstractmethod
+from functools import partial
 
 import pandas as pd
 
@@ -33,3 +35,25 @@ class LocalContextBuilder(ABC):
         **kwargs,
     ) -> tuple[str | list[str], dict[str, pd.DataFrame]]:
         """Build the context for the local search mode."""
+
+    async def abuild_context(
+        self,
+        query: str,
+        conversation_history: ConversationHistory | None = None,
+        **kwargs,
+    ) -> tuple[str | list[str], dict[str, pd.DataFrame]]:
+        """Build the context for the local search mode without blocking the event loop.
+
+        The default implementation runs build_context on the loop's default executor;
+        subclasses with async dependencies should override it.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            partial(
+                self.build_context,
+                query=query,
+                conversation_history=conversation_history,
+                **kwargs,
+            ),
+        )
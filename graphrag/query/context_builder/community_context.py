@@ -3,15 +3,18 @@
 
 """Community Context."""
 
+import csv
+import io
 import logging
 import random
+from dataclasses import dataclass
 from typing import Any, cast
 
 import pandas as pd
 import tiktoken
 
 from graphrag.model import CommunityReport, Entity
-from graphrag.query.llm.text_utils import num_tokens
+from graphrag.query.llm.text_utils import get_token_counter
 
 log = logging.getLogger(__name__)
 
@@ -20,234 +23,274 @@ NO_COMMUNITY_RECORDS_WARNING: str = (
 )
 
 
-def build_community_context(
+@dataclass
+class RenderedCommunityReports:
+    """Query-independent rendering of community reports: the rows of the report table and their token counts."""
+
+    header: list[str]
+    records: list[list[str]]
+    """The rendered cells of each included report."""
+    csv_rows: list[str]
+    """Each record as a line of the CSV table sent to the LLM."""
+    tokens: list[int]
+    """The token count of each record as a delimited context line."""
+    sort_keys: list[tuple[float, ...]]
+    """The (weight, rank) values the records of a batch are sorted by, in descending order."""
+    sort_columns: list[str]
+
+
+def render_community_reports(
     community_reports: list[CommunityReport],
     entities: list[Entity] | None = None,
     token_encoder: tiktoken.Encoding | None = None,
     use_community_summary: bool = True,
     column_delimiter: str = "|",
-    shuffle_data: bool = True,
     include_community_rank: bool = False,
     min_community_rank: int = 0,
     community_rank_name: str = "rank",
     include_community_weight: bool = True,
     community_weight_name: str = "occurrence weight",
     normalize_community_weight: bool = True,
-    max_tokens: int = 8000,
-    single_batch: bool = True,
-    context_name: str = "Reports",
-    random_state: int = 86,
-) -> tuple[str | list[str], dict[str, pd.DataFrame]]:
+) -> RenderedCommunityReports:
     """
-    Prepare community report data table as context data for system prompt.
+    Render the included community reports as context rows and count their tokens.
 
-    If entities are provided, the community weight is calculated as the count of text units associated with entities within the community.
-
-    The calculated weight is added as an attribute to the community reports and added to the context data table.
+    If entities are provided, the community weight is calculated as the count of text units associated with entities within the community,
+    and added to the rows of the context data table. The community reports are not modified.
     """
-
-    def _is_included(report: CommunityReport) -> bool:
-        return report.rank is not None and report.rank >= min_community_rank
-
-    def _get_header(attributes: list[str]) -> list[str]:
-        header = ["id", "title"]
-        attributes = [col for col in attributes if col not in header]
-        if not include_community_weight:
-            attributes = [col for col in attributes if col != community_weight_name]
-        header.extend(attributes)
-        header.append("summary" if use_community_summary else "content")
-        if include_community_rank:
-            header.append(community_rank_name)
-        return header
-
-    def _report_context_text(
-        report: CommunityReport, attributes: list[str]
-    ) -> tuple[str, list[str]]:
-        context: list[str] = [
-            report.short_id if report.short_id else "",
-            report.title,
-            *[
-                str(report.attributes.get(field, "")) if report.attributes else ""
-                for field in attributes
-            ],
-        ]
-        context.append(report.summary if use_community_summary else report.full_content)
-        if include_community_rank:
-            context.append(str(report.rank))
-        result = column_delimiter.join(context) + "\n"
-        return result, context
-
+    attributes = (
+        list(community_reports[0].attributes.keys())
+        if len(community_reports) > 0 and community_reports[0].attributes
+        else []
+    )
+    community_weights = None
     compute_community_weights = (
         entities
         and len(community_reports) > 0
         and include_community_weight
-        and (
-            community_reports[0].attributes is None
-            or community_weight_name not in community_reports[0].attributes
-        )
+        and community_weight_name not in attributes
     )
     if compute_community_weights:
         log.info("Computing community weights...")
-        community_reports = _compute_community_weights(
+        community_weights = _compute_community_weights(
             community_reports=community_reports,
             entities=entities,
-            weight_attribute=community_weight_name,
             normalize=normalize_community_weight,
         )
+        attributes.append(community_weight_name)
+
+    header = ["id", "title"]
+    attribute_cols = [col for col in attributes if col not in header]
+    if not include_community_weight:
+        attribute_cols = [col for col in attribute_cols if col != community_weight_name]
+    header.extend(attribute_cols)
+    header.append("summary" if use_community_summary else "content")
+    if include_community_rank:
+        header.append(community_rank_name)
+
+    sort_columns = []
+    if entities and include_community_weight:
+        sort_columns.append(community_weight_name)
+    if include_community_rank:
+        sort_columns.append(community_rank_name)
+    sort_indexes = [header.index(col) for col in sort_columns]
+
+    token_counter = get_token_counter(token_encoder)
+    rendered = RenderedCommunityReports(
+        header=header,
+        records=[],
+        csv_rows=[],
+        tokens=[],
+        sort_keys=[],
+        sort_columns=sort_columns,
+    )
+    for i, report in enumerate(community_reports):
+        if report.rank is None or report.rank < min_community_rank:
+            continue
+        report_attributes = report.attributes
+        if community_weights is not None:
+            report_attributes = {
+                **(report.attributes or {}),
+                community_weight_name: community_weights[i],
+            }
+        record: list[str] = [
+            report.short_id if report.short_id else "",
+            report.title,
+            *[
+                str(report_attributes.get(field, "")) if report_attributes else ""
+                for field in attribute_cols
+            ],
+        ]
+        record.append(report.summary if use_community_summary else report.full_content)
+        if include_community_rank:
+            record.append(str(report.rank))
+        sort_key = tuple(float(record[index]) for index in sort_indexes)
+        csv_record = list[Any](record)
+        for index, value in zip(sort_indexes, sort_key, strict=True):
+            # the sort columns are written as floats
+            csv_record[index] = value
+
+        rendered.records.append(record)
+        rendered.csv_rows.append(_to_csv_line(csv_record, column_delimiter))
+        rendered.tokens.append(
+            token_counter.num_tokens(column_delimiter.join(record) + "\n")
+        )
+        rendered.sort_keys.append(sort_key)
+    return rendered
 
-    selected_reports = [report for report in community_reports if _is_included(report)]
 
-    if selected_reports is None or len(selected_reports) == 0:
+def pack_community_context(
+    rendered_reports: RenderedCommunityReports,
+    token_encoder: tiktoken.Encoding | None = None,
+    column_delimiter: str = "|",
+    shuffle_data: bool = True,
+    max_tokens: int = 8000,
+    single_batch: bool = True,
+    context_name: str = "Reports",
+    random_state: int = 86,
+) -> tuple[str | list[str], dict[str, pd.DataFrame]]:
+    """Pack pre-rendered community report rows into batches of at most max_tokens tokens."""
+    order = list(range(len(rendered_reports.records)))
+    if len(order) == 0:
         return ([], {})
 
     if shuffle_data:
         random.seed(random_state)
-        random.shuffle(selected_reports)
+        random.shuffle(order)
 
-    # "global" variables
-    attributes = (
-        list(community_reports[0].attributes.keys())
-        if community_reports[0].attributes
-        else []
+    header = rendered_reports.header
+    header_tokens = get_token_counter(token_encoder).num_tokens(
+        f"-----{context_name}-----" + "\n" + column_delimiter.join(header) + "\n"
     )
-    header = _get_header(attributes)
+    csv_header = _to_csv_line(header, column_delimiter)
     all_context_text: list[str] = []
-    all_context_records: list[pd.DataFrame] = []
-
-    # batch variables
-    batch_text: str = ""
-    batch_tokens: int = 0
-    batch_records: list[list[str]] = []
+    all_context_rows: list[int] = []
 
-    def _init_batch() -> None:
-        nonlocal batch_text, batch_tokens, batch_records
-        batch_text = (
-            f"-----{context_name}-----" + "\n" + column_delimiter.join(header) + "\n"
-        )
-        batch_tokens = num_tokens(batch_text, token_encoder)
-        batch_records = []
+    batch_tokens = header_tokens
+    batch_rows: list[int] = []
 
     def _cut_batch() -> None:
-        # convert the current context records to pandas dataframe and sort by weight and rank if exist
-        record_df = _convert_report_context_to_df(
-            context_records=batch_records,
-            header=header,
-            weight_column=(
-                community_weight_name if entities and include_community_weight else None
-            ),
-            rank_column=community_rank_name if include_community_rank else None,
-        )
-        if len(record_df) == 0:
+        # sort the batch by weight and rank if exist
+        if len(batch_rows) == 0:
             return
-        current_context_text = record_df.to_csv(index=False, sep=column_delimiter)
-        all_context_text.append(current_context_text)
-        all_context_records.append(record_df)
-
-    # initialize the first batch
-    _init_batch()
-
-    for report in selected_reports:
-        new_context_text, new_context = _report_context_text(report, attributes)
-        new_tokens = num_tokens(new_context_text, token_encoder)
+        if rendered_reports.sort_columns:
+            batch_rows.sort(
+                key=lambda row: tuple(-v for v in rendered_reports.sort_keys[row])
+            )
+        all_context_text.append(
+            csv_header + "".join(rendered_reports.csv_rows[row] for row in batch_rows)
+        )
+        all_context_rows.extend(batch_rows)
 
+    for row in order:
+        new_tokens = rendered_reports.tokens[row]
         if batch_tokens + new_tokens > max_tokens:
             # add the current batch to the context data and start a new batch if we are in multi-batch mode
             _cut_batch()
+            batch_rows = []
             if single_batch:
                 break
-            _init_batch()
+            batch_tokens = header_tokens
 
         # add current report to the current batch
-        batch_text += new_context_text
         batch_tokens += new_tokens
-        batch_records.append(new_context)
+        batch_rows.append(row)
 
     # add the last batch if it has not been added
-    if batch_text not in all_context_text:
-        _cut_batch()
+    _cut_batch()
 
-    if len(all_context_records) == 0:
+    if len(all_context_rows) == 0:
         log.warning(NO_COMMUNITY_RECORDS_WARNING)
         return ([], {})
 
-    return all_context_text, {
-        context_name.lower(): pd.concat(all_context_records, ignore_index=True)
-    }
+    record_df = pd.DataFrame(
+        [rendered_reports.records[row] for row in all_context_rows],
+        columns=cast(Any, header),
+    )
+    for column in rendered_reports.sort_columns:
+        record_df[column] = record_df[column].astype(float)
+    return all_context_text, {context_name.lower(): record_df}
+
+
+def build_community_context(
+    community_reports: list[CommunityReport],
+    entities: list[Entity] | None = None,
+    token_encoder: tiktoken.Encoding | None = None,
+    use_community_summary: bool = True,
+    column_delimiter: str = "|",
+    shuffle_data: bool = True,
+    include_community_rank: bool = False,
+    min_community_rank: int = 0,
+    community_rank_name: str = "rank",
+    include_community_weight: bool = True,
+    community_weight_name: str = "occurrence weight",
+    normalize_community_weight: bool = True,
+    max_tokens: int = 8000,
+    single_batch: bool = True,
+    context_name: str = "Reports",
+    random_state: int = 86,
+) -> tuple[str | list[str], dict[str, pd.DataFrame]]:
+    """
+    Prepare community report data table as context data for system prompt.
+
+    If entities are provided, the community weight is calculated as the count of text units associated with entities within the community.
+
+    The calculated weight is added to the context data table.
+    """
+    rendered_reports = render_community_reports(
+        community_reports=community_reports,
+        entities=entities,
+        token_encoder=token_encoder,
+        use_community_summary=use_community_summary,
+        column_delimiter=column_delimiter,
+        include_community_rank=include_community_rank,
+        min_community_rank=min_community_rank,
+        community_rank_name=community_rank_name,
+        include_community_weight=include_community_weight,
+        community_weight_name=community_weight_name,
+        normalize_community_weight=normalize_community_weight,
+    )
+    return pack_community_context(
+        rendered_reports=rendered_reports,
+        token_encoder=token_encoder,
+        column_delimiter=column_delimiter,
+        shuffle_data=shuffle_data,
+        max_tokens=max_tokens,
+        single_batch=single_batch,
+        context_name=context_name,
+        random_state=random_state,
+    )
 
 
 def _compute_community_weights(
     community_reports: list[CommunityReport],
     entities: list[Entity] | None,
-    weight_attribute: str = "occurrence",
     normalize: bool = True,
-) -> list[CommunityReport]:
+) -> list[float]:
     """Calculate a community's weight as count of text units associated with entities within the community."""
     if not entities:
-        return community_reports
+        return [0] * len(community_reports)
 
     community_text_units = {}
     for entity in entities:
         if entity.community_ids:
             for community_id in entity.community_ids:
                 if community_id not in community_text_units:
-                    community_text_units[community_id] = []
-                community_text_units[community_id].extend(entity.text_unit_ids)
-    for report in community_reports:
-        if not report.attributes:
-            report.attributes = {}
-        report.attributes[weight_attribute] = len(
-            set(community_text_units.get(report.community_id, []))
-        )
+                    community_text_units[community_id] = set()
+                community_text_units[community_id].update(entity.text_unit_ids or [])
+    weights: list[float] = [
+        len(community_text_units.get(report.community_id, []))
+        for report in community_reports
+    ]
     if normalize:
         # normalize by max weight
-        all_weights = [
-            report.attributes[weight_attribute]
-            for report in community_reports
-            if report.attributes
-        ]
-        max_weight = max(all_weights)
-        for report in community_reports:
-            if report.attributes:
-                report.attributes[weight_attribute] = (
-                    report.attributes[weight_attribute] / max_weight
-                )
-    return community_reports
-
-
-def _rank_report_context(
-    report_df: pd.DataFrame,
-    weight_column: str | None = "occurrence weight",
-    rank_column: str | None = "rank",
-) -> pd.DataFrame:
-    """Sort report context by community weight and rank if exist."""
-    rank_attributes: list[str] = []
-    if weight_column:
-        rank_attributes.append(weight_column)
-        report_df[weight_column] = report_df[weight_column].astype(float)
-    if rank_column:
-        rank_attributes.append(rank_column)
-        report_df[rank_column] = report_df[rank_column].astype(float)
-    if len(rank_attributes) > 0:
-        report_df.sort_values(by=rank_attributes, ascending=False, inplace=True)
-    return report_df
-
-
-def _convert_report_context_to_df(
-    context_records: list[list[str]],
-    header: list[str],
-    weight_column: str | None = None,
-    rank_column: str | None = None,
-) -> pd.DataFrame:
-    """Convert report context records to pandas dataframe and sort by weight and rank if exist."""
-    if len(context_records) == 0:
-        return pd.DataFrame()
+        max_weight = max(weights)
+        return [weight / max_weight for weight in weights]
+    return weights
 
-    record_df = pd.DataFrame(
-        context_records,
-        columns=cast(Any, header),
-    )
-    return _rank_report_context(
-        report_df=record_df,
-        weight_column=weight_column,
-        rank_column=rank_column,
-    )
+
+def _to_csv_line(values: list[Any], column_delimiter: str) -> str:
+    """Write a row the way DataFrame.to_csv does."""
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter=column_delimiter, lineterminator="\n").writerow(values)
+    return buffer.getvalue()
@@ -3,15 +3,19 @@
 
 """Orchestration Context Builders."""
 
+import asyncio
 from enum import Enum
+from functools import partial
 
 from graphrag.model import Entity, Relationship
 from graphrag.query.input.retrieval.entities import (
+    EntityIndex,
     get_entity_by_key,
     get_entity_by_name,
+    get_entity_index,
 )
 from graphrag.query.llm.base import BaseTextEmbedding
-from graphrag.vector_stores import BaseVectorStore
+from graphrag.vector_stores import BaseVectorStore, VectorStoreSearchResult
 
 
 class EntityVectorStoreKey(str, Enum):
@@ -36,7 +40,7 @@ def map_query_to_entities(
     query: str,
     text_embedding_vectorstore: BaseVectorStore,
     text_embedder: BaseTextEmbedding,
-    all_entities: list[Entity],
+    all_entities: list[Entity] | EntityIndex,
     embedding_vectorstore_key: str = EntityVectorStoreKey.ID,
     include_entity_names: list[str] | None = None,
     exclude_entity_names: list[str] | None = None,
@@ -44,11 +48,7 @@ def map_query_to_entities(
     oversample_scaler: int = 2,
 ) -> list[Entity]:
     """Extract entities that match a given query using semantic similarity of text embeddings of query and entity descriptions."""
-    if include_entity_names is None:
-        include_entity_names = []
-    if exclude_entity_names is None:
-        exclude_entity_names = []
-    matched_entities = []
+    search_results = []
     if query != "":
         # get entities with highest semantic similarity to query
         # oversample to account for excluded entities
@@ -57,17 +57,84 @@ def map_query_to_entities(
             text_embedder=lambda t: text_embedder.embed(t),
             k=k * oversample_scaler,
         )
+    return _select_mapped_entities(
+        query=query,
+        search_results=search_results,
+        all_entities=all_entities,
+        embedding_vectorstore_key=embedding_vectorstore_key,
+        include_entity_names=include_entity_names,
+        exclude_entity_names=exclude_entity_names,
+        k=k,
+    )
+
+
+async def amap_query_to_entities(
+    query: str,
+    text_embedding_vectorstore: BaseVectorStore,
+    text_embedder: BaseTextEmbedding,
+    all_entities: list[Entity] | EntityIndex,
+    embedding_vectorstore_key: str = EntityVectorStoreKey.ID,
+    include_entity_names: list[str] | None = None,
+    exclude_entity_names: list[str] | None = None,
+    k: int = 10,
+    oversample_scaler: int = 2,
+) -> list[Entity]:
+    """Async version of map_query_to_entities.
+
+    The query is embedded with text_embedder.aembed and the vector store search runs on the
+    loop's default executor, so neither blocks the event loop.
+    """
+    search_results = []
+    if query != "":
+        query_embedding = await text_embedder.aembed(query)
+        if query_embedding is not None and len(query_embedding) > 0:
+            loop = asyncio.get_running_loop()
+            search_results = await loop.run_in_executor(
+                None,
+                partial(
+                    text_embedding_vectorstore.similarity_search_by_vector,
+                    query_embedding=query_embedding,
+                    k=k * oversample_scaler,
+                ),
+            )
+    return _select_mapped_entities(
+        query=query,
+        search_results=search_results,
+        all_entities=all_entities,
+        embedding_vectorstore_key=embedding_vectorstore_key,
+        include_entity_names=include_entity_names,
+        exclude_entity_names=exclude_entity_names,
+        k=k,
+    )
+
+
+def _select_mapped_entities(
+    query: str,
+    search_results: list[VectorStoreSearchResult],
+    all_entities: list[Entity] | EntityIndex,
+    embedding_vectorstore_key: str = EntityVectorStoreKey.ID,
+    include_entity_names: list[str] | None = None,
+    exclude_entity_names: list[str] | None = None,
+    k: int = 10,
+) -> list[Entity]:
+    """Resolve vector store hits to entities and apply the include/exclude lists."""
+    if include_entity_names is None:
+        include_entity_names = []
+    if exclude_entity_names is None:
+        exclude_entity_names = []
+    entity_index = get_entity_index(all_entities)
+    matched_entities = []
+    if query != "":
         for result in search_results:
             matched = get_entity_by_key(
-                entities=all_entities,
+                entities=entity_index,
                 key=embedding_vectorstore_key,
                 value=result.document.id,
             )
             if matched:
                 matched_entities.append(matched)
     else:
-        all_entities.sort(key=lambda x: x.rank if x.rank else 0, reverse=True)
-        matched_entities = all_entities[:k]
+        matched_entities = entity_index.ranked_entities[:k]
 
     # filter out excluded entities
     if exclude_entity_names:
@@ -80,14 +147,14 @@ def map_query_to_entities(
     # add entities in the include_entity list
     included_entities = []
     for entity_name in include_entity_names:
-        included_entities.extend(get_entity_by_name(all_entities, entity_name))
+        included_entities.extend(get_entity_by_name(entity_index, entity_name))
     return included_entities + matched_entities
 
 
 def find_nearest_neighbors_by_graph_embeddings(
     entity_id: str,
     graph_embedding_vectorstore: BaseVectorStore,
-    all_entities: list[Entity],
+    all_entities: list[Entity] | EntityIndex,
     exclude_entity_names: list[str] | None = None,
     embedding_vectorstore_key: str = EntityVectorStoreKey.ID,
     k: int = 10,
@@ -96,21 +163,22 @@ def find_nearest_neighbors_by_graph_embeddings(
     """Retrieve related entities by graph embeddings."""
     if exclude_entity_names is None:
         exclude_entity_names = []
+    entity_index = get_entity_index(all_entities)
     # find nearest neighbors of this entity using graph embedding
     query_entity = get_entity_by_key(
-        entities=all_entities, key=embedding_vectorstore_key, value=entity_id
+        entities=entity_index, key=embedding_vectorstore_key, value=entity_id
     )
     query_embedding = query_entity.graph_embedding if query_entity else None
 
     # oversample to account for excluded entities
-    if query_embedding:
+    if query_embedding is not None and len(query_embedding) > 0:
         matched_entities = []
         search_results = graph_embedding_vectorstore.similarity_search_by_vector(
             query_embedding=query_embedding, k=k * oversample_scaler
         )
         for result in search_results:
             matched = get_entity_by_key(
-                entities=all_entities,
+                entities=entity_index,
                 key=embedding_vectorstore_key,
                 value=result.document.id,
             )
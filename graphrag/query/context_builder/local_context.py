@@ -16,13 +16,14 @@ from graphrag.query.input.retrieval.covariates import (
 )
 from graphrag.query.input.retrieval.entities import to_entity_dataframe
 from graphrag.query.input.retrieval.relationships import (
+    RelationshipIndex,
     get_candidate_relationships,
     get_entities_from_relationships,
     get_in_network_relationships,
     get_out_network_relationships,
     to_relationship_dataframe,
 )
-from graphrag.query.llm.text_utils import num_tokens
+from graphrag.query.llm.text_utils import get_token_counter
 
 
 def build_entity_context(
@@ -50,7 +51,8 @@ def build_entity_context(
     )
     header.extend(attribute_cols)
     current_context_text += column_delimiter.join(header) + "\n"
-    current_tokens = num_tokens(current_context_text, token_encoder)
+    token_counter = get_token_counter(token_encoder)
+    current_tokens = token_counter.num_tokens(current_context_text)
 
     all_context_records = [header]
     for entity in selected_entities:
@@ -69,7 +71,7 @@ def build_entity_context(
             )
             new_context.append(field_value)
         new_context_text = column_delimiter.join(new_context) + "\n"
-        new_tokens = num_tokens(new_context_text, token_encoder)
+        new_tokens = token_counter.num_tokens(new_context_text)
         if current_tokens + new_tokens > max_tokens:
             break
         current_context_text += new_context_text
@@ -111,7 +113,8 @@ def build_covariates_context(
     attribute_cols = list(attributes.keys()) if len(covariates) > 0 else []
     header.extend(attribute_cols)
     current_context_text += column_delimiter.join(header) + "\n"
-    current_tokens = num_tokens(current_context_text, token_encoder)
+    token_counter = get_token_counter(token_encoder)
+    current_tokens = token_counter.num_tokens(current_context_text)
 
     all_context_records = [header]
     for entity in selected_entities:
@@ -133,7 +136,7 @@ def build_covariates_context(
             new_context.append(field_value)
 
         new_context_text = column_delimiter.join(new_context) + "\n"
-        new_tokens = num_tokens(new_context_text, token_encoder)
+        new_tokens = token_counter.num_tokens(new_context_text)
         if current_tokens + new_tokens > max_tokens:
             break
         current_context_text += new_context_text
@@ -152,7 +155,7 @@ def build_covariates_context(
 
 def build_relationship_context(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     token_encoder: tiktoken.Encoding | None = None,
     include_relationship_weight: bool = False,
     max_tokens: int = 8000,
@@ -186,7 +189,8 @@ def build_relationship_context(
     header.extend(attribute_cols)
 
     current_context_text += column_delimiter.join(header) + "\n"
-    current_tokens = num_tokens(current_context_text, token_encoder)
+    token_counter = get_token_counter(token_encoder)
+    current_tokens = token_counter.num_tokens(current_context_text)
 
     all_context_records = [header]
     for rel in selected_relationships:
@@ -206,7 +210,7 @@ def build_relationship_context(
             )
             new_context.append(field_value)
         new_context_text = column_delimiter.join(new_context) + "\n"
-        new_tokens = num_tokens(new_context_text, token_encoder)
+        new_tokens = token_counter.num_tokens(new_context_text)
         if current_tokens + new_tokens > max_tokens:
             break
         current_context_text += new_context_text
@@ -225,7 +229,7 @@ def build_relationship_context(
 
 def _filter_relationships(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     top_k_relationships: int = 10,
     relationship_ranking_attribute: str = "rank",
 ) -> list[Relationship]:
@@ -249,54 +253,39 @@ def _filter_relationships(
 
     # within out-of-network relationships, prioritize mutual relationships
     # (i.e. relationships with out-network entities that are shared with multiple selected entities)
-    selected_entity_names = [entity.title for entity in selected_entities]
-    out_network_source_names = [
-        relationship.source
-        for relationship in out_network_relationships
-        if relationship.source not in selected_entity_names
-    ]
-    out_network_target_names = [
-        relationship.target
-        for relationship in out_network_relationships
-        if relationship.target not in selected_entity_names
-    ]
-    out_network_entity_names = list(
-        set(out_network_source_names + out_network_target_names)
-    )
-    out_network_entity_links = defaultdict(int)
-    for entity_name in out_network_entity_names:
-        targets = [
-            relationship.target
-            for relationship in out_network_relationships
-            if relationship.source == entity_name
-        ]
-        sources = [
-            relationship.source
-            for relationship in out_network_relationships
-            if relationship.target == entity_name
-        ]
-        out_network_entity_links[entity_name] = len(set(targets + sources))
+    selected_entity_names = {entity.title for entity in selected_entities}
+    out_network_entity_neighbors = defaultdict(set)
+    for relationship in out_network_relationships:
+        if relationship.source not in selected_entity_names:
+            out_network_entity_neighbors[relationship.source].add(relationship.target)
+        if relationship.target not in selected_entity_names:
+            out_network_entity_neighbors[relationship.target].add(relationship.source)
+    out_network_entity_links = {
+        entity_name: len(neighbors)
+        for entity_name, neighbors in out_network_entity_neighbors.items()
+    }
 
     # sort out-network relationships by number of links and rank_attributes
-    for rel in out_network_relationships:
-        if rel.attributes is None:
-            rel.attributes = {}
-        rel.attributes["links"] = (
+    # the links are kept here rather than on the relationships, which are shared by concurrent queries
+    links = {
+        rel.id: (
             out_network_entity_links[rel.source]
             if rel.source in out_network_entity_links
             else out_network_entity_links[rel.target]
         )
+        for rel in out_network_relationships
+    }
 
-    # sort by attributes[links] first, then by ranking_attribute
+    # sort by links first, then by ranking_attribute
     if relationship_ranking_attribute == "weight":
         out_network_relationships.sort(
-            key=lambda x: (x.attributes["links"], x.weight),  # type: ignore
+            key=lambda x: (links[x.id], x.weight),  # type: ignore
             reverse=True,  # type: ignore
         )
     else:
         out_network_relationships.sort(
             key=lambda x: (
-                x.attributes["links"],  # type: ignore
+                links[x.id],
                 x.attributes[relationship_ranking_attribute],  # type: ignore
             ),  # type: ignore
             reverse=True,
@@ -309,7 +298,7 @@ def _filter_relationships(
 def get_candidate_context(
     selected_entities: list[Entity],
     entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     covariates: dict[str, list[Covariate]],
     include_entity_rank: bool = True,
     entity_rank_description: str = "number of relationships",
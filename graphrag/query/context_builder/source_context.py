@@ -4,13 +4,15 @@
 """Context Build utility methods."""
 
 import random
+from collections import defaultdict
+from collections.abc import Iterable
 from typing import Any, cast
 
 import pandas as pd
 import tiktoken
 
 from graphrag.model import Entity, Relationship, TextUnit
-from graphrag.query.llm.text_utils import num_tokens
+from graphrag.query.llm.text_utils import get_token_counter
 
 """
 Contain util functions to build text unit context for the search's system prompt
@@ -46,7 +48,8 @@ def build_text_unit_context(
     header.extend(attribute_cols)
 
     current_context_text += column_delimiter.join(header) + "\n"
-    current_tokens = num_tokens(current_context_text, token_encoder)
+    token_counter = get_token_counter(token_encoder)
+    current_tokens = token_counter.num_tokens(current_context_text)
     all_context_records = [header]
 
     for unit in text_units:
@@ -59,7 +62,7 @@ def build_text_unit_context(
             ],
         ]
         new_context_text = column_delimiter.join(new_context) + "\n"
-        new_tokens = num_tokens(new_context_text, token_encoder)
+        new_tokens = token_counter.num_tokens(new_context_text)
 
         if current_tokens + new_tokens > max_tokens:
             break
@@ -77,12 +80,46 @@ def build_text_unit_context(
     return current_context_text, {context_name.lower(): record_df}
 
 
+def build_text_unit_relationship_index(
+    text_units: Iterable[TextUnit], relationships: dict[str, Relationship]
+) -> dict[str, list[Relationship]]:
+    """Map each text unit id to the relationships associated with it.
+
+    Text units without relationship_ids fall back to the relationships that list the text unit in their text_unit_ids.
+    """
+    relationships_by_text_unit = defaultdict(list)
+    for rel in relationships.values():
+        for text_unit_id in dict.fromkeys(rel.text_unit_ids or []):
+            relationships_by_text_unit[text_unit_id].append(rel)
+
+    index = {}
+    for text_unit in text_units:
+        if text_unit.relationship_ids is None:
+            index[text_unit.id] = relationships_by_text_unit.get(text_unit.id, [])
+        else:
+            index[text_unit.id] = [
+                relationships[rel_id]
+                for rel_id in text_unit.relationship_ids
+                if rel_id in relationships
+            ]
+    return index
+
+
 def count_relationships(
-    text_unit: TextUnit, entity: Entity, relationships: dict[str, Relationship]
+    text_unit: TextUnit,
+    entity: Entity,
+    relationships: dict[str, Relationship],
+    text_unit_relationships: dict[str, list[Relationship]] | None = None,
 ) -> int:
     """Count the number of relationships of the selected entity that are associated with the text unit."""
     matching_relationships = list[Relationship]()
-    if text_unit.relationship_ids is None:
+    if text_unit_relationships is not None and text_unit.id in text_unit_relationships:
+        matching_relationships = [
+            rel
+            for rel in text_unit_relationships[text_unit.id]
+            if rel.source == entity.title or rel.target == entity.title
+        ]
+    elif text_unit.relationship_ids is None:
         entity_relationships = [
             rel
             for rel in relationships.values()
@@ -97,14 +134,14 @@ def count_relationships(
             if text_unit.id in rel.text_unit_ids  # type: ignore
         ]  # type: ignore
     else:
-        text_unit_relationships = [
+        unit_relationships = [
             relationships[rel_id]
             for rel_id in text_unit.relationship_ids
             if rel_id in relationships
         ]
         matching_relationships = [
             rel
-            for rel in text_unit_relationships
+            for rel in unit_relationships
             if rel.source == entity.title or rel.target == entity.title
         ]
     return len(matching_relationships)
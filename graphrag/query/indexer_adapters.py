@@ -6,11 +6,21 @@ The parts of these functions that do type adaptation, renaming, collating, etc.
 Ideally this is just a straight read-thorugh into the object model.
 """
 
-from typing import cast
+from typing import Literal, cast, overload
 
 import pandas as pd
 
-from graphrag.model import CommunityReport, Covariate, Entity, Relationship, TextUnit
+from graphrag.model import (
+    CommunityReport,
+    CommunityReportTable,
+    Covariate,
+    Entity,
+    EntityTable,
+    Relationship,
+    RelationshipTable,
+    TextUnit,
+    TextUnitTable,
+)
 from graphrag.query.input.loaders.dfs import (
     read_community_reports,
     read_covariates,
@@ -20,9 +30,30 @@ from graphrag.query.input.loaders.dfs import (
 )
 
 
-def read_indexer_text_units(final_text_units: pd.DataFrame) -> list[TextUnit]:
-    """Read in the Text Units from the raw indexing outputs."""
-    return read_text_units(
+@overload
+def read_indexer_text_units(
+    final_text_units: pd.DataFrame, columnar: Literal[False] = False
+) -> list[TextUnit]: ...
+
+
+@overload
+def read_indexer_text_units(
+    final_text_units: pd.DataFrame, columnar: Literal[True]
+) -> TextUnitTable: ...
+
+
+@overload
+def read_indexer_text_units(
+    final_text_units: pd.DataFrame, columnar: bool
+) -> list[TextUnit] | TextUnitTable: ...
+
+
+def read_indexer_text_units(
+    final_text_units: pd.DataFrame, columnar: bool = False
+) -> list[TextUnit] | TextUnitTable:
+    """Read in the Text Units from the raw indexing outputs, as a TextUnitTable if columnar is set."""
+    reader = TextUnitTable.from_frame if columnar else read_text_units
+    return reader(
         df=final_text_units,
         short_id_col=None,
         # expects a covariate map of type -> ids
@@ -48,9 +79,30 @@ def read_indexer_covariates(final_covariates: pd.DataFrame) -> list[Covariate]:
     )
 
 
-def read_indexer_relationships(final_relationships: pd.DataFrame) -> list[Relationship]:
-    """Read in the Relationships from the raw indexing outputs."""
-    return read_relationships(
+@overload
+def read_indexer_relationships(
+    final_relationships: pd.DataFrame, columnar: Literal[False] = False
+) -> list[Relationship]: ...
+
+
+@overload
+def read_indexer_relationships(
+    final_relationships: pd.DataFrame, columnar: Literal[True]
+) -> RelationshipTable: ...
+
+
+@overload
+def read_indexer_relationships(
+    final_relationships: pd.DataFrame, columnar: bool
+) -> list[Relationship] | RelationshipTable: ...
+
+
+def read_indexer_relationships(
+    final_relationships: pd.DataFrame, columnar: bool = False
+) -> list[Relationship] | RelationshipTable:
+    """Read in the Relationships from the raw indexing outputs, as a RelationshipTable if columnar is set."""
+    reader = RelationshipTable.from_frame if columnar else read_relationships
+    return reader(
         df=final_relationships,
         short_id_col="human_readable_id",
         description_embedding_col=None,
@@ -59,12 +111,40 @@ def read_indexer_relationships(final_relationships: pd.DataFrame) -> list[Relati
     )
 
 
+@overload
+def read_indexer_reports(
+    final_community_reports: pd.DataFrame,
+    final_nodes: pd.DataFrame,
+    community_level: int,
+    columnar: Literal[False] = False,
+) -> list[CommunityReport]: ...
+
+
+@overload
+def read_indexer_reports(
+    final_community_reports: pd.DataFrame,
+    final_nodes: pd.DataFrame,
+    community_level: int,
+    columnar: Literal[True],
+) -> CommunityReportTable: ...
+
+
+@overload
 def read_indexer_reports(
     final_community_reports: pd.DataFrame,
     final_nodes: pd.DataFrame,
     community_level: int,
-) -> list[CommunityReport]:
-    """Read in the Community Reports from the raw indexing outputs."""
+    columnar: bool,
+) -> list[CommunityReport] | CommunityReportTable: ...
+
+
+def read_indexer_reports(
+    final_community_reports: pd.DataFrame,
+    final_nodes: pd.DataFrame,
+    community_level: int,
+    columnar: bool = False,
+) -> list[CommunityReport] | CommunityReportTable:
+    """Read in the Community Reports from the raw indexing outputs, as a CommunityReportTable if columnar is set."""
     report_df = final_community_reports
     entity_df = final_nodes
     entity_df = _filter_under_community_level(entity_df, community_level)
@@ -78,7 +158,8 @@ def read_indexer_reports(
     report_df = _filter_under_community_level(report_df, community_level)
     report_df = report_df.merge(filtered_community_df, on="community", how="inner")
 
-    return read_community_reports(
+    reader = CommunityReportTable.from_frame if columnar else read_community_reports
+    return reader(
         df=report_df,
         id_col="community",
         short_id_col="community",
@@ -87,12 +168,40 @@ def read_indexer_reports(
     )
 
 
+@overload
+def read_indexer_entities(
+    final_nodes: pd.DataFrame,
+    final_entities: pd.DataFrame,
+    community_level: int,
+    columnar: Literal[False] = False,
+) -> list[Entity]: ...
+
+
+@overload
+def read_indexer_entities(
+    final_nodes: pd.DataFrame,
+    final_entities: pd.DataFrame,
+    community_level: int,
+    columnar: Literal[True],
+) -> EntityTable: ...
+
+
+@overload
+def read_indexer_entities(
+    final_nodes: pd.DataFrame,
+    final_entities: pd.DataFrame,
+    community_level: int,
+    columnar: bool,
+) -> list[Entity] | EntityTable: ...
+
+
 def read_indexer_entities(
     final_nodes: pd.DataFrame,
     final_entities: pd.DataFrame,
     community_level: int,
-) -> list[Entity]:
-    """Read in the Entities from the raw indexing outputs."""
+    columnar: bool = False,
+) -> list[Entity] | EntityTable:
+    """Read in the Entities from the raw indexing outputs, as an EntityTable if columnar is set."""
     entity_df = final_nodes
     entity_embedding_df = final_entities
 
@@ -115,7 +224,8 @@ def read_indexer_entities(
     ).drop_duplicates(subset=["name"])
 
     # read entity dataframe to knowledge model objects
-    return read_entities(
+    reader = EntityTable.from_frame if columnar else read_entities
+    return reader(
         df=entity_df,
         id_col="id",
         title_col="name",
@@ -1,8 +1,15 @@
 # Copyright (c) 2024 Microsoft Corporation.
 # Licensed under the MIT License
 
-"""Load data from dataframes into collections of data objects."""
+"""Load data from dataframes into collections of data objects.
 
+Columns are converted one at a time with the column converters of loaders.utils, and the objects
+are then built from the converted columns, instead of iterating over dataframe rows.
+"""
+
+from typing import Any
+
+import numpy as np
 import pandas as pd
 
 from graphrag.model import (
@@ -11,19 +18,26 @@ from graphrag.model import (
     Covariate,
     Document,
     Entity,
+    EntityTable,
     Relationship,
     TextUnit,
 )
+from graphrag.model.store import EntityView
 from graphrag.query.input.loaders.utils import (
-    to_list,
-    to_optional_dict,
-    to_optional_float,
-    to_optional_int,
-    to_optional_list,
-    to_optional_str,
-    to_str,
+    to_attributes_column,
+    to_list_column,
+    to_optional_dict_column,
+    to_optional_float_column,
+    to_optional_int_column,
+    to_optional_list_column,
+    to_optional_str_column,
+    to_str_column,
+)
+from graphrag.vector_stores import (
+    BaseVectorStore,
+    NumpyVectorStore,
+    VectorStoreDocument,
 )
-from graphrag.vector_stores import BaseVectorStore, VectorStoreDocument
 
 
 def read_entities(
@@ -43,48 +57,50 @@ def read_entities(
     attributes_cols: list[str] | None = None,
 ) -> list[Entity]:
     """Read entities from a dataframe."""
-    entities = []
-    for idx, row in df.iterrows():
-        entity = Entity(
-            id=to_str(row, id_col),
-            short_id=to_optional_str(row, short_id_col) if short_id_col else str(idx),
-            title=to_str(row, title_col),
-            type=to_optional_str(row, type_col),
-            description=to_optional_str(row, description_col),
-            name_embedding=to_optional_list(row, name_embedding_col, item_type=float),
-            description_embedding=to_optional_list(
-                row, description_embedding_col, item_type=float
-            ),
-            graph_embedding=to_optional_list(row, graph_embedding_col, item_type=float),
-            community_ids=to_optional_list(row, community_col, item_type=str),
-            text_unit_ids=to_optional_list(row, text_unit_ids_col),
-            document_ids=to_optional_list(row, document_ids_col),
-            rank=to_optional_int(row, rank_col),
-            attributes=(
-                {col: row.get(col) for col in attributes_cols}
-                if attributes_cols
-                else None
-            ),
-        )
-        entities.append(entity)
-    return entities
+    return _build(
+        Entity,
+        id=to_str_column(df, id_col),
+        short_id=_short_id_column(df, short_id_col),
+        title=to_str_column(df, title_col),
+        type=to_optional_str_column(df, type_col),
+        description=to_optional_str_column(df, description_col),
+        name_embedding=to_optional_list_column(df, name_embedding_col, item_type=float),
+        description_embedding=to_optional_list_column(
+            df, description_embedding_col, item_type=float
+        ),
+        graph_embedding=to_optional_list_column(
+            df, graph_embedding_col, item_type=float
+        ),
+        community_ids=to_optional_list_column(df, community_col, item_type=str),
+        text_unit_ids=to_optional_list_column(df, text_unit_ids_col),
+        document_ids=to_optional_list_column(df, document_ids_col),
+        rank=to_optional_int_column(df, rank_col),
+        attributes=to_attributes_column(df, attributes_cols),
+    )
 
 
 def store_entity_semantic_embeddings(
-    entities: list[Entity],
+    entities: list[Entity] | EntityTable,
     vectorstore: BaseVectorStore,
 ) -> BaseVectorStore:
     """Store entity semantic embeddings in a vectorstore."""
+    if isinstance(vectorstore, NumpyVectorStore) and isinstance(entities, EntityTable):
+        # hand the embedding matrix of the table to the store instead of one list per entity
+        matrix, present = entities.embeddings("description_embedding")
+        rows = np.flatnonzero(present)
+        vectorstore.load_vectors(
+            ids=[entities[row].id for row in rows],
+            vectors=matrix if len(rows) == len(entities) else matrix[rows],
+            texts=[entities[row].description for row in rows],
+            attributes=[_entity_attributes(entities[row]) for row in rows],
+        )
+        return vectorstore
     documents = [
         VectorStoreDocument(
             id=entity.id,
             text=entity.description,
             vector=entity.description_embedding,
-            attributes=(
-                {"title": entity.title, **entity.attributes}
-                if entity.attributes
-                else {"title": entity.title}
-            ),
+            attributes=_entity_attributes(entity),
         )
         for entity in entities
     ]
@@ -92,6 +108,14 @@ def store_entity_semantic_embeddings(
     return vectorstore
 
 
+def _entity_attributes(entity: Entity | EntityView) -> dict[str, Any]:
+    return (
+        {"title": entity.title, **entity.attributes}
+        if entity.attributes
+        else {"title": entity.title}
+    )
+
+
 def store_entity_behavior_embeddings(
     entities: list[Entity],
     vectorstore: BaseVectorStore,
@@ -128,28 +152,21 @@ def read_relationships(
     attributes_cols: list[str] | None = None,
 ) -> list[Relationship]:
     """Read relationships from a dataframe."""
-    relationships = []
-    for idx, row in df.iterrows():
-        rel = Relationship(
-            id=to_str(row, id_col),
-            short_id=to_optional_str(row, short_id_col) if short_id_col else str(idx),
-            source=to_str(row, source_col),
-            target=to_str(row, target_col),
-            description=to_optional_str(row, description_col),
-            description_embedding=to_optional_list(
-                row, description_embedding_col, item_type=float
-            ),
-            weight=to_optional_float(row, weight_col),
-            text_unit_ids=to_optional_list(row, text_unit_ids_col, item_type=str),
-            document_ids=to_optional_list(row, document_ids_col, item_type=str),
-            attributes=(
-                {col: row.get(col) for col in attributes_cols}
-                if attributes_cols
-                else None
-            ),
-        )
-        relationships.append(rel)
-    return relationships
+    return _build(
+        Relationship,
+        id=to_str_column(df, id_col),
+        short_id=_short_id_column(df, short_id_col),
+        source=to_str_column(df, source_col),
+        target=to_str_column(df, target_col),
+        description=to_optional_str_column(df, description_col),
+        description_embedding=to_optional_list_column(
+            df, description_embedding_col, item_type=float
+        ),
+        weight=to_optional_float_column(df, weight_col),
+        text_unit_ids=to_optional_list_column(df, text_unit_ids_col, item_type=str),
+        document_ids=to_optional_list_column(df, document_ids_col, item_type=str),
+        attributes=to_attributes_column(df, attributes_cols),
+    )
 
 
 def read_covariates(
@@ -164,28 +181,25 @@ def read_covariates(
     attributes_cols: list[str] | None = None,
 ) -> list[Covariate]:
     """Read covariates from a dataframe."""
-    covariates = []
-    for idx, row in df.iterrows():
-        cov = Covariate(
-            id=to_str(row, id_col),
-            short_id=to_optional_str(row, short_id_col) if short_id_col else str(idx),
-            subject_id=to_str(row, subject_col),
-            subject_type=(
-                to_str(row, subject_type_col) if subject_type_col else "entity"
-            ),
-            covariate_type=(
-                to_str(row, covariate_type_col) if covariate_type_col else "claim"
-            ),
-            text_unit_ids=to_optional_list(row, text_unit_ids_col, item_type=str),
-            document_ids=to_optional_list(row, document_ids_col, item_type=str),
-            attributes=(
-                {col: row.get(col) for col in attributes_cols}
-                if attributes_cols
-                else None
-            ),
-        )
-        covariates.append(cov)
-    return covariates
+    return _build(
+        Covariate,
+        id=to_str_column(df, id_col),
+        short_id=_short_id_column(df, short_id_col),
+        subject_id=to_str_column(df, subject_col),
+        subject_type=(
+            to_str_column(df, subject_type_col)
+            if subject_type_col
+            else ["entity"] * len(df)
+        ),
+        covariate_type=(
+            to_str_column(df, covariate_type_col)
+            if covariate_type_col
+            else ["claim"] * len(df)
+        ),
+        text_unit_ids=to_optional_list_column(df, text_unit_ids_col, item_type=str),
+        document_ids=to_optional_list_column(df, document_ids_col, item_type=str),
+        attributes=to_attributes_column(df, attributes_cols),
+    )
 
 
 def read_communities(
@@ -200,26 +214,19 @@ def read_communities(
     attributes_cols: list[str] | None = None,
 ) -> list[Community]:
     """Read communities from a dataframe."""
-    communities = []
-    for idx, row in df.iterrows():
-        comm = Community(
-            id=to_str(row, id_col),
-            short_id=to_optional_str(row, short_id_col) if short_id_col else str(idx),
-            title=to_str(row, title_col),
-            level=to_str(row, level_col),
-            entity_ids=to_optional_list(row, entities_col, item_type=str),
-            relationship_ids=to_optional_list(row, relationships_col, item_type=str),
-            covariate_ids=to_optional_dict(
-                row, covariates_col, key_type=str, value_type=str
-            ),
-            attributes=(
-                {col: row.get(col) for col in attributes_cols}
-                if attributes_cols
-                else None
-            ),
-        )
-        communities.append(comm)
-    return communities
+    return _build(
+        Community,
+        id=to_str_column(df, id_col),
+        short_id=_short_id_column(df, short_id_col),
+        title=to_str_column(df, title_col),
+        level=to_str_column(df, level_col),
+        entity_ids=to_optional_list_column(df, entities_col, item_type=str),
+        relationship_ids=to_optional_list_column(df, relationships_col, item_type=str),
+        covariate_ids=to_optional_dict_column(
+            df, covariates_col, key_type=str, value_type=str
+        ),
+        attributes=to_attributes_column(df, attributes_cols),
+    )
 
 
 def read_community_reports(
@@ -236,30 +243,23 @@ def read_community_reports(
     attributes_cols: list[str] | None = None,
 ) -> list[CommunityReport]:
     """Read community reports from a dataframe."""
-    reports = []
-    for idx, row in df.iterrows():
-        report = CommunityReport(
-            id=to_str(row, id_col),
-            short_id=to_optional_str(row, short_id_col) if short_id_col else str(idx),
-            title=to_str(row, title_col),
-            community_id=to_str(row, community_col),
-            summary=to_str(row, summary_col),
-            full_content=to_str(row, content_col),
-            rank=to_optional_float(row, rank_col),
-            summary_embedding=to_optional_list(
-                row, summary_embedding_col, item_type=float
-            ),
-            full_content_embedding=to_optional_list(
-                row, content_embedding_col, item_type=float
-            ),
-            attributes=(
-                {col: row.get(col) for col in attributes_cols}
-                if attributes_cols
-                else None
-            ),
-        )
-        reports.append(report)
-    return reports
+    return _build(
+        CommunityReport,
+        id=to_str_column(df, id_col),
+        short_id=_short_id_column(df, short_id_col),
+        title=to_str_column(df, title_col),
+        community_id=to_str_column(df, community_col),
+        summary=to_str_column(df, summary_col),
+        full_content=to_str_column(df, content_col),
+        rank=to_optional_float_column(df, rank_col),
+        summary_embedding=to_optional_list_column(
+            df, summary_embedding_col, item_type=float
+        ),
+        full_content_embedding=to_optional_list_column(
+            df, content_embedding_col, item_type=float
+        ),
+        attributes=to_attributes_column(df, attributes_cols),
+    )
 
 
 def read_text_units(
@@ -276,28 +276,21 @@ def read_text_units(
     attributes_cols: list[str] | None = None,
 ) -> list[TextUnit]:
     """Read text units from a dataframe."""
-    text_units = []
-    for idx, row in df.iterrows():
-        chunk = TextUnit(
-            id=to_str(row, id_col),
-            short_id=to_optional_str(row, short_id_col) if short_id_col else str(idx),
-            text=to_str(row, text_col),
-            entity_ids=to_optional_list(row, entities_col, item_type=str),
-            relationship_ids=to_optional_list(row, relationships_col, item_type=str),
-            covariate_ids=to_optional_dict(
-                row, covariates_col, key_type=str, value_type=str
-            ),
-            text_embedding=to_optional_list(row, embedding_col, item_type=float),  # type: ignore
-            n_tokens=to_optional_int(row, tokens_col),
-            document_ids=to_optional_list(row, document_ids_col, item_type=str),
-            attributes=(
-                {col: row.get(col) for col in attributes_cols}
-                if attributes_cols
-                else None
-            ),
-        )
-        text_units.append(chunk)
-    return text_units
+    return _build(
+        TextUnit,
+        id=to_str_column(df, id_col),
+        short_id=_short_id_column(df, short_id_col),
+        text=to_str_column(df, text_col),
+        entity_ids=to_optional_list_column(df, entities_col, item_type=str),
+        relationship_ids=to_optional_list_column(df, relationships_col, item_type=str),
+        covariate_ids=to_optional_dict_column(
+            df, covariates_col, key_type=str, value_type=str
+        ),
+        text_embedding=to_optional_list_column(df, embedding_col, item_type=float),
+        n_tokens=to_optional_int_column(df, tokens_col),
+        document_ids=to_optional_list_column(df, document_ids_col, item_type=str),
+        attributes=to_attributes_column(df, attributes_cols),
+    )
 
 
 def read_documents(
@@ -314,27 +307,35 @@ def read_documents(
     attributes_cols: list[str] | None = None,
 ) -> list[Document]:
     """Read documents from a dataframe."""
-    docs = []
-    for idx, row in df.iterrows():
-        doc = Document(
-            id=to_str(row, id_col),
-            short_id=to_optional_str(row, short_id_col) if short_id_col else str(idx),
-            title=to_str(row, title_col),
-            type=to_str(row, type_col),
-            summary=to_optional_str(row, summary_col),
-            raw_content=to_str(row, raw_content_col),
-            summary_embedding=to_optional_list(
-                row, summary_embedding_col, item_type=float
-            ),
-            raw_content_embedding=to_optional_list(
-                row, content_embedding_col, item_type=float
-            ),
-            text_units=to_list(row, text_units_col, item_type=str),  # type: ignore
-            attributes=(
-                {col: row.get(col) for col in attributes_cols}
-                if attributes_cols
-                else None
-            ),
-        )
-        docs.append(doc)
-    return docs
+    return _build(
+        Document,
+        id=to_str_column(df, id_col),
+        short_id=_short_id_column(df, short_id_col),
+        title=to_str_column(df, title_col),
+        type=to_str_column(df, type_col),
+        summary=to_optional_str_column(df, summary_col),
+        raw_content=to_str_column(df, raw_content_col),
+        summary_embedding=to_optional_list_column(
+            df, summary_embedding_col, item_type=float
+        ),
+        raw_content_embedding=to_optional_list_column(
+            df, content_embedding_col, item_type=float
+        ),
+        text_units=to_list_column(df, text_units_col, item_type=str),
+        attributes=to_attributes_column(df, attributes_cols),
+    )
+
+
+def _short_id_column(df: pd.DataFrame, short_id_col: str | None) -> list[str | None]:
+    if short_id_col:
+        return to_optional_str_column(df, short_id_col)
+    return [str(idx) for idx in df.index]
+
+
+def _build(model_type: type, **columns: list) -> list[Any]:
+    """Build one object per row from the converted columns."""
+    names = list(columns)
+    return [
+        model_type(**dict(zip(names, values, strict=True)))
+        for values in zip(*columns.values(), strict=True)
+    ]
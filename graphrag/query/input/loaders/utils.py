@@ -243,3 +243,177 @@ def to_optional_dict(
 
     msg = f"Column {column_name} not found in data"
     raise ValueError(msg)
+
+
+# Column-at-a-time variants of the converters above. They take the whole dataframe column, so
+# loaders don't build a pandas Series per row, and validate with the same rules and messages.
+
+
+def _column_values(df: pd.DataFrame, column_name: str | None) -> list:
+    if column_name is None:
+        msg = "Column name is None"
+        raise ValueError(msg)
+    if column_name not in df.columns:
+        msg = f"Column {column_name} not found in data"
+        raise ValueError(msg)
+    # tolist converts numpy scalars to python scalars, like reading a row of a mixed-type frame
+    return df[column_name].tolist()
+
+
+def to_str_column(df: pd.DataFrame, column_name: str | None) -> list[str]:
+    """Convert and validate a column to strings."""
+    return [str(value) for value in _column_values(df, column_name)]
+
+
+def to_optional_str_column(
+    df: pd.DataFrame, column_name: str | None
+) -> list[str | None]:
+    """Convert and validate a column to optional strings."""
+    return [
+        None if value is None else str(value)
+        for value in _column_values(df, column_name)
+    ]
+
+
+def to_optional_int_column(
+    df: pd.DataFrame, column_name: str | None
+) -> list[int | None]:
+    """Convert and validate a column to optional ints."""
+    if column_name is None:
+        return [None] * len(df)
+    values = _column_values(df, column_name)
+    if pd.api.types.is_integer_dtype(df[column_name].dtype):
+        return values
+    result = []
+    for value in values:
+        if value is None:
+            result.append(None)
+            continue
+        if isinstance(value, float):
+            value = int(value)
+        if not isinstance(value, int):
+            msg = f"value is not an int: {value} ({type(value)})"
+            # ValueError, as raised by the per-row to_optional_int
+            raise ValueError(msg)  # noqa: TRY004
+        result.append(int(value))
+    return result
+
+
+def to_optional_float_column(
+    df: pd.DataFrame, column_name: str | None
+) -> list[float | None]:
+    """Convert and validate a column to optional floats."""
+    if column_name is None:
+        return [None] * len(df)
+    values = _column_values(df, column_name)
+    if pd.api.types.is_float_dtype(df[column_name].dtype):
+        return values
+    for value in values:
+        if value is not None and not isinstance(value, float):
+            msg = f"value is not a float: {value} ({type(value)})"
+            raise ValueError(msg)
+    return values
+
+
+def to_list_column(
+    df: pd.DataFrame, column_name: str | None, item_type: type | None = None
+) -> list[list]:
+    """Convert and validate a column to lists."""
+    result = []
+    for value in _to_lists(_column_values(df, column_name), item_type):
+        if value is None:
+            msg = f"value is not a list: {value} ({type(value)})"
+            raise ValueError(msg)
+        result.append(value)
+    return result
+
+
+def to_optional_list_column(
+    df: pd.DataFrame, column_name: str | None, item_type: type | None = None
+) -> list[list | None]:
+    """Convert and validate a column to optional lists."""
+    if column_name is None or column_name not in df.columns:
+        return [None] * len(df)
+    return _to_lists(df[column_name].tolist(), item_type)
+
+
+def to_optional_dict_column(
+    df: pd.DataFrame,
+    column_name: str | None,
+    key_type: type | None = None,
+    value_type: type | None = None,
+) -> list[dict | None]:
+    """Convert and validate a column to optional dicts."""
+    if column_name is None:
+        return [None] * len(df)
+    values = _column_values(df, column_name)
+    for value in values:
+        if value is None:
+            continue
+        if not isinstance(value, dict):
+            msg = f"value is not a dict: {value} ({type(value)})"
+            raise TypeError(msg)
+        if key_type is not None:
+            for v in value:
+                if not isinstance(v, key_type):
+                    msg = f"dict key has item that is not {key_type}: {v} ({type(v)})"
+                    raise TypeError(msg)
+        if value_type is not None:
+            for v in value.values():
+                if not isinstance(v, value_type):
+                    msg = (
+                        f"dict value has item that is not {value_type}: {v} ({type(v)})"
+                    )
+                    raise TypeError(msg)
+    return values
+
+
+def to_attributes_column(
+    df: pd.DataFrame, attributes_cols: list[str] | None
+) -> list[dict | None]:
+    """Collect the attribute columns of each row into a dict, with None for missing columns."""
+    if not attributes_cols:
+        return [None] * len(df)
+    columns = [
+        df[col].tolist() if col in df.columns else [None] * len(df)
+        for col in attributes_cols
+    ]
+    return [
+        dict(zip(attributes_cols, values, strict=True))
+        for values in zip(*columns, strict=True)
+    ]
+
+
+def _to_lists(values: list, item_type: type | None) -> list[list | None]:
+    result = []
+    for value in values:
+        if value is None:
+            result.append(None)
+            continue
+        if isinstance(value, np.ndarray):
+            # numeric arrays (e.g. embeddings) are type checked once by their dtype
+            checked = _dtype_matches(value, item_type)
+            value = value.tolist()
+        else:
+            checked = item_type is None
+        if not isinstance(value, list):
+            msg = f"value is not a list: {value} ({type(value)})"
+            # ValueError, as raised by the per-row to_list and to_optional_list
+            raise ValueError(msg)  # noqa: TRY004
+        if not checked:
+            for v in value:
+                if not isinstance(v, item_type):  # type: ignore
+                    msg = f"list item has item that is not {item_type}: {v} ({type(v)})"
+                    raise TypeError(msg)
+        result.append(value)
+    return result
+
+
+def _dtype_matches(value: np.ndarray, item_type: type | None) -> bool:
+    if item_type is None:
+        return True
+    if item_type is float:
+        return value.dtype.kind == "f"
+    if item_type is int:
+        return value.dtype.kind in "iu"
+    return False
@@ -4,7 +4,8 @@
 """Util functions to get entities from a collection."""
 
 import uuid
-from collections.abc import Iterable
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
 from typing import Any, cast
 
 import pandas as pd
@@ -12,24 +13,97 @@ import pandas as pd
 from graphrag.model import Entity
 
 
+class EntityIndex:
+    """Lookup tables from entity id, short_id and title to entities.
+
+    Build it once per entity collection so that resolving vector store hits does not scan the collection.
+    """
+
+    indexed_keys = ("id", "short_id", "title")
+
+    def __init__(self, entities: Iterable[Entity]):
+        self.entities = list(entities)
+        self._by_key: dict[str, dict[Any, Entity]] = {
+            key: {} for key in self.indexed_keys
+        }
+        self._by_name: dict[str, list[Entity]] = defaultdict(list)
+        for entity in self.entities:
+            for key, lookup in self._by_key.items():
+                value = getattr(entity, key)
+                if value is not None:
+                    lookup.setdefault(value, entity)
+            self._by_name[entity.title].append(entity)
+        self.ranked_entities = sorted(
+            self.entities, key=lambda x: x.rank if x.rank else 0, reverse=True
+        )
+
+    def __len__(self) -> int:
+        """Return the number of indexed entities."""
+        return len(self.entities)
+
+    def __iter__(self) -> Iterator[Entity]:
+        """Iterate over the entities in their original order."""
+        return iter(self.entities)
+
+    def get_by_key(self, key: str, value: str | int) -> Entity | None:
+        """Get entity by key, matching UUIDs with or without dashes."""
+        if key not in self._by_key:
+            return _scan_entity_by_key(self.entities, key, value)
+        lookup = self._by_key[key]
+        entity = lookup.get(value)
+        # ids may be stored as UUID hex without dashes
+        if (
+            entity is None
+            and isinstance(value, str)
+            and "-" in value
+            and is_valid_uuid(value)
+        ):
+            entity = lookup.get(value.replace("-", ""))
+        return entity
+
+    def get_by_name(self, entity_name: str) -> list[Entity]:
+        """Get entities by name."""
+        return list(self._by_name.get(entity_name, []))
+
+
+def get_entity_index(entities: Iterable[Entity] | EntityIndex) -> EntityIndex:
+    """Return the given entity index, or build one for a collection of entities."""
+    if isinstance(entities, EntityIndex):
+        return entities
+    return EntityIndex(entities)
+
+
 def get_entity_by_key(
-    entities: Iterable[Entity], key: str, value: str | int
+    entities: Iterable[Entity] | EntityIndex, key: str, value: str | int
 ) -> Entity | None:
     """Get entity by key."""
-    for entity in entities:
-        if isinstance(value, str) and is_valid_uuid(value):
-            if getattr(entity, key) == value or getattr(entity, key) == value.replace(
-                "-", ""
-            ):
+    if isinstance(entities, EntityIndex):
+        return entities.get_by_key(key, value)
+    return _scan_entity_by_key(entities, key, value)
+
+
+def _scan_entity_by_key(
+    entities: Iterable[Entity], key: str, value: str | int
+) -> Entity | None:
+    if isinstance(value, str) and is_valid_uuid(value):
+        # parse the value once instead of once per entity
+        stripped_value = value.replace("-", "")
+        for entity in entities:
+            if getattr(entity, key) in (value, stripped_value):
                 return entity
-        else:
+    else:
+        for entity in entities:
             if getattr(entity, key) == value:
                 return entity
     return None
 
 
-def get_entity_by_name(entities: Iterable[Entity], entity_name: str) -> list[Entity]:
+def get_entity_by_name(
+    entities: Iterable[Entity] | EntityIndex, entity_name: str
+) -> list[Entity]:
     """Get entities by name."""
+    if isinstance(entities, EntityIndex):
+        return entities.get_by_name(entity_name)
     return [entity for entity in entities if entity.title == entity_name]
 
 
@@ -3,6 +3,8 @@
 
 """Util functions to retrieve relationships from a collection."""
 
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
 from typing import Any, cast
 
 import pandas as pd
@@ -10,19 +12,96 @@ import pandas as pd
 from graphrag.model import Entity, Relationship
 
 
+class RelationshipIndex:
+    """Adjacency index from entity titles to the relationships they take part in.
+
+    Build it once per relationship collection; the retrieval functions then only visit the
+    relationships of the selected entities instead of scanning the whole collection.
+    Relationships are always returned in the order of the collection.
+    """
+
+    def __init__(self, relationships: Iterable[Relationship]):
+        self.relationships = list(relationships)
+        self._by_source: dict[str, list[int]] = defaultdict(list)
+        self._by_target: dict[str, list[int]] = defaultdict(list)
+        for position, relationship in enumerate(self.relationships):
+            self._by_source[relationship.source].append(position)
+            self._by_target[relationship.target].append(position)
+
+    def __len__(self) -> int:
+        """Return the number of indexed relationships."""
+        return len(self.relationships)
+
+    def __iter__(self) -> Iterator[Relationship]:
+        """Iterate over the relationships in their original order."""
+        return iter(self.relationships)
+
+    def outgoing(self, entity_name: str) -> list[Relationship]:
+        """Get the relationships whose source is the given entity."""
+        return [self.relationships[i] for i in self._by_source.get(entity_name, [])]
+
+    def incoming(self, entity_name: str) -> list[Relationship]:
+        """Get the relationships whose target is the given entity."""
+        return [self.relationships[i] for i in self._by_target.get(entity_name, [])]
+
+    def in_network(self, entity_names: set[str]) -> list[Relationship]:
+        """Get the relationships with both source and target in entity_names."""
+        return self._select(
+            i
+            for name in entity_names
+            for i in self._by_source.get(name, [])
+            if self.relationships[i].target in entity_names
+        )
+
+    def out_network(self, entity_names: set[str]) -> list[Relationship]:
+        """Get the relationships from entity_names to other entities, followed by the relationships from other entities to entity_names."""
+        return self._select(
+            i
+            for name in entity_names
+            for i in self._by_source.get(name, [])
+            if self.relationships[i].target not in entity_names
+        ) + self._select(
+            i
+            for name in entity_names
+            for i in self._by_target.get(name, [])
+            if self.relationships[i].source not in entity_names
+        )
+
+    def candidates(self, entity_names: set[str]) -> list[Relationship]:
+        """Get the relationships with source or target in entity_names."""
+        return self._select(
+            i
+            for name in entity_names
+            for positions in (
+                self._by_source.get(name, []),
+                self._by_target.get(name, []),
+            )
+            for i in positions
+        )
+
+    def _select(self, positions: Iterable[int]) -> list[Relationship]:
+        return [self.relationships[i] for i in sorted(set(positions))]
+
+
+def get_relationship_index(
+    relationships: list[Relationship] | RelationshipIndex,
+) -> RelationshipIndex:
+    """Return the given relationship index, or build one for a list of relationships."""
+    if isinstance(relationships, RelationshipIndex):
+        return relationships
+    return RelationshipIndex(relationships)
+
+
 def get_in_network_relationships(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     ranking_attribute: str = "rank",
 ) -> list[Relationship]:
     """Get all directed relationships between selected entities, sorted by ranking_attribute."""
-    selected_entity_names = [entity.title for entity in selected_entities]
-    selected_relationships = [
-        relationship
-        for relationship in relationships
-        if relationship.source in selected_entity_names
-        and relationship.target in selected_entity_names
-    ]
+    selected_entity_names = {entity.title for entity in selected_entities}
+    selected_relationships = get_relationship_index(relationships).in_network(
+        selected_entity_names
+    )
     if len(selected_relationships) <= 1:
         return selected_relationships
 
@@ -34,24 +113,14 @@ def get_in_network_relationships(
 
 def get_out_network_relationships(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     ranking_attribute: str = "rank",
 ) -> list[Relationship]:
     """Get relationships from selected entities to other entities that are not within the selected entities, sorted by ranking_attribute."""
-    selected_entity_names = [entity.title for entity in selected_entities]
-    source_relationships = [
-        relationship
-        for relationship in relationships
-        if relationship.source in selected_entity_names
-        and relationship.target not in selected_entity_names
-    ]
-    target_relationships = [
-        relationship
-        for relationship in relationships
-        if relationship.target in selected_entity_names
-        and relationship.source not in selected_entity_names
-    ]
-    selected_relationships = source_relationships + target_relationships
+    selected_entity_names = {entity.title for entity in selected_entities}
+    selected_relationships = get_relationship_index(relationships).out_network(
+        selected_entity_names
+    )
     return sort_relationships_by_ranking_attribute(
         selected_relationships, selected_entities, ranking_attribute
     )
@@ -59,25 +128,20 @@ def get_out_network_relationships(
 
 def get_candidate_relationships(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
 ) -> list[Relationship]:
     """Get all relationships that are associated with the selected entities."""
-    selected_entity_names = [entity.title for entity in selected_entities]
-    return [
-        relationship
-        for relationship in relationships
-        if relationship.source in selected_entity_names
-        or relationship.target in selected_entity_names
-    ]
+    selected_entity_names = {entity.title for entity in selected_entities}
+    return get_relationship_index(relationships).candidates(selected_entity_names)
 
 
 def get_entities_from_relationships(
     relationships: list[Relationship], entities: list[Entity]
 ) -> list[Entity]:
     """Get all entities that are associated with the selected relationships."""
-    selected_entity_names = [relationship.source for relationship in relationships] + [
+    selected_entity_names = {relationship.source for relationship in relationships} | {
         relationship.target for relationship in relationships
-    ]
+    }
     return [entity for entity in entities if entity.title in selected_entity_names]
 
 
@@ -0,0 +1,205 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Text embedding wrapper with an LRU cache."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from graphrag.query.llm.base import BaseTextEmbedding
+
+log = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class CachedTextEmbedding(BaseTextEmbedding):
+    """Cache the embeddings of another text embedder.
+
+    Entries are keyed by model and whitespace-normalized text and kept in a bounded in-memory LRU.
+    If cache_dir is given, entries are also written there as JSON files and read back on
+    in-memory misses, so the cache survives restarts. The directory keeps at most max_disk_size
+    entries, the least recently used are deleted, and aembed reads and writes it on the loop's
+    default executor.
+    Concurrent aembed calls for the same text share a single embedding request.
+    """
+
+    def __init__(
+        self,
+        text_embedder: BaseTextEmbedding,
+        model: str | None = None,
+        max_size: int = 10_000,
+        cache_dir: str | Path | None = None,
+        max_disk_size: int = 100_000,
+    ):
+        if max_size < 1:
+            msg = f"max_size must be positive, got {max_size}"
+            raise ValueError(msg)
+        if max_disk_size < 1:
+            msg = f"max_disk_size must be positive, got {max_disk_size}"
+            raise ValueError(msg)
+        self.text_embedder = text_embedder
+        self.model = model or getattr(text_embedder, "model", "")
+        self.max_size = max_size
+        self.max_disk_size = max_disk_size
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+        # keys of the entries in cache_dir, least recently used first
+        self._disk_keys: OrderedDict[str, None] = OrderedDict()
+        self._pending: dict[str, asyncio.Future] = {}
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            paths = sorted(
+                self.cache_dir.glob("*.json"), key=lambda path: path.stat().st_mtime
+            )
+            self._disk_keys.update((path.stem, None) for path in paths)
+            self._delete(self._evict_from_disk())
+
+    def embed(self, text: str, **kwargs: Any) -> list[float]:
+        """Embed a text string, using the cached embedding if there is one."""
+        key = self._key(text)
+        embedding = self._lookup(key)
+        if embedding is not None:
+            return embedding
+        embedding = self.text_embedder.embed(text, **kwargs)
+        self._store(key, embedding)
+        return embedding
+
+    async def aembed(self, text: str, **kwargs: Any) -> list[float]:
+        """Embed a text string asynchronously, using the cached embedding if there is one."""
+        key = self._key(text)
+        cached = await self._alookup(key)
+        if cached is not None:
+            return cached
+        pending = self._pending.get(key)
+        if pending is not None:
+            # another call is embedding the same text; its result is None if it failed
+            cached = await asyncio.shield(pending)
+            if cached is not None:
+                return cached
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, future)
+        result = None
+        try:
+            embedding = await self.text_embedder.aembed(text, **kwargs)
+            if self._cacheable(embedding):
+                self._remember(key, embedding)
+            result = embedding
+        finally:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+            future.set_result(result)
+        if self.cache_dir is not None and self._cacheable(embedding):
+            await loop.run_in_executor(
+                None, partial(self._write, key, embedding, self._add_to_disk(key))
+            )
+        return embedding
+
+    def stats(self) -> dict[str, int]:
+        """Return the cache counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
+
+    def clear(self) -> None:
+        """Drop the in-memory entries and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, text: str) -> str:
+        normalized = _WHITESPACE.sub(" ", text).strip()
+        return hashlib.sha256(f"{self.model}\n{normalized}".encode()).hexdigest()
+
+    def _lookup(self, key: str) -> list[float] | None:
+        embedding = self._entries.get(key)
+        if embedding is None and key in self._disk_keys:
+            embedding = self._read(key)
+        return self._count(key, embedding)
+
+    async def _alookup(self, key: str) -> list[float] | None:
+        embedding = self._entries.get(key)
+        if embedding is None and key in self._disk_keys:
+            loop = asyncio.get_running_loop()
+            embedding = await loop.run_in_executor(None, self._read, key)
+        return self._count(key, embedding)
+
+    def _count(self, key: str, embedding: list[float] | None) -> list[float] | None:
+        if embedding is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._remember(key, embedding)
+        if key in self._disk_keys:
+            self._disk_keys.move_to_end(key)
+        return embedding
+
+    def _store(self, key: str, embedding: list[float]) -> None:
+        if not self._cacheable(embedding):
+            return
+        self._remember(key, embedding)
+        if self.cache_dir is not None:
+            self._write(key, embedding, self._add_to_disk(key))
+
+    @staticmethod
+    def _cacheable(embedding: list[float] | None) -> bool:
+        # failed requests come back as empty embeddings; don't cache them
+        return embedding is not None and len(embedding) > 0
+
+    def _remember(self, key: str, embedding: list[float]) -> None:
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _add_to_disk(self, key: str) -> list[str]:
+        """Record a new disk entry and return the keys evicted to make room for it."""
+        self._disk_keys[key] = None
+        self._disk_keys.move_to_end(key)
+        return self._evict_from_disk()
+
+    def _evict_from_disk(self) -> list[str]:
+        evicted = []
+        while len(self._disk_keys) > self.max_disk_size:
+            evicted.append(self._disk_keys.popitem(last=False)[0])
+        return evicted
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"  # type: ignore
+
+    def _read(self, key: str) -> list[float] | None:
+        path = self._path(key)
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            log.warning("Ignoring unreadable embedding cache entry %s", path)
+            return None
+
+    def _write(self, key: str, embedding: list[float], evicted: list[str]) -> None:
+        path = self._path(key)
+        try:
+            path.write_text(json.dumps(embedding), encoding="utf-8")
+        except OSError:
+            log.warning("Failed to write embedding cache entry %s", path)
+        self._delete(evicted)
+
+    def _delete(self, keys: list[str]) -> None:
+        for key in keys:
+            try:
+                self._path(key).unlink(missing_ok=True)
+            except OSError:
+                log.warning("Failed to delete embedding cache entry %s", key)
@@ -8,6 +8,10 @@ from collections.abc import Callable
 
 from openai import AsyncAzureOpenAI, AsyncOpenAI, AzureOpenAI, OpenAI
 
+from graphrag.llm.openai.http_clients import (
+    get_async_http_client,
+    get_sync_http_client,
+)
 from graphrag.query.llm.base import BaseTextEmbedding
 from graphrag.query.llm.oai.typing import OpenaiApiType
 from graphrag.query.progress import ConsoleStatusReporter, StatusReporter
@@ -101,6 +105,7 @@ class OpenAILLMImpl(BaseOpenAILLM):
         max_retries: int = 10,
         request_timeout: float = 180.0,
         reporter: StatusReporter | None = None,
+        max_connections: int | None = None,
     ):
         self.api_key = api_key
         self.azure_ad_token_provider = azure_ad_token_provider
@@ -112,6 +117,7 @@ class OpenAILLMImpl(BaseOpenAILLM):
         self.max_retries = max_retries
         self.request_timeout = request_timeout
         self.reporter = reporter or ConsoleStatusReporter()
+        self.max_connections = max_connections
 
         try:
             # Create OpenAI sync and async clients
@@ -141,6 +147,7 @@ class OpenAILLMImpl(BaseOpenAILLM):
                 # Retry Configuration
                 timeout=self.request_timeout,
                 max_retries=self.max_retries,
+                http_client=get_sync_http_client(self.api_base, self.max_connections),
             )
 
             async_client = AsyncAzureOpenAI(
@@ -154,6 +161,7 @@ class OpenAILLMImpl(BaseOpenAILLM):
                 # Retry Configuration
                 timeout=self.request_timeout,
                 max_retries=self.max_retries,
+                http_client=get_async_http_client(self.api_base, self.max_connections),
             )
             self.set_clients(sync_client=sync_client, async_client=async_client)
 
@@ -165,6 +173,7 @@ class OpenAILLMImpl(BaseOpenAILLM):
                 # Retry Configuration
                 timeout=self.request_timeout,
                 max_retries=self.max_retries,
+                http_client=get_sync_http_client(self.api_base, self.max_connections),
             )
 
             async_client = AsyncOpenAI(
@@ -174,6 +183,7 @@ class OpenAILLMImpl(BaseOpenAILLM):
                 # Retry Configuration
                 timeout=self.request_timeout,
                 max_retries=self.max_retries,
+                http_client=get_async_http_client(self.api_base, self.max_connections),
             )
             self.set_clients(sync_client=sync_client, async_client=async_client)
 
@@ -25,6 +25,9 @@ from graphrag.query.progress import StatusReporter
 
 _MODEL_REQUIRED_MSG = "model is required"
 
+# ask for the token usage, which OpenAI then sends in a last chunk without choices
+_STREAM_OPTIONS = {"include_usage": True}
+
 
 class ChatOpenAI(BaseLLM, OpenAILLMImpl):
     """Wrapper for OpenAI ChatCompletion models."""
@@ -43,6 +46,7 @@ class ChatOpenAI(BaseLLM, OpenAILLMImpl):
         request_timeout: float = 180.0,
         retry_error_types: tuple[type[BaseException]] = OPENAI_RETRY_ERROR_TYPES,  # type: ignore
         reporter: StatusReporter | None = None,
+        max_connections: int | None = None,
     ):
         OpenAILLMImpl.__init__(
             self=self,
@@ -56,6 +60,7 @@ class ChatOpenAI(BaseLLM, OpenAILLMImpl):
             max_retries=max_retries,
             request_timeout=request_timeout,
             reporter=reporter,
+            max_connections=max_connections,
         )
         self.model = model
         self.retry_error_types = retry_error_types
@@ -238,13 +243,18 @@ class ChatOpenAI(BaseLLM, OpenAILLMImpl):
         model = self.model
         if not model:
             raise ValueError(_MODEL_REQUIRED_MSG)
+        kwargs.setdefault("stream_options", _STREAM_OPTIONS)
         response = self.sync_client.chat.completions.create(  # type: ignore
             model=model,
             messages=messages,  # type: ignore
             stream=True,
             **kwargs,
         )
+        usage = None
         for chunk in response:
+            if chunk and chunk.usage:
+                # the usage comes with the last chunk, which may have no choices
+                usage = chunk.usage
             if not chunk or not chunk.choices:
                 continue
 
@@ -260,6 +270,10 @@ class ChatOpenAI(BaseLLM, OpenAILLMImpl):
                 for callback in callbacks:
                     callback.on_llm_new_token(delta)
 
+        if callbacks:
+            for callback in callbacks:
+                callback.on_llm_stop(usage=usage)
+
     async def _agenerate(
         self,
         messages: str | list[Any],
@@ -316,13 +330,18 @@ class ChatOpenAI(BaseLLM, OpenAILLMImpl):
         model = self.model
         if not model:
             raise ValueError(_MODEL_REQUIRED_MSG)
+        kwargs.setdefault("stream_options", _STREAM_OPTIONS)
         response = await self.async_client.chat.completions.create(  # type: ignore
             model=model,
             messages=messages,  # type: ignore
             stream=True,
             **kwargs,
         )
+        usage = None
         async for chunk in response:
+            if chunk and chunk.usage:
+                # the usage comes with the last chunk, which may have no choices
+                usage = chunk.usage
             if not chunk or not chunk.choices:
                 continue
 
@@ -337,3 +356,7 @@ class ChatOpenAI(BaseLLM, OpenAILLMImpl):
             if callbacks:
                 for callback in callbacks:
                     callback.on_llm_new_token(delta)
+
+        if callbacks:
+            for callback in callbacks:
+                callback.on_llm_stop(usage=usage)
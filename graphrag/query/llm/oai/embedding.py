@@ -47,6 +47,7 @@ class OpenAIEmbedding(BaseTextEmbedding, OpenAILLMImpl):
         request_timeout: float = 180.0,
         retry_error_types: tuple[type[BaseException]] = OPENAI_RETRY_ERROR_TYPES,  # type: ignore
         reporter: StatusReporter | None = None,
+        max_connections: int | None = None,
     ):
         OpenAILLMImpl.__init__(
             self=self,
@@ -60,6 +61,7 @@ class OpenAIEmbedding(BaseTextEmbedding, OpenAILLMImpl):
             max_retries=max_retries,
             request_timeout=request_timeout,
             reporter=reporter,
+            max_connections=max_connections,
         )
 
         self.model = model
@@ -3,6 +3,8 @@
 
 """Text Utilities for LLM."""
 
+import threading
+from collections import OrderedDict
 from collections.abc import Iterator
 from itertools import islice
 
@@ -16,6 +18,95 @@ def num_tokens(text: str, token_encoder: tiktoken.Encoding | None = None) -> int
     return len(token_encoder.encode(text))  # type: ignore
 
 
+class TokenCounter:
+    """
+    Count tokens with a cache of the counts of previously seen texts.
+
+    Context builders render the same entity, relationship, covariate, community report and text unit rows
+    for many queries; with a shared counter each distinct row is only encoded once, and the size of a context
+    table is the sum of the cached counts of its rows.
+
+    The cache is bounded both by its number of entries and by the total length of the cached texts, evicting
+    the oldest entries first. A counter can be used from several threads at once.
+    """
+
+    def __init__(
+        self,
+        token_encoder: tiktoken.Encoding | None = None,
+        max_cache_size: int = 50_000,
+        max_cache_chars: int = 20_000_000,
+    ):
+        self.token_encoder = token_encoder
+        self.max_cache_size = max_cache_size
+        self.max_cache_chars = max_cache_chars
+        self._cache: dict[str, int] = {}
+        self._cache_chars = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache_size(self) -> int:
+        """Return the number of cached counts."""
+        return len(self._cache)
+
+    @property
+    def cached_chars(self) -> int:
+        """Return the total length of the cached texts."""
+        return self._cache_chars
+
+    def num_tokens(self, text: str) -> int:
+        """Return the number of tokens in the given text."""
+        with self._lock:
+            count = self._cache.get(text)
+        if count is not None:
+            return count
+        if self.token_encoder is None:
+            self.token_encoder = tiktoken.get_encoding("cl100k_base")
+        count = len(self.token_encoder.encode(text))  # type: ignore
+        if len(text) > self.max_cache_chars:
+            return count
+        with self._lock:
+            if text not in self._cache:
+                while self._cache and (
+                    len(self._cache) >= self.max_cache_size
+                    or self._cache_chars + len(text) > self.max_cache_chars
+                ):
+                    # evict the oldest entry
+                    oldest = next(iter(self._cache))
+                    del self._cache[oldest]
+                    self._cache_chars -= len(oldest)
+                self._cache[text] = count
+                self._cache_chars += len(text)
+        return count
+
+    def num_tokens_by_line(self, text: str) -> int:
+        """Return the number of tokens in a multi-line context text as the sum of the cached counts of its lines."""
+        return sum(self.num_tokens(line) for line in text.splitlines(keepends=True))
+
+
+MAX_TOKEN_COUNTERS = 16
+
+_token_counters: OrderedDict[int, TokenCounter] = OrderedDict()
+_token_counters_lock = threading.Lock()
+
+
+def get_token_counter(token_encoder: tiktoken.Encoding | None = None) -> TokenCounter:
+    """Return the process-wide token counter of the given encoder.
+
+    Counters are kept for the MAX_TOKEN_COUNTERS most recently used encoders.
+    """
+    key = id(token_encoder)
+    with _token_counters_lock:
+        counter = _token_counters.get(key)
+        if counter is not None:
+            _token_counters.move_to_end(key)
+            return counter
+        # the counter keeps a reference to its encoder, so the id is not reused while the entry exists
+        counter = _token_counters[key] = TokenCounter(token_encoder)
+        while len(_token_counters) > MAX_TOKEN_COUNTERS:
+            _token_counters.popitem(last=False)
+    return counter
+
+
 def batched(iterable: Iterator, n: int):
     """
     Batch data into tuples of length n. The last batch may be shorter.
@@ -3,11 +3,13 @@
 
 """Base classes for generating questions based on previously asked questions and most recent context data."""
 
+import copy
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any
 
 import tiktoken
+from typing_extensions import Self
 
 from graphrag.query.context_builder.builders import (
     GlobalContextBuilder,
@@ -44,6 +46,19 @@ class BaseQuestionGen(ABC):
         self.llm_params = llm_params or {}
         self.context_builder_params = context_builder_params or {}
 
+    def scoped(
+        self,
+        context_builder: GlobalContextBuilder | LocalContextBuilder | None = None,
+        llm_params: dict[str, Any] | None = None,
+    ) -> Self:
+        """Return a request-scoped view of this question generator that owns its parameter dicts."""
+        view = copy.copy(self)
+        if context_builder is not None:
+            view.context_builder = context_builder
+        view.llm_params = {**self.llm_params, **(llm_params or {})}
+        view.context_builder_params = {**self.context_builder_params}
+        return view
+
     @abstractmethod
     def generate(
         self,
@@ -5,7 +5,7 @@
 
 import logging
 import time
-from typing import Any
+from typing import Any, cast
 
 import tiktoken
 
@@ -71,7 +71,8 @@ class LocalQuestionGen(BaseQuestionGen):
 
         if context_data is None:
             # generate context data based on the question history
-            context_data, context_records = self.context_builder.build_context(
+            context_builder = cast(LocalContextBuilder, self.context_builder)
+            context_data, context_records = await context_builder.abuild_context(
                 query=question_text,
                 conversation_history=conversation_history,
                 **kwargs,
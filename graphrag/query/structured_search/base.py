@@ -3,6 +3,7 @@
 
 """Base classes for search algos."""
 
+import copy
 from abc import ABC, abstractmethod
 from collections.abc import AsyncGenerator
 from dataclasses import dataclass
@@ -10,6 +11,7 @@ from typing import Any
 
 import pandas as pd
 import tiktoken
+from typing_extensions import Self
 
 from graphrag.query.context_builder.builders import (
     GlobalContextBuilder,
@@ -51,6 +53,32 @@ class BaseSearch(ABC):
         self.llm_params = llm_params or {}
         self.context_builder_params = context_builder_params or {}
 
+    def scoped(
+        self,
+        context_builder: GlobalContextBuilder | LocalContextBuilder | None = None,
+        llm_params: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> Self:
+        """
+        Return a request-scoped view of this search engine.
+
+        The view shares the LLM, token encoder and concurrency limits with this engine, but owns its
+        parameter dicts and attributes, so per-request overrides never leak into concurrent requests.
+        Extra keyword arguments override attributes of the same name, e.g. `callbacks` or `response_type`.
+        """
+        view = copy.copy(self)
+        if context_builder is not None:
+            view.context_builder = context_builder
+        view.llm_params = {**self.llm_params, **(llm_params or {})}
+        view.context_builder_params = {**self.context_builder_params}
+        for name, value in kwargs.items():
+            if not hasattr(self, name):
+                msg = f"{self.__class__.__name__} has no attribute {name}"
+                raise AttributeError(msg)
+            if value is not None:
+                setattr(view, name, value)
+        return view
+
     @abstractmethod
     def search(
         self,
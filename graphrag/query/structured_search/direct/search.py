@@ -40,7 +40,7 @@ class Direct(BaseSearch):
     async def asearch(
         self,
         query: str,
-        conversation_history: ConversationHistory,
+        conversation_history: ConversationHistory | None = None,
         **kwargs
     ) -> SearchResult:
         """Build local search context that fits a single context window and generate answer for the user query."""
@@ -49,7 +49,7 @@ class Direct(BaseSearch):
                 {
                     "role": turn.role,
                     "content": turn.content
-                } for turn in conversation_history.turns
+                } for turn in (conversation_history.turns if conversation_history else [])
             ]
             search_messages.append({"role": "user", "content": query})
 
@@ -82,7 +82,7 @@ class Direct(BaseSearch):
     async def astream_search(
         self,
         query: str,
-        conversation_history: ConversationHistory,
+        conversation_history: ConversationHistory | None = None,
         **kwargs
     ) -> AsyncGenerator:
         """Build local search context that fits a single context window and generate answer for the user query."""
@@ -90,7 +90,7 @@ class Direct(BaseSearch):
             {
                 "role": turn.role,
                 "content": turn.content
-            } for turn in conversation_history.turns
+            } for turn in (conversation_history.turns if conversation_history else [])
         ]
         search_messages.append({"role": "user", "content": query})
 
@@ -104,7 +104,7 @@ class Direct(BaseSearch):
     def search(
         self,
         query: str,
-        conversation_history: ConversationHistory,
+        conversation_history: ConversationHistory | None = None,
         **kwargs
     ) -> SearchResult:
         """Build local search context that fits a single context window and generate answer for the user question."""
@@ -113,7 +113,7 @@ class Direct(BaseSearch):
                 {
                     "role": turn.role,
                     "content": turn.content
-                } for turn in conversation_history.turns
+                } for turn in (conversation_history.turns if conversation_history else [])
             ]
             search_messages.append({"role": "user", "content": query})
 
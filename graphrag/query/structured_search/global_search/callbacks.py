@@ -19,6 +19,9 @@ class GlobalSearchLLMCallback(BaseLLMCallback):
         """Handle the start of map response."""
         self.map_response_contexts = map_response_contexts
 
+    def on_map_response_progress(self, completed: int, total: int):
+        """Handle the completion of a map batch."""
+
     def on_map_response_end(self, map_response_outputs: list[SearchResult]):
         """Handle the end of map response."""
         self.map_response_outputs = map_response_outputs
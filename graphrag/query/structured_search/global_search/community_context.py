@@ -10,7 +10,9 @@ import tiktoken
 
 from graphrag.model import CommunityReport, Entity
 from graphrag.query.context_builder.community_context import (
-    build_community_context,
+    RenderedCommunityReports,
+    pack_community_context,
+    render_community_reports,
 )
 from graphrag.query.context_builder.conversation_history import (
     ConversationHistory,
@@ -32,6 +34,53 @@ class GlobalCommunityContext(GlobalContextBuilder):
         self.entities = entities
         self.token_encoder = token_encoder
         self.random_state = random_state
+        self._rendered_reports: dict[tuple, RenderedCommunityReports] = {}
+
+    def prepare(
+        self,
+        use_community_summary: bool = True,
+        column_delimiter: str = "|",
+        include_community_rank: bool = False,
+        min_community_rank: int = 0,
+        community_rank_name: str = "rank",
+        include_community_weight: bool = True,
+        community_weight_name: str = "occurrence",
+        normalize_community_weight: bool = True,
+        **kwargs: Any,
+    ) -> RenderedCommunityReports:
+        """
+        Render the community reports for the given options, once.
+
+        Community weights, report rows and their token counts do not depend on the query,
+        so they are computed on the first call and reused by every build_context call with the same options.
+        """
+        key = (
+            use_community_summary,
+            column_delimiter,
+            include_community_rank,
+            min_community_rank,
+            community_rank_name,
+            include_community_weight,
+            community_weight_name,
+            normalize_community_weight,
+        )
+        rendered_reports = self._rendered_reports.get(key)
+        if rendered_reports is None:
+            rendered_reports = render_community_reports(
+                community_reports=self.community_reports,
+                entities=self.entities,
+                token_encoder=self.token_encoder,
+                use_community_summary=use_community_summary,
+                column_delimiter=column_delimiter,
+                include_community_rank=include_community_rank,
+                min_community_rank=min_community_rank,
+                community_rank_name=community_rank_name,
+                include_community_weight=include_community_weight,
+                community_weight_name=community_weight_name,
+                normalize_community_weight=normalize_community_weight,
+            )
+            self._rendered_reports[key] = rendered_reports
+        return rendered_reports
 
     def build_context(
         self,
@@ -69,19 +118,21 @@ class GlobalCommunityContext(GlobalContextBuilder):
             if conversation_history_context != "":
                 final_context_data = conversation_history_context_data
 
-        community_context, community_context_data = build_community_context(
-            community_reports=self.community_reports,
-            entities=self.entities,
-            token_encoder=self.token_encoder,
+        rendered_reports = self.prepare(
             use_community_summary=use_community_summary,
             column_delimiter=column_delimiter,
-            shuffle_data=shuffle_data,
             include_community_rank=include_community_rank,
             min_community_rank=min_community_rank,
             community_rank_name=community_rank_name,
             include_community_weight=include_community_weight,
             community_weight_name=community_weight_name,
             normalize_community_weight=normalize_community_weight,
+        )
+        community_context, community_context_data = pack_community_context(
+            rendered_reports=rendered_reports,
+            token_encoder=self.token_encoder,
+            column_delimiter=column_delimiter,
+            shuffle_data=shuffle_data,
             max_tokens=max_tokens,
             single_batch=False,
             context_name=context_name,
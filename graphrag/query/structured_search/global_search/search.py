@@ -6,6 +6,7 @@
 import asyncio
 import json
 import logging
+import math
 import time
 from collections.abc import AsyncGenerator
 from dataclasses import dataclass
@@ -13,9 +14,15 @@ from typing import Any
 
 import pandas as pd
 import tiktoken
+from typing_extensions import Self
 
+from graphrag.index.cache import PipelineCache
+from graphrag.llm.base._create_cache_key import create_hash_key
 from graphrag.llm.openai.utils import try_parse_json_object
-from graphrag.query.context_builder.builders import GlobalContextBuilder
+from graphrag.query.context_builder.builders import (
+    GlobalContextBuilder,
+    LocalContextBuilder,
+)
 from graphrag.query.context_builder.conversation_history import (
     ConversationHistory,
 )
@@ -56,6 +63,11 @@ class GlobalSearchResult(SearchResult):
     reduce_context_text: str | list[str] | dict[str, str]
 
 
+@dataclass
+class FailedMapResult(SearchResult):
+    """The result of a map batch whose LLM call failed, answered with a single empty key point."""
+
+
 class GlobalSearch(BaseSearch):
     """Search orchestration for global search mode."""
 
@@ -77,6 +89,10 @@ class GlobalSearch(BaseSearch):
         reduce_llm_params: dict[str, Any] = DEFAULT_REDUCE_LLM_PARAMS,
         context_builder_params: dict[str, Any] | None = None,
         concurrent_coroutines: int = 32,
+        map_deadline: float | None = None,
+        map_quorum: float = 1.0,
+        map_min_score: int = 0,
+        map_cache: PipelineCache | None = None,
     ):
         super().__init__(
             llm=llm,
@@ -93,8 +109,8 @@ class GlobalSearch(BaseSearch):
         self.callbacks = callbacks
         self.max_data_tokens = max_data_tokens
 
-        self.map_llm_params = map_llm_params
-        self.reduce_llm_params = reduce_llm_params
+        self.map_llm_params = {**map_llm_params}
+        self.reduce_llm_params = {**reduce_llm_params}
         if json_mode:
             self.map_llm_params["response_format"] = {"type": "json_object"}
         else:
@@ -102,6 +118,26 @@ class GlobalSearch(BaseSearch):
             self.map_llm_params.pop("response_format", None)
 
         self.semaphore = asyncio.Semaphore(concurrent_coroutines)
+        self.map_deadline = map_deadline
+        self.map_quorum = map_quorum
+        self.map_min_score = map_min_score
+        self.map_cache = map_cache
+
+    def scoped(
+        self,
+        context_builder: GlobalContextBuilder | LocalContextBuilder | None = None,
+        llm_params: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> Self:
+        """Return a request-scoped view of this search engine.
+
+        llm_params only apply to the reduce call: the map calls keep the configured map parameters,
+        so their responses (and the map cache entries) do not depend on the request.
+        """
+        view = super().scoped(context_builder=context_builder, **kwargs)
+        view.map_llm_params = {**self.map_llm_params}
+        view.reduce_llm_params = {**self.reduce_llm_params, **(llm_params or {})}
+        return view
 
     async def astream_search(
         self,
@@ -115,12 +151,9 @@ class GlobalSearch(BaseSearch):
         if self.callbacks:
             for callback in self.callbacks:
                 callback.on_map_response_start(context_chunks)  # type: ignore
-        map_responses = await asyncio.gather(*[
-            self._map_response_single_batch(
-                context_data=data, query=query, **self.map_llm_params
-            )
-            for data in context_chunks
-        ])
+        map_responses = await self._map_responses(
+            context_chunks=context_chunks, query=query
+        )
         if self.callbacks:
             for callback in self.callbacks:
                 callback.on_map_response_end(map_responses)  # type: ignore
@@ -157,12 +190,9 @@ class GlobalSearch(BaseSearch):
         if self.callbacks:
             for callback in self.callbacks:
                 callback.on_map_response_start(context_chunks)  # type: ignore
-        map_responses = await asyncio.gather(*[
-            self._map_response_single_batch(
-                context_data=data, query=query, **self.map_llm_params
-            )
-            for data in context_chunks
-        ])
+        map_responses = await self._map_responses(
+            context_chunks=context_chunks, query=query
+        )
         if self.callbacks:
             for callback in self.callbacks:
                 callback.on_map_response_end(map_responses)
@@ -197,13 +227,92 @@ class GlobalSearch(BaseSearch):
         """Perform a global search synchronously."""
         return asyncio.run(self.asearch(query, conversation_history))
 
+    async def _map_responses(
+        self,
+        context_chunks: str | list[str],
+        query: str,
+    ) -> list[SearchResult]:
+        """
+        Run the map calls and collect their responses as they complete.
+
+        The map phase ends early once map_quorum of the batches have answered or map_deadline seconds have passed;
+        the outstanding map calls are then cancelled, as they are when the search itself is cancelled (e.g. the client went away).
+        Key points with a score not above map_min_score are dropped from the collected responses.
+        """
+        if isinstance(context_chunks, str):
+            context_chunks = [context_chunks]
+        tasks = {
+            asyncio.create_task(
+                self._map_response_single_batch(
+                    context_data=data, query=query, **self.map_llm_params
+                )
+            ): index
+            for index, data in enumerate(context_chunks)
+        }
+        quorum = max(math.ceil(self.map_quorum * len(tasks)), 1)
+        loop = asyncio.get_running_loop()
+        deadline = (
+            loop.time() + self.map_deadline if self.map_deadline is not None else None
+        )
+
+        map_responses: dict[int, SearchResult] = {}
+        pending = set(tasks)
+        try:
+            while pending and len(map_responses) < quorum:
+                timeout = None if deadline is None else max(deadline - loop.time(), 0)
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    log.warning(
+                        "Map deadline of %ss reached with %d of %d responses, reducing the responses received so far",
+                        self.map_deadline,
+                        len(map_responses),
+                        len(tasks),
+                    )
+                    break
+                for task in done:
+                    map_responses[tasks[task]] = self._drop_low_score_points(
+                        task.result()
+                    )
+                if self.callbacks:
+                    for callback in self.callbacks:
+                        callback.on_map_response_progress(
+                            len(map_responses), len(tasks)
+                        )
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if pending:
+            log.info("Cancelled %d outstanding map calls", len(pending))
+        return [map_responses[index] for index in sorted(map_responses)]
+
+    def _drop_low_score_points(self, map_response: SearchResult) -> SearchResult:
+        if self.map_min_score <= 0 or not isinstance(map_response.response, list):
+            return map_response
+        map_response.response = [
+            point
+            for point in map_response.response
+            if not isinstance(point, dict)
+            or not isinstance(point.get("score"), int | float)
+            or point["score"] > self.map_min_score
+        ]
+        return map_response
+
     async def _map_response_single_batch(
         self,
         context_data: str,
         query: str,
         **llm_kwargs,
     ) -> SearchResult:
-        """Generate answer for a single chunk of community reports."""
+        """Generate answer for a single chunk of community reports.
+
+        If a map cache is set, the parsed key points are cached by the map messages, the model and the map llm parameters,
+        so only the reduce call runs again when the same query meets the same batch.
+        """
         start_time = time.time()
         search_prompt = ""
         try:
@@ -212,6 +321,24 @@ class GlobalSearch(BaseSearch):
                 {"role": "system", "content": self.map_system_prompt},
                 {"role": "user", "content": search_prompt},
             ]
+            cache_key = None
+            if self.map_cache is not None:
+                cache_key = create_hash_key(
+                    "global_search_map",
+                    json.dumps(search_messages),
+                    {"model": getattr(self.llm, "model", None), **llm_kwargs},
+                    None,
+                )
+                cached_response = await self.map_cache.get(cache_key)
+                if cached_response is not None:
+                    return SearchResult(
+                        response=cached_response,
+                        context_data=context_data,
+                        context_text=context_data,
+                        completion_time=time.time() - start_time,
+                        llm_calls=0,
+                        prompt_tokens=0,
+                    )
             async with self.semaphore:
                 search_response = await self.llm.agenerate(
                     messages=search_messages, streaming=False, **llm_kwargs
@@ -231,6 +358,12 @@ class GlobalSearch(BaseSearch):
                     )
                     processed_response = []
 
+            # an unparsable response has no key points, and is not cached so the batch is retried
+            if cache_key is not None and processed_response:
+                await self.map_cache.set(  # type: ignore
+                    cache_key, processed_response, {"query": query}
+                )
+
             return SearchResult(
                 response=processed_response,
                 context_data=context_data,
@@ -242,7 +375,7 @@ class GlobalSearch(BaseSearch):
 
         except Exception:
             log.exception("Exception in _map_response_single_batch")
-            return SearchResult(
+            return FailedMapResult(
                 response=[{"answer": "", "score": 0}],
                 context_data=context_data,
                 context_text=context_data,
@@ -262,15 +395,16 @@ class GlobalSearch(BaseSearch):
         Returns
         -------
         list[dict[str, Any]]
-            A list of key points, each key point is a dictionary with "answer" and "score" keys
+            A list of key points, each key point is a dictionary with "answer" and "score" keys.
+            The list is empty if the response has no valid points.
         """
         search_response, _j = try_parse_json_object(search_response)
         if _j == {}:
-            return [{"answer": "", "score": 0}]
+            return []
 
         parsed_elements = json.loads(search_response).get("points")
         if not parsed_elements or not isinstance(parsed_elements, list):
-            return [{"answer": "", "score": 0}]
+            return []
 
         return [
             {
@@ -23,6 +23,7 @@ from graphrag.query.context_builder.conversation_history import (
 )
 from graphrag.query.context_builder.entity_extraction import (
     EntityVectorStoreKey,
+    amap_query_to_entities,
     map_query_to_entities,
 )
 from graphrag.query.context_builder.local_context import (
@@ -33,14 +34,17 @@ from graphrag.query.context_builder.local_context import (
 )
 from graphrag.query.context_builder.source_context import (
     build_text_unit_context,
+    build_text_unit_relationship_index,
     count_relationships,
 )
 from graphrag.query.input.retrieval.community_reports import (
     get_candidate_communities,
 )
+from graphrag.query.input.retrieval.entities import EntityIndex
+from graphrag.query.input.retrieval.relationships import RelationshipIndex
 from graphrag.query.input.retrieval.text_units import get_candidate_text_units
 from graphrag.query.llm.base import BaseTextEmbedding
-from graphrag.query.llm.text_utils import num_tokens
+from graphrag.query.llm.text_utils import get_token_counter, num_tokens
 from graphrag.query.structured_search.base import LocalContextBuilder
 from graphrag.vector_stores import BaseVectorStore
 
@@ -71,6 +75,8 @@ class LocalSearchMixedContext(LocalContextBuilder):
         if text_units is None:
             text_units = []
         self.entities = {entity.id: entity for entity in entities}
+        # id/short_id/title lookups used to resolve vector store hits
+        self.entity_index = EntityIndex(self.entities.values())
         self.community_reports = {
             community.id: community for community in community_reports
         }
@@ -78,6 +84,11 @@ class LocalSearchMixedContext(LocalContextBuilder):
         self.relationships = {
             relationship.id: relationship for relationship in relationships
         }
+        # entity title -> relationships adjacency, shared by all queries on this context builder
+        self.relationship_index = RelationshipIndex(self.relationships.values())
+        self.text_unit_relationships = build_text_unit_relationship_index(
+            self.text_units.values(), self.relationships
+        )
         self.covariates = covariates
         self.entity_text_embeddings = entity_text_embeddings
         self.text_embedder = text_embedder
@@ -118,36 +129,128 @@ class LocalSearchMixedContext(LocalContextBuilder):
 
         Build a context by combining community reports and entity/relationship/covariate tables, and text units using a predefined ratio set by summary_prop.
         """
-        if include_entity_names is None:
-            include_entity_names = []
-        if exclude_entity_names is None:
-            exclude_entity_names = []
-        if community_prop + text_unit_prop > 1:
-            value_error = (
-                "The sum of community_prop and text_unit_prop should not exceed 1."
-            )
-            raise ValueError(value_error)
+        _check_context_props(text_unit_prop, community_prop)
+        selected_entities = map_query_to_entities(
+            query=_entity_query(
+                query, conversation_history, conversation_history_max_turns
+            ),
+            text_embedding_vectorstore=self.entity_text_embeddings,
+            text_embedder=self.text_embedder,
+            all_entities=self.entity_index,
+            embedding_vectorstore_key=self.embedding_vectorstore_key,
+            include_entity_names=include_entity_names,
+            exclude_entity_names=exclude_entity_names,
+            k=top_k_mapped_entities,
+            oversample_scaler=2,
+        )
+        return self._build_selected_entities_context(
+            selected_entities=selected_entities,
+            conversation_history=conversation_history,
+            conversation_history_max_turns=conversation_history_max_turns,
+            conversation_history_user_turns_only=conversation_history_user_turns_only,
+            max_tokens=max_tokens,
+            text_unit_prop=text_unit_prop,
+            community_prop=community_prop,
+            top_k_relationships=top_k_relationships,
+            include_community_rank=include_community_rank,
+            include_entity_rank=include_entity_rank,
+            rank_description=rank_description,
+            include_relationship_weight=include_relationship_weight,
+            relationship_ranking_attribute=relationship_ranking_attribute,
+            return_candidate_context=return_candidate_context,
+            use_community_summary=use_community_summary,
+            min_community_rank=min_community_rank,
+            community_context_name=community_context_name,
+            column_delimiter=column_delimiter,
+        )
 
-        # map user query to entities
-        # if there is conversation history, attached the previous user questions to the current query
-        if conversation_history:
-            pre_user_questions = "\n".join(
-                conversation_history.get_user_turns(conversation_history_max_turns)
-            )
-            query = f"{query}\n{pre_user_questions}"
+    async def abuild_context(
+        self,
+        query: str,
+        conversation_history: ConversationHistory | None = None,
+        include_entity_names: list[str] | None = None,
+        exclude_entity_names: list[str] | None = None,
+        conversation_history_max_turns: int | None = 5,
+        conversation_history_user_turns_only: bool = True,
+        max_tokens: int = 8000,
+        text_unit_prop: float = 0.5,
+        community_prop: float = 0.25,
+        top_k_mapped_entities: int = 10,
+        top_k_relationships: int = 10,
+        include_community_rank: bool = False,
+        include_entity_rank: bool = False,
+        rank_description: str = "number of relationships",
+        include_relationship_weight: bool = False,
+        relationship_ranking_attribute: str = "rank",
+        return_candidate_context: bool = False,
+        use_community_summary: bool = False,
+        min_community_rank: int = 0,
+        community_context_name: str = "Reports",
+        column_delimiter: str = "|",
+        **kwargs: dict[str, Any],
+    ) -> tuple[str | list[str], dict[str, pd.DataFrame]]:
+        """
+        Build data context for local search prompt without blocking the event loop.
 
-        selected_entities = map_query_to_entities(
-            query=query,
+        Same as build_context, but the query is embedded with the embedder's async client and the entity vector search runs on an executor.
+        """
+        _check_context_props(text_unit_prop, community_prop)
+        selected_entities = await amap_query_to_entities(
+            query=_entity_query(
+                query, conversation_history, conversation_history_max_turns
+            ),
             text_embedding_vectorstore=self.entity_text_embeddings,
             text_embedder=self.text_embedder,
-            all_entities=list(self.entities.values()),
+            all_entities=self.entity_index,
             embedding_vectorstore_key=self.embedding_vectorstore_key,
             include_entity_names=include_entity_names,
             exclude_entity_names=exclude_entity_names,
             k=top_k_mapped_entities,
             oversample_scaler=2,
         )
+        return self._build_selected_entities_context(
+            selected_entities=selected_entities,
+            conversation_history=conversation_history,
+            conversation_history_max_turns=conversation_history_max_turns,
+            conversation_history_user_turns_only=conversation_history_user_turns_only,
+            max_tokens=max_tokens,
+            text_unit_prop=text_unit_prop,
+            community_prop=community_prop,
+            top_k_relationships=top_k_relationships,
+            include_community_rank=include_community_rank,
+            include_entity_rank=include_entity_rank,
+            rank_description=rank_description,
+            include_relationship_weight=include_relationship_weight,
+            relationship_ranking_attribute=relationship_ranking_attribute,
+            return_candidate_context=return_candidate_context,
+            use_community_summary=use_community_summary,
+            min_community_rank=min_community_rank,
+            community_context_name=community_context_name,
+            column_delimiter=column_delimiter,
+        )
 
+    def _build_selected_entities_context(
+        self,
+        selected_entities: list[Entity],
+        conversation_history: ConversationHistory | None = None,
+        conversation_history_max_turns: int | None = 5,
+        conversation_history_user_turns_only: bool = True,
+        max_tokens: int = 8000,
+        text_unit_prop: float = 0.5,
+        community_prop: float = 0.25,
+        top_k_relationships: int = 10,
+        include_community_rank: bool = False,
+        include_entity_rank: bool = False,
+        rank_description: str = "number of relationships",
+        include_relationship_weight: bool = False,
+        relationship_ranking_attribute: str = "rank",
+        return_candidate_context: bool = False,
+        use_community_summary: bool = False,
+        min_community_rank: int = 0,
+        community_context_name: str = "Reports",
+        column_delimiter: str = "|",
+    ) -> tuple[str | list[str], dict[str, pd.DataFrame]]:
+        """Build the conversation, community, local and text unit context for the entities mapped from the query."""
         # build context
         final_context = list[str]()
         final_context_data = dict[str, pd.DataFrame]()
@@ -248,16 +351,10 @@ class LocalSearchMixedContext(LocalContextBuilder):
             for community_id in community_matches
             if community_id in self.community_reports
         ]
-        for community in selected_communities:
-            if community.attributes is None:
-                community.attributes = {}
-            community.attributes["matches"] = community_matches[community.id]
         selected_communities.sort(
-            key=lambda x: (x.attributes["matches"], x.rank),  # type: ignore
+            key=lambda x: (community_matches[x.id], x.rank),  # type: ignore
             reverse=True,  # type: ignore
         )
-        for community in selected_communities:
-            del community.attributes["matches"]  # type: ignore
 
         context_text, context_data = build_community_context(
             community_reports=selected_communities,
@@ -312,39 +409,35 @@ class LocalSearchMixedContext(LocalContextBuilder):
         if len(selected_entities) == 0 or len(self.text_units) == 0:
             return ("", {context_name.lower(): pd.DataFrame()})
 
-        selected_text_units = list[TextUnit]()
+        # the context builder is shared between queries, so ranking keys are kept per query instead of on the text units
+        selected_text_unit_ids = set()
+        ranked_text_units = list[tuple[int, int, TextUnit]]()
         # for each matching text unit, rank first by the order of the entities that match it, then by the number of matching relationships
         # that the text unit has with the matching entities
         for index, entity in enumerate(selected_entities):
             if entity.text_unit_ids:
                 for text_id in entity.text_unit_ids:
                     if (
-                        text_id not in [unit.id for unit in selected_text_units]
+                        text_id not in selected_text_unit_ids
                         and text_id in self.text_units
                     ):
+                        selected_text_unit_ids.add(text_id)
                         selected_unit = self.text_units[text_id]
                         num_relationships = count_relationships(
-                            selected_unit, entity, self.relationships
+                            selected_unit,
+                            entity,
+                            self.relationships,
+                            self.text_unit_relationships,
                         )
-                        if selected_unit.attributes is None:
-                            selected_unit.attributes = {}
-                        selected_unit.attributes["entity_order"] = index
-                        selected_unit.attributes["num_relationships"] = (
-                            num_relationships
-                        )
-                        selected_text_units.append(selected_unit)
+                        ranked_text_units.append((
+                            index,
+                            num_relationships,
+                            selected_unit,
+                        ))
 
         # sort selected text units by ascending order of entity order and descending order of number of relationships
-        selected_text_units.sort(
-            key=lambda x: (
-                x.attributes["entity_order"],  # type: ignore
-                -x.attributes["num_relationships"],  # type: ignore
-            )
-        )
-
-        for unit in selected_text_units:
-            del unit.attributes["entity_order"]  # type: ignore
-            del unit.attributes["num_relationships"]  # type: ignore
+        ranked_text_units.sort(key=lambda x: (x[0], -x[1]))
+        selected_text_units = [unit for _, _, unit in ranked_text_units]
 
         context_text, context_data = build_text_unit_context(
             text_units=selected_text_units,
@@ -402,7 +495,9 @@ class LocalSearchMixedContext(LocalContextBuilder):
             rank_description=rank_description,
             context_name="Entities",
         )
-        entity_tokens = num_tokens(entity_context, self.token_encoder)
+        # contexts are re-rendered each time an entity is added, so count them from the cached row counts
+        token_counter = get_token_counter(self.token_encoder)
+        entity_tokens = token_counter.num_tokens_by_line(entity_context)
 
         # build relationship-covariate context
         added_entities = []
@@ -421,7 +516,7 @@ class LocalSearchMixedContext(LocalContextBuilder):
                 relationship_context_data,
             ) = build_relationship_context(
                 selected_entities=added_entities,
-                relationships=list(self.relationships.values()),
+                relationships=self.relationship_index,
                 token_encoder=self.token_encoder,
                 max_tokens=max_tokens,
                 column_delimiter=column_delimiter,
@@ -432,8 +527,8 @@ class LocalSearchMixedContext(LocalContextBuilder):
             )
             current_context.append(relationship_context)
             current_context_data["relationships"] = relationship_context_data
-            total_tokens = entity_tokens + num_tokens(
-                relationship_context, self.token_encoder
+            total_tokens = entity_tokens + token_counter.num_tokens_by_line(
+                relationship_context
             )
 
             # build covariate context
@@ -446,7 +541,7 @@ class LocalSearchMixedContext(LocalContextBuilder):
                     column_delimiter=column_delimiter,
                     context_name=covariate,
                 )
-                total_tokens += num_tokens(covariate_context, self.token_encoder)
+                total_tokens += token_counter.num_tokens_by_line(covariate_context)
                 current_context.append(covariate_context)
                 current_context_data[covariate.lower()] = covariate_context_data
 
@@ -466,8 +561,8 @@ class LocalSearchMixedContext(LocalContextBuilder):
             # and add a tag to indicate which records were included in the context window
             candidate_context_data = get_candidate_context(
                 selected_entities=selected_entities,
-                entities=list(self.entities.values()),
-                relationships=list(self.relationships.values()),
+                entities=self.entity_index.entities,
+                relationships=self.relationship_index,
                 covariates=self.covariates,
                 include_entity_rank=include_entity_rank,
                 entity_rank_description=rank_description,
@@ -495,3 +590,26 @@ class LocalSearchMixedContext(LocalContextBuilder):
             for key in final_context_data:
                 final_context_data[key]["in_context"] = True
         return (final_context_text, final_context_data)
+
+
+def _check_context_props(text_unit_prop: float, community_prop: float) -> None:
+    """Check that the community and text unit shares leave room for the local context."""
+    if community_prop + text_unit_prop > 1:
+        value_error = (
+            "The sum of community_prop and text_unit_prop should not exceed 1."
+        )
+        raise ValueError(value_error)
+
+
+def _entity_query(
+    query: str,
+    conversation_history: ConversationHistory | None,
+    conversation_history_max_turns: int | None,
+) -> str:
+    """Attach the previous user questions to the current query for entity mapping."""
+    if conversation_history:
+        pre_user_questions = "\n".join(
+            conversation_history.get_user_turns(conversation_history_max_turns)
+        )
+        return f"{query}\n{pre_user_questions}"
+    return query
@@ -6,7 +6,7 @@
 import logging
 import time
 from collections.abc import AsyncGenerator
-from typing import Any
+from typing import Any, cast
 
 import tiktoken
 
@@ -64,7 +64,8 @@ class LocalSearch(BaseSearch):
         start_time = time.time()
         search_prompt = ""
 
-        context_text, context_records = self.context_builder.build_context(
+        context_builder = cast(LocalContextBuilder, self.context_builder)
+        context_text, context_records = await context_builder.abuild_context(
             query=query,
             conversation_history=conversation_history,
             **kwargs,
@@ -117,7 +118,8 @@ class LocalSearch(BaseSearch):
         """Build local search context that fits a single context window and generate answer for the user query."""
         start_time = time.time()
 
-        context_text, context_records = self.context_builder.build_context(
+        context_builder = cast(LocalContextBuilder, self.context_builder)
+        context_text, context_records = await context_builder.abuild_context(
             query=query,
             conversation_history=conversation_history,
             **self.context_builder_params,
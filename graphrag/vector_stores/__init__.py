@@ -6,12 +6,14 @@
 from .azure_ai_search import AzureAISearch
 from .base import BaseVectorStore, VectorStoreDocument, VectorStoreSearchResult
 from .lancedb import LanceDBVectorStore
+from .numpy_store import NumpyVectorStore
 from .typing import VectorStoreFactory, VectorStoreType
 
 __all__ = [
     "AzureAISearch",
     "BaseVectorStore",
     "LanceDBVectorStore",
+    "NumpyVectorStore",
     "VectorStoreDocument",
     "VectorStoreFactory",
     "VectorStoreSearchResult",
@@ -159,8 +159,11 @@ class AzureAISearch(BaseVectorStore):
         self, query_embedding: list[float], k: int = 10, **kwargs: Any
     ) -> list[VectorStoreSearchResult]:
         """Perform a vector-based similarity search."""
+        # embeddings of the columnar tables are float32 arrays, the request body needs floats
         vectorized_query = VectorizedQuery(
-            vector=query_embedding, k_nearest_neighbors=k, fields="vector"
+            vector=[float(value) for value in query_embedding],
+            k_nearest_neighbors=k,
+            fields="vector",
         )
 
         response = self.db_connection.search(
@@ -187,7 +190,7 @@ class AzureAISearch(BaseVectorStore):
     ) -> list[VectorStoreSearchResult]:
         """Perform a text-based similarity search."""
         query_embedding = text_embedder(text)
-        if query_embedding:
+        if query_embedding is not None and len(query_embedding) > 0:
             return self.similarity_search_by_vector(
                 query_embedding=query_embedding, k=k
             )
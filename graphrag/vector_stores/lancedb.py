@@ -116,6 +116,6 @@ class LanceDBVectorStore(BaseVectorStore):
     ) -> list[VectorStoreSearchResult]:
         """Perform a similarity search using a given input text."""
         query_embedding = text_embedder(text)
-        if query_embedding:
+        if query_embedding is not None and len(query_embedding) > 0:
             return self.similarity_search_by_vector(query_embedding, k)
         return []
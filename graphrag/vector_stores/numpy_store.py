@@ -0,0 +1,271 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""The in-memory NumPy vector storage implementation package."""
+
+import json
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from graphrag.model.types import TextEmbedder
+
+from .base import (
+    BaseVectorStore,
+    VectorStoreDocument,
+    VectorStoreSearchResult,
+)
+
+
+class NumpyVectorStore(BaseVectorStore):
+    """Exact cosine similarity search over an in-memory float32 matrix.
+
+    For collections of up to a few hundred thousand vectors a brute-force matrix product is
+    faster than an ANN index round trip and needs no database. If connected with a db_uri, the
+    collection is also written there, as a raw float32 matrix plus one JSON line per document,
+    and the matrix is memory-mapped when the collection is reopened.
+    Search results hold their vector as a read-only row of the matrix.
+    """
+
+    def __init__(self, collection_name: str, **kwargs: Any):
+        super().__init__(collection_name, **kwargs)
+        self.db_uri: Path | None = None
+        self._ids: list[str | int] = []
+        self._texts: list[str | None] = []
+        self._attributes: list[dict[str, Any]] = []
+        self._vectors: np.ndarray | None = None
+        self._norms = np.zeros(0, dtype=np.float32)
+        # batches loaded with overwrite=False, merged into the matrix on the next search
+        self._pending: list[np.ndarray] = []
+        self._rows_by_id: dict[str | int, int] = {}
+        self._filter_rows: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        """Return the number of documents in the collection."""
+        return len(self._ids)
+
+    def connect(self, **kwargs: Any) -> None:
+        """Connect to the vector storage, opening the saved collection if there is one."""
+        db_uri = kwargs.get("db_uri")
+        if db_uri is None:
+            return
+        self.db_uri = Path(db_uri)
+        if not self._matrix_path.exists() or not self._documents_path.exists():
+            return
+        with self._documents_path.open(encoding="utf-8") as file:
+            documents = [json.loads(line) for line in file]
+        self._ids = [document["id"] for document in documents]
+        self._texts = [document["text"] for document in documents]
+        self._attributes = [document["attributes"] for document in documents]
+        self._rows_by_id = {id: row for row, id in enumerate(self._ids)}
+        self._set_vectors(self._open_matrix())
+
+    def load_documents(
+        self, documents: list[VectorStoreDocument], overwrite: bool = True
+    ) -> None:
+        """Load documents into vector storage."""
+        documents = [document for document in documents if document.vector is not None]
+        self.load_vectors(
+            ids=[document.id for document in documents],
+            vectors=np.asarray(
+                [document.vector for document in documents], dtype=np.float32
+            ),
+            texts=[document.text for document in documents],
+            attributes=[document.attributes for document in documents],
+            overwrite=overwrite,
+        )
+
+    def load_vectors(
+        self,
+        ids: Sequence[str | int],
+        vectors: np.ndarray,
+        texts: Sequence[str | None] | None = None,
+        attributes: Sequence[dict[str, Any]] | None = None,
+        overwrite: bool = True,
+    ) -> None:
+        """Load a matrix of vectors, one row per id.
+
+        A float32 matrix (e.g. the embedding matrix of an EntityTable) is used without copying it.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(ids) == 0:
+            vectors = vectors.reshape(0, self._dim or 0)
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            msg = f"Expected one vector per id, got shape {vectors.shape} for {len(ids)} ids"
+            raise ValueError(msg)
+        text_list: list[str | None] = (
+            list(texts) if texts is not None else [None] * len(ids)
+        )
+        attribute_list = (
+            list(attributes) if attributes is not None else [{} for _ in ids]
+        )
+
+        if overwrite:
+            self._ids, self._texts, self._attributes = [], [], []
+            self._rows_by_id = {}
+            self._vectors = None
+            self._pending = []
+        elif self._dim is not None and len(ids) > 0 and vectors.shape[1] != self._dim:
+            msg = f"Vector dimension {vectors.shape[1]} does not match the collection dimension {self._dim}"
+            raise ValueError(msg)
+        for id in ids:
+            self._rows_by_id[id] = len(self._ids)
+            self._ids.append(id)
+        self._texts.extend(text_list)
+        self._attributes.extend(attribute_list)
+        if self._vectors is None or len(self._vectors) == 0:
+            self._set_vectors(vectors)
+        elif len(vectors) > 0:
+            self._pending.append(vectors)
+        self._write(vectors, ids, text_list, attribute_list, overwrite)
+        if self.query_filter:
+            self.filter_by_id(self.query_filter)
+
+    def filter_by_id(self, include_ids: Sequence[str | int]) -> Any:
+        """Build a query filter to filter documents by id."""
+        if len(include_ids) == 0:
+            self.query_filter = None
+            self._filter_rows = None
+        else:
+            self.query_filter = list(include_ids)
+            self._filter_rows = np.asarray(
+                [self._rows_by_id[id] for id in include_ids if id in self._rows_by_id],
+                dtype=np.int64,
+            )
+        return self.query_filter
+
+    def similarity_search_by_vector(
+        self, query_embedding: list[float], k: int = 10, **kwargs: Any
+    ) -> list[VectorStoreSearchResult]:
+        """Perform a vector-based similarity search."""
+        return self.similarity_search_by_vectors([query_embedding], k)[0]
+
+    def similarity_search_by_vectors(
+        self, query_embeddings: list[list[float]] | np.ndarray, k: int = 10
+    ) -> list[list[VectorStoreSearchResult]]:
+        """Perform a vector-based similarity search for several queries with one matrix product."""
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim != 2 or len(queries) == 0:
+            return [[] for _ in query_embeddings]
+        all_vectors, all_norms = self._merged()
+        rows = self._filter_rows
+        vectors = all_vectors if rows is None else all_vectors[rows]
+        norms = all_norms if rows is None else all_norms[rows]
+        if len(vectors) == 0 or k <= 0:
+            return [[] for _ in query_embeddings]
+        if queries.shape[1] != vectors.shape[1]:
+            msg = f"Query dimension {queries.shape[1]} does not match the collection dimension {vectors.shape[1]}"
+            raise ValueError(msg)
+
+        query_norms = np.linalg.norm(queries, axis=1)
+        scores = (vectors @ queries.T) / np.outer(
+            _nonzero(norms), _nonzero(query_norms)
+        )
+        k = min(k, len(vectors))
+        results = []
+        for column in scores.T:
+            top = np.argpartition(-column, k - 1)[:k]
+            top = top[np.argsort(-column[top], kind="stable")]
+            results.append([
+                self._result(
+                    all_vectors,
+                    int(row if rows is None else rows[row]),
+                    float(column[row]),
+                )
+                for row in top
+            ])
+        return results
+
+    def similarity_search_by_text(
+        self, text: str, text_embedder: TextEmbedder, k: int = 10, **kwargs: Any
+    ) -> list[VectorStoreSearchResult]:
+        """Perform a similarity search using a given input text."""
+        query_embedding = text_embedder(text)
+        if query_embedding is not None and len(query_embedding) > 0:
+            return self.similarity_search_by_vector(query_embedding, k)
+        return []
+
+    @property
+    def _dim(self) -> int | None:
+        if self._vectors is None or len(self._vectors) == 0:
+            return None
+        return self._vectors.shape[1]
+
+    @property
+    def _matrix_path(self) -> Path:
+        return self.db_uri / f"{self.collection_name}.f32"  # type: ignore
+
+    @property
+    def _documents_path(self) -> Path:
+        return self.db_uri / f"{self.collection_name}.jsonl"  # type: ignore
+
+    def _set_vectors(self, vectors: np.ndarray) -> None:
+        self._vectors = vectors
+        self._norms = np.linalg.norm(vectors, axis=1)
+        self._pending = []
+
+    def _merged(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._pending:
+            if self.db_uri is not None:
+                # every batch is on disk already, map the whole file instead of concatenating
+                self._set_vectors(self._open_matrix())
+            else:
+                self._set_vectors(np.concatenate([self._vectors, *self._pending]))  # type: ignore
+        if self._vectors is None:
+            return np.zeros((0, 0), dtype=np.float32), self._norms
+        return self._vectors, self._norms
+
+    def _open_matrix(self) -> np.ndarray:
+        rows = len(self._ids)
+        size = self._matrix_path.stat().st_size
+        if rows == 0 or size == 0:
+            return np.zeros((rows, 0), dtype=np.float32)
+        return np.memmap(
+            self._matrix_path,
+            dtype=np.float32,
+            mode="r",
+            shape=(rows, size // (4 * rows)),
+        )
+
+    def _write(
+        self,
+        vectors: np.ndarray,
+        ids: Sequence[str | int],
+        texts: list[str | None],
+        attributes: list[dict[str, Any]],
+        overwrite: bool,
+    ) -> None:
+        if self.db_uri is None:
+            return
+        self.db_uri.mkdir(parents=True, exist_ok=True)
+        mode = "wb" if overwrite else "ab"
+        with self._matrix_path.open(mode) as file:
+            file.write(np.ascontiguousarray(vectors).tobytes())
+        with self._documents_path.open(mode) as file:
+            for id, text, attrs in zip(ids, texts, attributes, strict=True):
+                line = json.dumps(
+                    {"id": id, "text": text, "attributes": attrs}, default=str
+                )
+                file.write(f"{line}\n".encode())
+        if overwrite:
+            self._set_vectors(self._open_matrix())
+
+    def _result(
+        self, vectors: np.ndarray, row: int, score: float
+    ) -> VectorStoreSearchResult:
+        return VectorStoreSearchResult(
+            document=VectorStoreDocument(
+                id=self._ids[row],
+                text=self._texts[row],
+                vector=vectors[row],  # type: ignore
+                attributes=self._attributes[row],
+            ),
+            score=score,
+        )
+
+
+def _nonzero(norms: np.ndarray) -> np.ndarray:
+    # zero vectors get a score of 0 instead of nan
+    return np.where(norms == 0, 1, norms)
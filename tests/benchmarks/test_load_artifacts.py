@@ -0,0 +1,139 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+"""Load-time benchmark of the read_indexer_* adapters on synthetic artifacts.
+
+10k rows run by default, checking the loaded rows and logging the timings; 100k and 1M
+rows run with --run_slow (poe test_benchmark). With --run_slow each load must also reach
+MIN_ROWS_PER_SECOND, which is several times what row-by-row loading achieves, so a
+regression back to per-row conversion fails the benchmark. Wall-clock rates are not
+checked in the default run, where a loaded machine would make them fail at random.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from graphrag.query.indexer_adapters import (
+    read_indexer_entities,
+    read_indexer_relationships,
+    read_indexer_reports,
+    read_indexer_text_units,
+)
+
+ROW_COUNTS = [10_000, 100_000, 1_000_000]
+EMBEDDING_DIM = 32
+MIN_ROWS_PER_SECOND = 25_000
+
+log = logging.getLogger(__name__)
+
+
+def _ids(prefix: str, n: int) -> np.ndarray:
+    return np.char.add(prefix, np.arange(n).astype(str)).astype(object)
+
+
+def _write_artifacts(path, n: int) -> dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(0)
+    entity_ids = _ids("e", n)
+    names = _ids("ENTITY ", n)
+    text_unit_ids = _ids("t", n)
+    communities = (np.arange(n) // 10).astype(str)
+    artifacts = {
+        "nodes": pd.DataFrame({
+            "title": names,
+            "degree": rng.integers(1, 100, n),
+            "community": communities,
+            "level": np.zeros(n, dtype=int),
+        }),
+        "entities": pd.DataFrame({
+            "id": entity_ids,
+            "name": names,
+            "type": "PERSON",
+            "description": "an entity description",
+            "human_readable_id": np.arange(n),
+            "text_unit_ids": [[t] for t in text_unit_ids],
+            "description_embedding": list(rng.random((n, EMBEDDING_DIM))),
+        }),
+        "relationships": pd.DataFrame({
+            "id": _ids("r", n),
+            "source": names,
+            "target": np.roll(names, 1),
+            "weight": rng.random(n),
+            "description": "a relationship description",
+            "human_readable_id": np.arange(n).astype(str),
+            "text_unit_ids": [[t] for t in text_unit_ids],
+            "rank": rng.integers(1, 100, n),
+        }),
+        "text_units": pd.DataFrame({
+            "id": text_unit_ids,
+            "text": "some text of a chunk",
+            "n_tokens": np.full(n, 300),
+            "document_ids": [["d0"]] * n,
+            "entity_ids": [[e] for e in entity_ids],
+            "relationship_ids": [[r] for r in _ids("r", n)],
+        }),
+        "reports": pd.DataFrame({
+            "community": np.unique(communities),
+            "title": "a report",
+            "level": 0,
+            "rank": 1.0,
+            "summary": "a summary",
+            "full_content": "the full content of a report",
+        }),
+    }
+    # round trip through parquet so the columns have the types of real artifacts
+    for name, df in artifacts.items():
+        df.to_parquet(path / f"{name}.parquet")
+    return {name: pd.read_parquet(path / f"{name}.parquet") for name in artifacts}
+
+
+def _loaders(artifacts: dict[str, pd.DataFrame], columnar: bool) -> dict[str, Callable]:
+    return {
+        "entities": lambda: read_indexer_entities(
+            artifacts["nodes"], artifacts["entities"], 2, columnar=columnar
+        ),
+        "relationships": lambda: read_indexer_relationships(
+            artifacts["relationships"], columnar=columnar
+        ),
+        "text_units": lambda: read_indexer_text_units(
+            artifacts["text_units"], columnar=columnar
+        ),
+        "reports": lambda: read_indexer_reports(
+            artifacts["reports"], artifacts["nodes"], 2, columnar=columnar
+        ),
+    }
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_load_artifacts(request, tmp_path, rows: int, columnar: bool):
+    run_slow = request.config.getoption("run_slow")
+    if rows > ROW_COUNTS[0] and not run_slow:
+        pytest.skip("large benchmarks only run with --run_slow")
+    artifacts = _write_artifacts(tmp_path, rows)
+    expected_rows = {
+        "entities": rows,
+        "relationships": rows,
+        "text_units": rows,
+        "reports": len(artifacts["reports"]),
+    }
+    for name, load in _loaders(artifacts, columnar).items():
+        start = time.perf_counter()
+        loaded = load()
+        elapsed = time.perf_counter() - start
+        log.info(
+            "%s (%s): %d rows in %.2fs",
+            name,
+            "columnar" if columnar else "objects",
+            rows,
+            elapsed,
+        )
+        assert len(loaded) == expected_rows[name]
+        if run_slow:
+            # every loader reads at least one artifact of the given size (reports filter on the nodes)
+            assert (
+                rows / elapsed >= MIN_ROWS_PER_SECOND
+            ), f"loading {name} took {elapsed:.2f}s for {rows} rows"
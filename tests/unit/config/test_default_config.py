@@ -130,6 +130,9 @@ ALL_ENV_VARS = {
     "GRAPHRAG_INPUT_TIMESTAMP_FORMAT": "test_format",
     "GRAPHRAG_INPUT_TITLE_COLUMN": "test_title",
     "GRAPHRAG_INPUT_FILE_TYPE": "text",
+    "GRAPHRAG_INPUT_CONCURRENCY": "7",
+    "GRAPHRAG_INPUT_STREAMING": "True",
+    "GRAPHRAG_INPUT_BATCH_SIZE": "250",
     "GRAPHRAG_LLM_CONCURRENT_REQUESTS": "12",
     "GRAPHRAG_LLM_DEPLOYMENT_NAME": "model-deployment-name-x",
     "GRAPHRAG_LLM_MAX_RETRIES": "312",
@@ -589,6 +592,9 @@ class TestDefaultConfig(unittest.TestCase):
         assert parameters.input.timestamp_column == "test_timestamp"
         assert parameters.input.timestamp_format == "test_format"
         assert parameters.input.title_column == "test_title"
+        assert parameters.input.concurrency == 7
+        assert parameters.input.streaming
+        assert parameters.input.batch_size == 250
         assert parameters.input.type == InputType.blob
         assert parameters.llm.api_base == "http://some/base"
         assert parameters.llm.api_key == "test"
@@ -695,6 +701,9 @@ class TestDefaultConfig(unittest.TestCase):
                     title_column="test_title",
                     type="blob",
                     storage_account_blob_url="input_account_blob_url",
+                    concurrency=7,
+                    streaming=True,
+                    batch_size=250,
                 ),
                 embed_graph=EmbedGraphConfigInput(
                     enabled=True,
@@ -787,6 +796,9 @@ class TestDefaultConfig(unittest.TestCase):
         assert parameters.input.timestamp_column == "test_timestamp"
         assert parameters.input.timestamp_format == "test_format"
         assert parameters.input.title_column == "test_title"
+        assert parameters.input.concurrency == 7
+        assert parameters.input.streaming
+        assert parameters.input.batch_size == 250
         assert parameters.input.file_type == InputFileType.text
         assert parameters.input.storage_account_blob_url == "input_account_blob_url"
         assert parameters.llm.api_key == "test"
@@ -865,6 +877,9 @@ class TestDefaultConfig(unittest.TestCase):
         assert parameters.input.base_dir == defs.INPUT_BASE_DIR
         assert parameters.input.text_column == defs.INPUT_TEXT_COLUMN
         assert parameters.input.file_type == defs.INPUT_FILE_TYPE
+        assert parameters.input.concurrency == defs.INPUT_CONCURRENCY
+        assert parameters.input.streaming == defs.INPUT_STREAMING
+        assert parameters.input.batch_size == defs.INPUT_BATCH_SIZE
         assert parameters.llm.concurrent_requests == defs.LLM_CONCURRENT_REQUESTS
         assert parameters.llm.max_retries == defs.LLM_MAX_RETRIES
         assert parameters.llm.max_retry_wait == defs.LLM_MAX_RETRY_WAIT
@@ -0,0 +1,119 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+import re
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import tiktoken
+
+from graphrag.index.config import (
+    PipelineCSVInputConfig,
+    PipelineTextInputConfig,
+    PipelineWorkflowReference,
+)
+from graphrag.index.input import load_input, load_input_batches
+from graphrag.index.run import run_pipeline
+from graphrag.index.storage import FilePipelineStorage
+
+
+def write_text_files(root: Path, count: int) -> dict[str, str]:
+    texts = {}
+    for i in range(count):
+        path = root / f"group{i % 3}" / f"doc{i}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        texts[path.name] = f"document {i} " + "lorem ipsum dolor " * (i % 7 + 1)
+        path.write_text(texts[path.name], encoding="utf-8")
+    return texts
+
+
+def test_find_skips_directories_that_cannot_match(tmp_path: Path):
+    write_text_files(tmp_path / "keep", 6)
+    write_text_files(tmp_path / "other", 6)
+    (tmp_path / "keep" / "notes.txt").mkdir()
+    storage = FilePipelineStorage(str(tmp_path))
+
+    pattern = re.compile(rf"{re.escape(str(tmp_path))}[\\/]keep[\\/].*\.txt$")
+    found = list(storage.find(pattern))
+
+    assert sorted(name for name, _ in found) == sorted(
+        str(Path("keep", f"group{i % 3}", f"doc{i}.txt")) for i in range(6)
+    )
+
+
+async def test_load_text_batches(tmp_path: Path):
+    texts = write_text_files(tmp_path, 25)
+    (tmp_path / "broken.txt").write_bytes(b"\xff\xfe\xfa")
+    config = PipelineTextInputConfig(
+        file_pattern=".*\\.txt$", base_dir=str(tmp_path), concurrency=4, batch_size=10
+    )
+
+    batches = [batch async for batch in load_input_batches(config)]
+    documents = await load_input(config)
+
+    assert all(len(batch) >= 10 for batch in batches[:-1])
+    assert len(documents) == 25
+    assert dict(zip(documents["title"], documents["text"], strict=True)) == texts
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), documents)
+
+
+async def test_load_csv_batches(tmp_path: Path):
+    for i in range(5):
+        pd.DataFrame({
+            "text": [f"row {j} of file {i}" for j in range(i + 1)],
+            "title": f"file{i}",
+        }).to_csv(tmp_path / f"file{i}.csv", index=False)
+    config = PipelineCSVInputConfig(
+        file_pattern=".*\\.csv$", base_dir=str(tmp_path), concurrency=2, batch_size=3
+    )
+
+    batches = [batch async for batch in load_input_batches(config)]
+    documents = await load_input(config)
+
+    assert all(len(batch) >= 3 for batch in batches[:-1])
+    assert len(documents) == 15
+    pd.testing.assert_frame_equal(pd.concat(batches), documents)
+
+
+async def test_no_files_found(tmp_path: Path):
+    config = PipelineTextInputConfig(file_pattern=".*\\.txt$", base_dir=str(tmp_path))
+    with pytest.raises(ValueError, match="No text files found"):
+        await load_input(config)
+
+
+async def test_streamed_text_units_match_a_whole_dataset_run(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    encoding = tiktoken.Encoding(
+        name="test_bytes",
+        pat_str=r"""\S+|\s+""",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+    monkeypatch.setattr(tiktoken, "get_encoding", lambda _name: encoding)
+    write_text_files(tmp_path, 40)
+    config = PipelineTextInputConfig(
+        file_pattern=".*\\.txt$", base_dir=str(tmp_path), batch_size=7
+    )
+    workflows = [
+        PipelineWorkflowReference(
+            name="create_base_text_units",
+            config={
+                "chunk_by": ["id"],
+                "text_chunk": {
+                    "strategy": {"type": "tokens", "chunk_size": 20, "chunk_overlap": 5}
+                },
+            },
+        )
+    ]
+
+    async def run(dataset) -> pd.DataFrame:
+        results = [result async for result in run_pipeline(workflows, dataset)]
+        assert results[-1].errors is None
+        assert results[-1].result is not None
+        return results[-1].result
+
+    whole = await run(await load_input(config))
+    streamed = await run(load_input_batches(config))
+
+    pd.testing.assert_frame_equal(streamed, whole.reset_index(drop=True))
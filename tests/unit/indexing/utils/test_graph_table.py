@@ -0,0 +1,79 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+import io
+
+import networkx as nx
+import pandas as pd
+
+from graphrag.index.utils import (
+    decode_graph,
+    encode_graph,
+    encode_graph_columns,
+    load_graph,
+    to_graphml,
+)
+from graphrag.index.utils.graph_table import is_encoded_graph
+
+
+def _create_graph(graph: nx.Graph) -> nx.Graph:
+    graph.add_node("B", type="person", degree=2, weight=0.5)
+    graph.add_node("A", description="a", cluster="1")
+    graph.add_node("C")
+    graph.add_edge("B", "A", weight=1.0, description="ba")
+    graph.add_edge("A", "C", weight=2.5, human_readable_id=1)
+    return graph
+
+
+def _assert_same_graph(actual: nx.Graph, expected: nx.Graph):
+    assert actual.is_directed() == expected.is_directed()
+    assert list(actual.nodes(data=True)) == list(expected.nodes(data=True))
+    assert list(actual.edges(data=True)) == list(expected.edges(data=True))
+
+
+def test_encoded_graph_round_trip():
+    for graph in (_create_graph(nx.Graph()), _create_graph(nx.DiGraph()), nx.Graph()):
+        encoded = encode_graph(graph)
+        assert is_encoded_graph(encoded)
+        _assert_same_graph(decode_graph(encoded), graph)
+
+
+def test_encoded_graph_matches_graphml_round_trip():
+    graph = _create_graph(nx.Graph())
+    _assert_same_graph(
+        decode_graph(encode_graph(graph)), nx.parse_graphml(to_graphml(graph))
+    )
+
+
+def test_mixed_attribute_types_fall_back_to_graphml():
+    graph = nx.Graph()
+    graph.add_node("A", value=1)
+    graph.add_node("B", value="one")
+
+    encoded = encode_graph(graph)
+
+    assert not is_encoded_graph(encoded)
+    _assert_same_graph(decode_graph(encoded), graph)
+
+
+def test_graph_columns_survive_parquet():
+    graph = _create_graph(nx.Graph())
+    data = pd.DataFrame({"level": [0, 1], "graph": [graph, graph]})
+
+    encoded = encode_graph_columns(data)
+    restored = pd.read_parquet(io.BytesIO(encoded.to_parquet()))
+
+    assert isinstance(data["graph"][0], nx.Graph)
+    for value in restored["graph"]:
+        _assert_same_graph(load_graph(value), graph)
+    assert encode_graph_columns(restored) is restored
+
+
+def test_load_graph_copy():
+    graph = _create_graph(nx.Graph())
+    assert load_graph(graph) is graph
+
+    copy = load_graph(graph, copy=True)
+    copy.nodes["A"]["description"] = "changed"
+
+    assert graph.nodes["A"]["description"] == "a"
+    _assert_same_graph(load_graph(to_graphml(graph)), graph)
@@ -0,0 +1,152 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+import io
+from typing import cast
+
+import networkx as nx
+import pandas as pd
+from datashaper import NoopVerbCallbacks, TableContainer, VerbInput
+
+from graphrag.index.storage import MemoryPipelineStorage
+from graphrag.index.utils import encode_graph_columns
+from graphrag.index.verbs.graph.clustering import snapshot_clustered_graph
+from graphrag.index.verbs.graph.clustering.cluster_graph import (
+    apply_clustering,
+    cluster_graph,
+)
+from graphrag.index.verbs.graph.unpack import unpack_graph
+
+communities = [
+    (0, "0", ["A", "B", "C"]),
+    (0, "1", ["D", "E"]),
+    (1, "2", ["A", "B"]),
+    (1, "3", ["C"]),
+]
+
+
+def _create_graph() -> nx.Graph:
+    graph = nx.Graph()
+    for source, target in [("A", "B"), ("B", "C"), ("A", "C"), ("C", "D"), ("D", "E")]:
+        graph.add_edge(source, target, weight=1.0)
+    graph.add_node("F", description="isolated")
+    return graph
+
+
+def _clustered_table() -> pd.DataFrame:
+    membership = {"label": [], "level": [], "cluster": []}
+    for level, cluster, nodes in communities:
+        membership["label"].extend(nodes)
+        membership["level"].extend([level] * len(nodes))
+        membership["cluster"].extend([cluster] * len(nodes))
+    graph = apply_clustering(_create_graph(), [], level=0)
+    for _, _, data in graph.edges(data=True):
+        del data["level"]
+    table = pd.DataFrame({
+        "level": [[0, 1]],
+        "clustered_graph": [graph],
+        "membership": [membership],
+    })
+    # as the next workflow reads it
+    return pd.read_parquet(io.BytesIO(encode_graph_columns(table).to_parquet()))
+
+
+def _per_level_table() -> pd.DataFrame:
+    return pd.DataFrame({
+        "level": [0, 1],
+        "clustered_graph": [
+            apply_clustering(_create_graph(), communities, level) for level in (0, 1)
+        ],
+    })
+
+
+def _unpack(table: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    return cast(
+        pd.DataFrame,
+        unpack_graph(
+            VerbInput(input=TableContainer(table=table)),
+            NoopVerbCallbacks(),
+            column="clustered_graph",
+            **kwargs,
+        ).table,
+    )
+
+
+def _records(table: pd.DataFrame) -> list[dict]:
+    return [
+        {key: value for key, value in record.items() if not pd.isna(value)}
+        for record in table.drop(columns=["graph_embedding"], errors="ignore").to_dict(
+            orient="records"
+        )
+    ]
+
+
+def test_cluster_graph_outputs_one_graph_and_membership():
+    table = pd.DataFrame({"entity_graph": [_create_graph()]})
+    result = cluster_graph(
+        VerbInput(input=TableContainer(table=table)),
+        NoopVerbCallbacks(),
+        strategy={"type": "leiden", "max_cluster_size": 2, "use_lcc": False},
+        column="entity_graph",
+        to="clustered_graph",
+        level_to="level",
+    ).table
+
+    assert len(result) == 1
+    graph = cast(nx.Graph, result["clustered_graph"][0])
+    membership = result["membership"][0]
+    assert set(graph.nodes) == set(_create_graph().nodes)
+    assert "cluster" not in graph.nodes["A"]
+    assert sorted(set(membership["level"])) == sorted(result["level"][0])
+    assert set(membership["label"]) == {"A", "B", "C", "D", "E"}
+
+
+def test_unpack_levels_match_per_level_graphs():
+    for unpack_type in ("nodes", "edges"):
+        assert _records(_unpack(_clustered_table(), type=unpack_type)) == _records(
+            _unpack(_per_level_table(), type=unpack_type)
+        )
+
+
+def test_unpack_single_level():
+    clustered = _clustered_table()
+    per_level = _per_level_table()
+    for unpack_type in ("nodes", "edges"):
+        expected = _unpack(per_level, type=unpack_type)
+        expected = cast(pd.DataFrame, expected[expected["level"] == 1]).reset_index(
+            drop=True
+        )
+        assert _records(_unpack(clustered, type=unpack_type, level=1)) == _records(
+            expected
+        )
+        assert _records(_unpack(per_level, type=unpack_type, level=1)) == _records(
+            expected
+        )
+    assert len(_unpack(clustered, type="nodes", level=5)) == 0
+
+
+def test_unpack_without_membership():
+    nodes = _unpack(_clustered_table(), type="nodes", membership_column=None)
+
+    assert list(nodes["label"]) == list(_create_graph().nodes)
+    assert "cluster" not in nodes.columns
+
+
+async def test_snapshot_clustered_graph_writes_one_graph_per_level():
+    storage = MemoryPipelineStorage()
+    clustered = _clustered_table()
+    await snapshot_clustered_graph(
+        VerbInput(input=TableContainer(table=clustered)),
+        column="clustered_graph",
+        base_name="clustered_graph",
+        storage=storage,
+    )
+
+    per_level = _per_level_table()
+    for level, expected in zip(
+        per_level["level"], per_level["clustered_graph"], strict=True
+    ):
+        graph = nx.parse_graphml(await storage.get(f"clustered_graph.{level}.graphml"))
+        assert dict(graph.nodes(data=True)) == dict(expected.nodes(data=True))
+        assert graph.nodes["A"]["level"] == level
+        assert "cluster" in graph.nodes["A"]
+    assert not await storage.has("clustered_graph.2.graphml")
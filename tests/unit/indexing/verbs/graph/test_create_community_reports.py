@@ -0,0 +1,213 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+import asyncio
+import sys
+from typing import cast
+
+import pandas as pd
+import pytest
+import tiktoken
+from datashaper import NoopVerbCallbacks, TableContainer, VerbInput
+
+from graphrag.index.cache import InMemoryCache
+from graphrag.index.graph.extractors.community_reports import (
+    get_levels,
+    prep_community_report_context,
+)
+from graphrag.index.verbs.graph.report.create_community_reports import (
+    create_community_reports,
+)
+from graphrag.index.verbs.graph.report.prepare_community_reports import (
+    prepare_community_reports,
+)
+from graphrag.index.verbs.graph.report.restore_community_hierarchy import (
+    restore_community_hierarchy,
+)
+
+MAX_TOKENS = 1500
+
+# level -> community -> entities, entities of "1" and its sub-communities have short descriptions
+communities = {
+    0: {"0": range(8), "1": range(8, 16)},
+    1: {"2": range(4), "3": range(4, 8), "4": range(8, 12), "5": range(12, 16)},
+    2: {str(6 + i): range(2 * i, 2 * i + 2) for i in range(8)},
+}
+
+
+@pytest.fixture(autouse=True)
+def _byte_tokens(monkeypatch: pytest.MonkeyPatch):
+    encoding = tiktoken.Encoding(
+        name="test_bytes",
+        pat_str=r"""\S+|\s+""",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+    monkeypatch.setattr(tiktoken, "get_encoding", lambda _name: encoding)
+
+
+def _tables() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    nodes = []
+    for level, level_communities in communities.items():
+        for community, entities in level_communities.items():
+            for entity in entities:
+                title = f"E{entity}"
+                description = ("long description " * 30) if entity < 8 else "short"
+                nodes.append({
+                    "title": title,
+                    "community": community,
+                    "level": level,
+                    "degree": entity % 3 + 1,
+                    "human_readable_id": entity,
+                    "node_details": {
+                        "human_readable_id": entity,
+                        "title": title,
+                        "description": description,
+                        "degree": entity % 3 + 1,
+                    },
+                })
+    edges = [
+        {
+            "source": f"E{i}",
+            "target": f"E{i + 1}",
+            "rank": 2,
+            "human_readable_id": i,
+            "edge_details": {
+                "human_readable_id": i,
+                "source": f"E{i}",
+                "target": f"E{i + 1}",
+                "description": f"E{i} knows E{i + 1}",
+                "rank": 2,
+            },
+        }
+        for i in range(15)
+    ]
+    node_df = pd.DataFrame(nodes)
+    edge_df = pd.DataFrame(edges)
+    callbacks = NoopVerbCallbacks()
+    local_contexts = prepare_community_reports(
+        VerbInput(
+            input=TableContainer(table=node_df),
+            named={
+                "nodes": TableContainer(table=node_df),
+                "edges": TableContainer(table=edge_df),
+            },
+        ),
+        callbacks,
+        max_tokens=MAX_TOKENS,
+    ).table
+    hierarchy = restore_community_hierarchy(
+        VerbInput(input=TableContainer(table=node_df))
+    ).table
+    return node_df, cast(pd.DataFrame, local_contexts), cast(pd.DataFrame, hierarchy)
+
+
+class FakeRunner:
+    def __init__(self):
+        self.contexts = {}
+        self.events = []
+
+    async def __call__(self, community, context, level, callbacks, cache, strategy):
+        self.events.append(("start", community))
+        self.contexts[community] = context
+        # deeper communities take longer, like bigger prompts would
+        await asyncio.sleep(0.01 * (level + 1))
+        self.events.append(("end", community))
+        return {
+            "community": community,
+            "level": level,
+            "title": f"Community {community}",
+            "full_content": f"report of {community}",
+        }
+
+
+async def _level_by_level(runner, nodes, local_contexts, hierarchy) -> pd.DataFrame:
+    reports = []
+    for level in get_levels(nodes):
+        level_contexts = prep_community_report_context(
+            pd.DataFrame(reports),
+            local_context_df=local_contexts,
+            community_hierarchy_df=hierarchy,
+            level=level,
+            max_tokens=MAX_TOKENS,
+        )
+        for _, record in level_contexts.iterrows():
+            report = await runner(
+                record["community"],
+                record["context_string"],
+                record["level"],
+                None,
+                None,
+                {},
+            )
+            reports.append(report)
+    return pd.DataFrame(reports)
+
+
+async def _create_reports(monkeypatch, runner, nodes, local_contexts, hierarchy):
+    module = sys.modules[create_community_reports.__module__]
+    monkeypatch.setattr(module, "load_strategy", lambda _type: runner)
+    return await create_community_reports(
+        VerbInput(
+            input=TableContainer(table=local_contexts),
+            named={
+                "nodes": TableContainer(table=nodes),
+                "community_hierarchy": TableContainer(table=hierarchy),
+            },
+        ),
+        NoopVerbCallbacks(),
+        InMemoryCache(),
+        strategy={"type": "graph_intelligence", "max_input_tokens": MAX_TOKENS},
+        num_threads=16,
+    )
+
+
+async def test_reports_match_a_level_by_level_run(monkeypatch: pytest.MonkeyPatch):
+    nodes, local_contexts, hierarchy = _tables()
+    expected_runner = FakeRunner()
+    expected = await _level_by_level(expected_runner, nodes, local_contexts, hierarchy)
+
+    runner = FakeRunner()
+    result = await _create_reports(
+        monkeypatch, runner, nodes, local_contexts, hierarchy
+    )
+
+    pd.testing.assert_frame_equal(result.table, expected)
+    assert runner.contexts == expected_runner.contexts
+    # "0" is too big and is summarized from the reports of its sub-communities
+    assert "report of 2" in runner.contexts["0"]
+
+
+async def test_fitting_communities_do_not_wait_for_lower_levels(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    nodes, local_contexts, hierarchy = _tables()
+    runner = FakeRunner()
+    await _create_reports(monkeypatch, runner, nodes, local_contexts, hierarchy)
+
+    events = runner.events
+    # "1" fits, it starts with the bottom level
+    assert events.index(("start", "1")) < events.index(("end", "6"))
+    # "0" waits for "2" and "3", and "2" for "6" and "7"
+    assert events.index(("start", "2")) > events.index(("end", "7"))
+    assert events.index(("start", "0")) > events.index(("end", "2"))
+    assert events.index(("start", "0")) > events.index(("end", "3"))
+
+
+async def test_failed_sub_community_report(monkeypatch: pytest.MonkeyPatch):
+    nodes, local_contexts, hierarchy = _tables()
+    runner = FakeRunner()
+
+    async def failing_runner(community, *args):
+        if community == "6":
+            msg = "llm error"
+            raise ValueError(msg)
+        return await runner(community, *args)
+
+    with pytest.raises(Exception, match="1 Errors occurred"):
+        await _create_reports(
+            monkeypatch, failing_runner, nodes, local_contexts, hierarchy
+        )
+    # the communities above "6" are not started, the others are
+    assert "2" not in runner.contexts
+    assert "0" not in runner.contexts
+    assert {"1", "3", "4", "5", "7"} <= set(runner.contexts)
@@ -0,0 +1,76 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+import random
+
+import tiktoken
+from datashaper import Progress, ProgressTicker
+
+from graphrag.index.text_splitting import Tokenizer
+from graphrag.index.verbs.text.chunk.strategies.tokens import split_text_on_tokens
+from graphrag.index.verbs.text.chunk.typing import TextChunk
+
+ranks = {bytes([i]): i for i in range(256)}
+for pair in [b"th", b"he", b"in", b"er", b"an", b" t", b"the", b" the"]:
+    ranks[pair] = len(ranks)
+encoding = tiktoken.Encoding(
+    name="test_bytes",
+    pat_str=r""" ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+""",
+    mergeable_ranks=ranks,
+    special_tokens={},
+)
+
+
+def _tokenizer(tokens_per_chunk: int, chunk_overlap: int, batch: bool) -> Tokenizer:
+    return Tokenizer(
+        chunk_overlap=chunk_overlap,
+        tokens_per_chunk=tokens_per_chunk,
+        encode=encoding.encode,
+        decode=encoding.decode,
+        encode_batch=encoding.encode_batch if batch else None,
+    )
+
+
+def _reference_chunks(texts: list[str], enc: Tokenizer) -> list[TextChunk]:
+    # every token of every text as a (doc_idx, token) pair, sliced per window
+    input_ids = [
+        (doc_idx, id) for doc_idx, text in enumerate(texts) for id in enc.encode(text)
+    ]
+    result = []
+    start_idx = 0
+    while start_idx < len(input_ids):
+        chunk_ids = input_ids[start_idx : start_idx + enc.tokens_per_chunk]
+        result.append(
+            TextChunk(
+                text_chunk=enc.decode([id for _, id in chunk_ids]),
+                source_doc_indices=list({doc_idx for doc_idx, _ in chunk_ids}),
+                n_tokens=len(chunk_ids),
+            )
+        )
+        start_idx += enc.tokens_per_chunk - enc.chunk_overlap
+    return result
+
+
+def test_chunks_match_reference():
+    rnd = random.Random(0)
+    words = ["the", "then", "in", "other", "x", "1234", "ñandú", "!"]
+    for _ in range(30):
+        texts = [
+            " ".join(rnd.choice(words) for _ in range(rnd.choice([0, 1, 20, 100])))
+            for _ in range(rnd.randint(0, 150))
+        ]
+        tokens_per_chunk = rnd.randint(1, 200)
+        chunk_overlap = rnd.randint(0, tokens_per_chunk - 1)
+        expected = _reference_chunks(
+            texts, _tokenizer(tokens_per_chunk, chunk_overlap, batch=False)
+        )
+        for batch in (False, True):
+            progress: list[Progress] = []
+            chunks = split_text_on_tokens(
+                texts,
+                _tokenizer(tokens_per_chunk, chunk_overlap, batch),
+                ProgressTicker(progress.append, len(texts)),
+            )
+            assert list(chunks) == expected
+            assert [p.completed_items for p in progress] == list(
+                range(1, len(texts) + 1)
+            )
@@ -0,0 +1,55 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+from typing_extensions import override
+
+from graphrag.llm.openai.http_clients import aclose_http_clients, get_async_http_client
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa N802
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    @override
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_shared_client_works_across_event_loops(server_url: str):
+    client = get_async_http_client(server_url, max_connections=2, http2=False)
+
+    async def get() -> str:
+        # the keep-alive connection of the previous loop must not be reused
+        responses = await asyncio.gather(*(client.get(server_url) for _ in range(3)))
+        return "".join(response.text for response in responses)
+
+    for _ in range(3):
+        assert asyncio.run(get()) == "okokok"
+    assert get_async_http_client(server_url, max_connections=2, http2=False) is client
+
+    asyncio.run(aclose_http_clients())
+    assert client.is_closed
+    assert (
+        get_async_http_client(server_url, max_connections=2, http2=False) is not client
+    )
+    asyncio.run(aclose_http_clients())
@@ -0,0 +1,169 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+from typing import cast
+
+import numpy as np
+import pandas as pd
+
+from graphrag.model import Entity, EntityTable, RelationshipTable, TextUnitTable
+from graphrag.query.context_builder.entity_extraction import (
+    find_nearest_neighbors_by_graph_embeddings,
+)
+from graphrag.query.input.loaders.dfs import (
+    read_entities,
+    read_relationships,
+    read_text_units,
+)
+from graphrag.query.structured_search.local_search.mixed_context import (
+    LocalSearchMixedContext,
+)
+from graphrag.vector_stores import (
+    NumpyVectorStore,
+    VectorStoreDocument,
+    VectorStoreSearchResult,
+)
+
+entity_df = pd.DataFrame({
+    "id": ["e0", "e1", "e2"],
+    "short_id": ["0", "1", None],
+    "title": ["A", "B", "C"],
+    "type": ["person", None, "place"],
+    "description": ["a", "b", "c"],
+    "description_embedding": [[0.5, 0.25], None, [1.0, 0.0]],
+    "community_ids": [["1"], ["1", "2"], None],
+    "text_unit_ids": [["t0", "t1"], ["t1", "t2"], np.array(["t2"])],
+    "degree": [3, 2, 1],
+})
+relationship_df = pd.DataFrame({
+    "id": ["r0", "r1"],
+    "short_id": ["0", "1"],
+    "source": ["A", "B"],
+    "target": ["B", "C"],
+    "description": ["ab", "bc"],
+    "weight": [1.0, 2.0],
+    "text_unit_ids": [["t1"], ["t2"]],
+    "rank": [5, 3],
+})
+text_unit_df = pd.DataFrame({
+    "id": ["t0", "t1", "t2"],
+    "text": ["zero", "one", "two"],
+    "entity_ids": [["e0"], ["e0", "e1"], ["e1", "e2"]],
+    "relationship_ids": [[], ["r0"], ["r1"]],
+    "n_tokens": [1, 1, 1],
+})
+
+
+class WordEncoder:
+    def encode(self, text: str) -> list[str]:
+        return text.split()
+
+
+class EntityVectorStore:
+    def similarity_search_by_text(
+        self, text: str, text_embedder, k: int = 10, **kwargs
+    ):
+        return [
+            VectorStoreSearchResult(
+                document=VectorStoreDocument(id="e1", text=None, vector=None), score=1.0
+            )
+        ]
+
+
+def test_tables_match_read_functions():
+    assert EntityTable.from_frame(entity_df).to_models() == read_entities(entity_df)
+    assert RelationshipTable.from_frame(
+        relationship_df, description_embedding_col=None, attributes_cols=["rank"]
+    ).to_models() == read_relationships(
+        relationship_df, description_embedding_col=None, attributes_cols=["rank"]
+    )
+    assert TextUnitTable.from_frame(
+        text_unit_df, short_id_col=None, covariates_col=None
+    ).to_models() == read_text_units(
+        text_unit_df, short_id_col=None, covariates_col=None
+    )
+
+
+def test_embeddings_are_one_float32_matrix():
+    entities = EntityTable.from_frame(entity_df)
+    matrix, present = entities.embeddings("description_embedding")
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (3, 2)
+    assert present.tolist() == [True, False, True]
+    assert entities[1].description_embedding is None
+    assert np.shares_memory(entities[0].description_embedding, matrix)
+
+
+def test_ids_are_interned_across_tables():
+    entities = EntityTable.from_frame(entity_df)
+    text_units = TextUnitTable.from_frame(
+        text_unit_df, short_id_col=None, covariates_col=None
+    )
+    assert entities[0].text_unit_ids[1] is text_units[1].id
+    entity = entities.get_by_id("e2")
+    assert entity is not None
+    assert entity.title == "C"
+
+
+def test_attribute_updates_are_kept():
+    relationships = RelationshipTable.from_frame(
+        relationship_df, description_embedding_col=None, attributes_cols=["rank"]
+    )
+    relationships[0].attributes["links"] = 2
+    assert relationships[0].attributes == {"rank": 5, "links": 2}
+    relationships[1].weight = 0.5
+    assert relationships[1].weight == 0.5
+
+
+def test_local_context_from_tables_matches_lists():
+    def build(entities, relationships, text_units):
+        return LocalSearchMixedContext(
+            entities=entities,
+            entity_text_embeddings=EntityVectorStore(),  # type: ignore
+            text_embedder=None,  # type: ignore
+            text_units=text_units,
+            relationships=relationships,
+            token_encoder=WordEncoder(),  # type: ignore
+        ).build_context(query="b", max_tokens=1000, include_entity_rank=True)
+
+    context_text, context_data = build(
+        read_entities(entity_df),
+        read_relationships(
+            relationship_df, description_embedding_col=None, attributes_cols=["rank"]
+        ),
+        read_text_units(text_unit_df, short_id_col=None, covariates_col=None),
+    )
+    table_text, table_data = build(
+        EntityTable.from_frame(entity_df),
+        RelationshipTable.from_frame(
+            relationship_df, description_embedding_col=None, attributes_cols=["rank"]
+        ),
+        TextUnitTable.from_frame(text_unit_df, short_id_col=None, covariates_col=None),
+    )
+    assert table_text == context_text
+    assert table_data.keys() == context_data.keys()
+    for key in context_data:
+        pd.testing.assert_frame_equal(table_data[key], context_data[key])
+
+
+def test_graph_embedding_neighbors_from_table():
+    graph_df = entity_df.assign(graph_embedding=[[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]])
+    entities = EntityTable.from_frame(graph_df)
+    store = NumpyVectorStore(collection_name="graph")
+    store.load_documents([
+        VectorStoreDocument(id=entity.id, text=None, vector=entity.graph_embedding)
+        for entity in read_entities(graph_df)
+    ])
+
+    # the query entity's graph embedding is a read-only float32 row of the table
+    # tables stand in for lists of entities
+    neighbors = find_nearest_neighbors_by_graph_embeddings(
+        "e0", store, cast(list[Entity], entities), exclude_entity_names=["A"], k=2
+    )
+    assert [entity.title for entity in neighbors] == ["B", "C"]
+    assert (
+        find_nearest_neighbors_by_graph_embeddings(
+            "e0", store, cast(list[Entity], EntityTable.from_frame(entity_df)), k=2
+        )
+        == []
+    )
@@ -0,0 +1,96 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+from graphrag.model import CommunityReport, Entity
+from graphrag.query.context_builder.community_context import (
+    build_community_context,
+)
+from graphrag.query.structured_search.global_search.community_context import (
+    GlobalCommunityContext,
+)
+
+
+class WordEncoder:
+    def encode(self, text: str) -> list[str]:
+        return text.split()
+
+
+def make_reports() -> list[CommunityReport]:
+    return [
+        CommunityReport(
+            id=str(i),
+            short_id=str(i),
+            title=f"title {i}",
+            community_id=str(i % 3),
+            summary=f"summary {i}",
+            full_content=f"content {i}\nwith two lines, and a | delimiter",
+            rank=float(i % 4),
+        )
+        for i in range(10)
+    ]
+
+
+entities = [
+    Entity(
+        id=str(i),
+        short_id=str(i),
+        title=f"entity {i}",
+        community_ids=[str(i % 3)],
+        text_unit_ids=[f"t{i}", f"t{i + 1}"],
+    )
+    for i in range(6)
+]
+
+
+def test_build_community_context_batches():
+    reports = make_reports()
+    context, context_data = build_community_context(
+        community_reports=reports,
+        entities=entities,
+        token_encoder=WordEncoder(),  # type: ignore
+        use_community_summary=False,
+        include_community_rank=True,
+        max_tokens=40,
+        single_batch=False,
+    )
+    assert isinstance(context, list)
+    assert len(context) > 1
+    assert context[0].startswith("id|title|occurrence weight|content|rank\n")
+    # fields containing the delimiter or newlines are quoted
+    assert '"content 0\nwith two lines, and a | delimiter"' in "".join(context)
+
+    record_df = context_data["reports"]
+    assert sorted(record_df["id"]) == sorted(
+        report.short_id or "" for report in reports
+    )
+    assert record_df["occurrence weight"].max() == 1.0
+    assert all(report.attributes is None for report in reports)
+
+
+def test_build_community_context_single_batch():
+    context, context_data = build_community_context(
+        community_reports=make_reports(),
+        token_encoder=WordEncoder(),  # type: ignore
+        max_tokens=20,
+        shuffle_data=False,
+        single_batch=True,
+    )
+    assert len(context) == 1
+    assert context_data["reports"]["id"].tolist() == ["0", "1", "2", "3", "4", "5"]
+
+
+def test_global_context_renders_reports_once():
+    context_builder = GlobalCommunityContext(
+        community_reports=make_reports(),
+        entities=entities,
+        token_encoder=WordEncoder(),  # type: ignore
+    )
+    rendered = context_builder.prepare(include_community_rank=True)
+    assert context_builder.prepare(include_community_rank=True) is rendered
+
+    first, _ = context_builder.build_context(include_community_rank=True, max_tokens=40)
+    second, _ = context_builder.build_context(
+        include_community_rank=True, max_tokens=40
+    )
+    assert first == second
+    assert context_builder.prepare(include_community_rank=True) is rendered
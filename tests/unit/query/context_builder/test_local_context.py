@@ -0,0 +1,31 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+from graphrag.model import Entity, Relationship
+from graphrag.query.context_builder.local_context import _filter_relationships
+
+
+def test_filter_relationships_does_not_mutate_relationships():
+    selected = [Entity(id=name, short_id=name, title=name) for name in ["a", "b"]]
+    relationships = [
+        Relationship(
+            id=f"{source}-{target}",
+            short_id=f"{source}-{target}",
+            source=source,
+            target=target,
+            attributes={"rank": rank},
+        )
+        for source, target, rank in [
+            ("a", "b", 1),
+            ("a", "x", 5),
+            ("a", "y", 1),
+            ("b", "y", 2),
+            ("z", "b", 3),
+        ]
+    ]
+
+    filtered = _filter_relationships(selected, relationships, top_k_relationships=10)
+
+    # "y" is linked to both selected entities, so its relationships come first
+    assert [rel.id for rel in filtered] == ["a-b", "b-y", "a-y", "a-x", "z-b"]
+    assert all(list(rel.attributes) == ["rank"] for rel in relationships)  # type: ignore
@@ -0,0 +1,43 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import uuid
+
+from graphrag.model import Entity
+from graphrag.query.input.retrieval.entities import (
+    EntityIndex,
+    get_entity_by_key,
+    get_entity_by_name,
+)
+
+ids = [uuid.uuid4() for _ in range(3)]
+entities = [
+    Entity(id=ids[0].hex, short_id="0", title="A", rank=1),
+    Entity(id=str(ids[1]), short_id="1", title="B", rank=3),
+    Entity(id=str(ids[2]), short_id="2", title="A", rank=2),
+]
+
+
+def test_get_entity_by_key_uuid_forms():
+    index = EntityIndex(entities)
+    for collection in (entities, index):
+        assert get_entity_by_key(collection, "id", str(ids[0])) is entities[0]
+        assert get_entity_by_key(collection, "id", ids[0].hex) is entities[0]
+        assert get_entity_by_key(collection, "id", str(ids[1])) is entities[1]
+        assert get_entity_by_key(collection, "id", ids[1].hex) is None
+        assert get_entity_by_key(collection, "short_id", "2") is entities[2]
+        assert get_entity_by_key(collection, "title", "A") is entities[0]
+        assert get_entity_by_key(collection, "rank", 3) is entities[1]
+        assert get_entity_by_key(collection, "id", "missing") is None
+
+
+def test_get_entity_by_name():
+    index = EntityIndex(entities)
+    assert get_entity_by_name(index, "A") == [entities[0], entities[2]]
+    assert get_entity_by_name(index, "C") == []
+
+
+def test_ranked_entities_do_not_reorder_collection():
+    index = EntityIndex(entities)
+    assert [entity.title for entity in index.ranked_entities] == ["B", "A", "A"]
+    assert index.entities == entities
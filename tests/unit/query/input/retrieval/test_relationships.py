@@ -0,0 +1,72 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+from graphrag.model import Entity, Relationship
+from graphrag.query.input.retrieval.relationships import (
+    RelationshipIndex,
+    get_candidate_relationships,
+    get_in_network_relationships,
+    get_out_network_relationships,
+)
+
+entities = [
+    Entity(id=str(i), short_id=str(i), title=title, rank=i)
+    for i, title in enumerate(["A", "B", "C", "D", "E"])
+]
+relationships = [
+    Relationship(
+        id=str(i),
+        short_id=str(i),
+        source=source,
+        target=target,
+        attributes={"rank": rank},
+    )
+    for i, (source, target, rank) in enumerate([
+        ("A", "B", 1),
+        ("C", "A", 5),
+        ("B", "C", 3),
+        ("D", "A", 2),
+        ("B", "E", 4),
+        ("D", "E", 6),
+    ])
+]
+
+
+def ids(selected: list[Relationship]) -> list[str]:
+    return [relationship.id for relationship in selected]
+
+
+def test_adjacency():
+    index = RelationshipIndex(relationships)
+    assert len(index) == len(relationships)
+    assert ids(index.outgoing("B")) == ["2", "4"]
+    assert ids(index.incoming("A")) == ["1", "3"]
+    assert index.outgoing("missing") == []
+
+
+def test_in_network_relationships():
+    selected = get_in_network_relationships(
+        entities[:3], RelationshipIndex(relationships)
+    )
+    assert ids(selected) == ["1", "2", "0"]
+
+
+def test_out_network_relationships():
+    selected = get_out_network_relationships(
+        entities[:2], RelationshipIndex(relationships)
+    )
+    assert ids(selected) == ["1", "4", "2", "3"]
+
+
+def test_candidate_relationships_match_list_input():
+    index = RelationshipIndex(relationships)
+    for count in range(len(entities) + 1):
+        assert ids(get_candidate_relationships(entities[:count], index)) == [
+            relationship.id
+            for relationship in relationships
+            if relationship.source in {e.title for e in entities[:count]}
+            or relationship.target in {e.title for e in entities[:count]}
+        ]
+        assert ids(get_candidate_relationships(entities[:count], relationships)) == ids(
+            get_candidate_relationships(entities[:count], index)
+        )
@@ -0,0 +1,92 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from graphrag.query.llm.base import BaseTextEmbedding
+from graphrag.query.llm.cached_embedding import CachedTextEmbedding
+
+
+class CountingEmbedding(BaseTextEmbedding):
+    model = "counting"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, text: str, **kwargs: Any) -> list[float]:
+        self.calls.append(text)
+        return [float(len(text))]
+
+    async def aembed(self, text: str, **kwargs: Any) -> list[float]:
+        self.calls.append(text)
+        await asyncio.sleep(0.01)
+        return [float(len(text))]
+
+
+def test_embed_normalizes_whitespace_and_counts():
+    text_embedder = CountingEmbedding()
+    cached = CachedTextEmbedding(text_embedder)
+    assert cached.embed("who is  scrooge ") == [16.0]
+    assert cached.embed("who is scrooge") == [16.0]
+    assert text_embedder.calls == ["who is  scrooge "]
+    assert cached.stats()["hits"] == 1
+    assert cached.stats()["misses"] == 1
+
+
+def test_lru_eviction():
+    text_embedder = CountingEmbedding()
+    cached = CachedTextEmbedding(text_embedder, max_size=2)
+    cached.embed("a")
+    cached.embed("b")
+    cached.embed("a")
+    cached.embed("c")
+    cached.embed("a")
+    cached.embed("b")
+    assert text_embedder.calls == ["a", "b", "c", "b"]
+
+
+def test_cache_dir_survives_new_instance(tmp_path):
+    CachedTextEmbedding(CountingEmbedding(), cache_dir=tmp_path).embed("a")
+    text_embedder = CountingEmbedding()
+    cached = CachedTextEmbedding(text_embedder, cache_dir=tmp_path)
+    assert cached.embed("a") == [1.0]
+    assert text_embedder.calls == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_aembed_shares_request():
+    text_embedder = CountingEmbedding()
+    cached = CachedTextEmbedding(text_embedder)
+    results = await asyncio.gather(*[cached.aembed("same") for _ in range(5)])
+    assert results == [[4.0]] * 5
+    assert text_embedder.calls == ["same"]
+
+
+def test_cache_dir_is_bounded(tmp_path):
+    cached = CachedTextEmbedding(
+        CountingEmbedding(), cache_dir=tmp_path, max_disk_size=2
+    )
+    cached.embed("a")
+    cached.embed("b")
+    cached.embed("a")
+    cached.embed("c")
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+    text_embedder = CountingEmbedding()
+    reopened = CachedTextEmbedding(text_embedder, cache_dir=tmp_path, max_disk_size=1)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    assert reopened.embed("c") == [1.0]
+    assert text_embedder.calls == []
+
+
+@pytest.mark.asyncio
+async def test_aembed_uses_cache_dir(tmp_path):
+    await CachedTextEmbedding(CountingEmbedding(), cache_dir=tmp_path).aembed("abc")
+    text_embedder = CountingEmbedding()
+    cached = CachedTextEmbedding(text_embedder, cache_dir=tmp_path)
+    assert await cached.aembed("abc") == [3.0]
+    assert text_embedder.calls == []
+    assert cached.stats()["hits"] == 1
@@ -0,0 +1,109 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+from types import SimpleNamespace
+from unittest import mock
+
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletionChunk
+from openai.types.chat.chat_completion_chunk import Choice, ChoiceDelta
+
+from graphrag.query.llm.base import BaseLLMCallback
+from graphrag.query.llm.oai import ChatOpenAI
+
+usage = CompletionUsage(completion_tokens=2, prompt_tokens=5, total_tokens=7)
+
+
+def make_chunks() -> list[ChatCompletionChunk]:
+    chunks = [
+        ChatCompletionChunk(
+            id="1",
+            created=0,
+            model="m",
+            object="chat.completion.chunk",
+            choices=[
+                Choice(
+                    index=0, delta=ChoiceDelta(content=content), finish_reason=reason
+                )
+            ],
+        )
+        for content, reason in [("hello", None), (" world", "stop")]
+    ]
+    # with stream_options={"include_usage": True}, the usage comes in a last chunk without choices
+    chunks.append(
+        ChatCompletionChunk(
+            id="1",
+            created=0,
+            model="m",
+            object="chat.completion.chunk",
+            choices=[],
+            usage=usage,
+        )
+    )
+    return chunks
+
+
+class UsageCallback(BaseLLMCallback):
+    def __init__(self):
+        super().__init__()
+        self.usage = None
+
+    def on_llm_stop(self, usage):
+        self.usage = usage
+
+
+class AsyncChunks:
+    def __init__(self, chunks: list[ChatCompletionChunk]):
+        self._chunks = iter(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> ChatCompletionChunk:
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+async def test_astream_generate_reports_usage():
+    create = mock.AsyncMock(side_effect=lambda **_kwargs: AsyncChunks(make_chunks()))
+    llm = ChatOpenAI(api_key="key", model="m", max_retries=1)
+    llm.async_client = SimpleNamespace(  # type: ignore
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+    callback = UsageCallback()
+
+    tokens = [token async for token in llm.astream_generate("hi", callbacks=[callback])]
+
+    assert "".join(tokens) == "hello world"
+    assert callback.response == ["hello", " world"]
+    assert callback.usage == usage
+    assert create.call_args.kwargs["stream_options"] == {"include_usage": True}
+
+
+def test_stream_generate_reports_usage():
+    create = mock.Mock(side_effect=lambda **_kwargs: iter(make_chunks()))
+    llm = ChatOpenAI(api_key="key", model="m", max_retries=1)
+    llm.sync_client = SimpleNamespace(  # type: ignore
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+    callback = UsageCallback()
+
+    tokens = list(llm.stream_generate("hi", callbacks=[callback]))
+
+    assert "".join(tokens) == "hello world"
+    assert callback.usage == usage
+    assert create.call_args.kwargs["stream_options"] == {"include_usage": True}
+
+
+def test_stream_generate_keeps_given_stream_options():
+    create = mock.Mock(side_effect=lambda **_kwargs: iter(make_chunks()))
+    llm = ChatOpenAI(api_key="key", model="m", max_retries=1)
+    llm.sync_client = SimpleNamespace(  # type: ignore
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+
+    list(llm.stream_generate("hi", stream_options={"include_usage": False}))
+
+    assert create.call_args.kwargs["stream_options"] == {"include_usage": False}
@@ -0,0 +1,82 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+from concurrent.futures import ThreadPoolExecutor
+
+from graphrag.query.llm.text_utils import (
+    MAX_TOKEN_COUNTERS,
+    TokenCounter,
+    get_token_counter,
+)
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text: str) -> list[str]:
+        self.calls += 1
+        return text.split()
+
+
+def test_token_counter_caches_counts():
+    encoder = CountingEncoder()
+    counter = TokenCounter(encoder)  # type: ignore
+    assert counter.num_tokens("a b c\n") == 3
+    assert counter.num_tokens("a b c\n") == 3
+    assert encoder.calls == 1
+
+    assert counter.num_tokens_by_line("a b c\nd e\n") == 5
+    assert encoder.calls == 2
+
+
+def test_token_counter_evicts_oldest():
+    encoder = CountingEncoder()
+    counter = TokenCounter(encoder, max_cache_size=2)  # type: ignore
+    for text in ["a", "b", "c", "a"]:
+        counter.num_tokens(text)
+    assert encoder.calls == 4
+
+
+def test_token_counter_caps_cached_characters():
+    encoder = CountingEncoder()
+    counter = TokenCounter(encoder, max_cache_chars=10)  # type: ignore
+    for text in ["a b c", "d e f", "g h i", "a b c"]:
+        counter.num_tokens(text)
+    assert encoder.calls == 4
+    assert counter.cached_chars <= 10
+
+    # texts longer than the whole cache are counted but not cached
+    size = counter.cache_size
+    assert counter.num_tokens("x " * 10) == 10
+    assert counter.cache_size == size
+    counter.num_tokens("x " * 10)
+    assert encoder.calls == 6
+
+
+def test_token_counter_from_several_threads():
+    encoder = CountingEncoder()
+    counter = TokenCounter(encoder, max_cache_size=8)  # type: ignore
+    texts = [f"row {i % 50:02d} text" for i in range(5_000)]
+    with ThreadPoolExecutor(8) as pool:
+        counts = list(pool.map(counter.num_tokens, texts))
+    assert counts == [3] * len(texts)
+    assert 0 < counter.cache_size <= 8
+    # every text has the same length
+    assert counter.cached_chars == counter.cache_size * len(texts[0])
+
+
+def test_get_token_counter_is_shared_per_encoder():
+    encoder = CountingEncoder()
+    assert get_token_counter(encoder) is get_token_counter(encoder)  # type: ignore
+    assert get_token_counter(encoder) is not get_token_counter(CountingEncoder())  # type: ignore
+
+
+def test_get_token_counter_keeps_recent_encoders():
+    encoder = CountingEncoder()
+    counter = get_token_counter(encoder)  # type: ignore
+    others = [CountingEncoder() for _ in range(MAX_TOKEN_COUNTERS)]
+    for other in others:
+        get_token_counter(other)  # type: ignore
+    assert get_token_counter(others[-1]) is get_token_counter(others[-1])  # type: ignore
+    assert get_token_counter(encoder) is not counter  # type: ignore
@@ -0,0 +1,170 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+import asyncio
+import json
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from graphrag.index.cache import InMemoryCache
+from graphrag.query.context_builder.builders import GlobalContextBuilder
+from graphrag.query.context_builder.conversation_history import ConversationHistory
+from graphrag.query.llm.base import BaseLLM
+from graphrag.query.structured_search.global_search.search import (
+    GlobalSearch,
+    GlobalSearchResult,
+)
+
+
+class WordEncoder:
+    def encode(self, text: str) -> list[str]:
+        return text.split()
+
+
+class BatchContext(GlobalContextBuilder):
+    """Build a context of the given map batches."""
+
+    def __init__(self, batches: list[str]):
+        self.batches = batches
+
+    def build_context(
+        self, conversation_history: ConversationHistory | None = None, **kwargs
+    ) -> tuple[str | list[str], dict[str, pd.DataFrame]]:
+        return self.batches, {}
+
+
+class DelayedLLM(BaseLLM):
+    """Answer each map batch "<delay> <score>" after delay seconds, and the reduce call at once."""
+
+    def __init__(self):
+        self.started = 0
+        self.cancelled = 0
+        self.reduced = 0
+
+    def generate(self, messages, streaming=True, callbacks=None, **kwargs: Any):
+        return ""
+
+    def stream_generate(self, messages, callbacks=None, **kwargs: Any):
+        yield ""
+
+    async def agenerate(self, messages, streaming=True, callbacks=None, **kwargs):
+        assert isinstance(messages, list)
+        if messages[0]["content"] != "map":
+            self.reduced += 1
+            return "reduced"
+        delay, score = messages[-1]["content"].split()[:2]
+        self.started += 1
+        try:
+            await asyncio.sleep(float(delay))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return json.dumps({
+            "points": [{"description": f"after {delay}", "score": int(score)}]
+        })
+
+    async def astream_generate(self, messages, callbacks=None, **kwargs):
+        yield ""
+
+
+def build_search(llm: BaseLLM, batches: list[str], **kwargs) -> GlobalSearch:
+    return GlobalSearch(
+        llm=llm,
+        context_builder=BatchContext(batches),
+        token_encoder=WordEncoder(),  # type: ignore
+        map_system_prompt="map",
+        map_user_prompt="{context_data} {user_question}",
+        **kwargs,
+    )
+
+
+def map_points(result: GlobalSearchResult) -> list[list[dict[str, Any]]]:
+    points = []
+    for response in result.map_responses:
+        assert isinstance(response.response, list)
+        points.append(response.response)
+    return points
+
+
+def first_answers(result: GlobalSearchResult) -> list[str]:
+    return [points[0]["answer"] for points in map_points(result)]
+
+
+@pytest.mark.asyncio
+async def test_map_waits_for_all_responses_by_default():
+    llm = DelayedLLM()
+    result = await build_search(llm, ["0.02 5", "0 3", "0.01 0"]).asearch("q")
+    assert first_answers(result) == ["after 0.02", "after 0", "after 0.01"]
+    assert llm.cancelled == 0
+    assert result.response == "reduced"
+
+
+@pytest.mark.asyncio
+async def test_map_quorum_cancels_outstanding_calls():
+    llm = DelayedLLM()
+    search = build_search(llm, ["10 5", "0 3", "0.01 4", "10 2"], map_quorum=0.5)
+    result = await search.asearch("q")
+    assert first_answers(result) == ["after 0", "after 0.01"]
+    assert llm.cancelled == 2
+
+
+@pytest.mark.asyncio
+async def test_map_deadline_reduces_received_responses():
+    llm = DelayedLLM()
+    search = build_search(
+        llm, ["10 5", "0 3", "0 4"], map_deadline=0.1, map_min_score=3
+    )
+    result = await search.asearch("q")
+    assert map_points(result) == [[], [{"answer": "after 0", "score": 4}]]
+    assert llm.cancelled == 1
+    assert llm.reduced == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_search_cancels_map_calls():
+    llm = DelayedLLM()
+    task = asyncio.create_task(build_search(llm, ["10 5", "10 3"]).asearch("q"))
+    while llm.started < 2:
+        await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert llm.cancelled == 2
+    assert llm.reduced == 0
+
+
+@pytest.mark.asyncio
+async def test_map_cache_reuses_batch_responses():
+    llm = DelayedLLM()
+    search = build_search(llm, ["0 5", "0 3"], map_cache=InMemoryCache())
+    first = await search.asearch("q")
+    second = await search.asearch("q")
+    assert llm.started == 2
+    assert llm.reduced == 2
+    assert map_points(second) == map_points(first)
+    assert [r.llm_calls for r in second.map_responses] == [0, 0]
+    assert second.llm_calls == 1
+    await search.asearch("other q")
+    assert llm.started == 4
+
+
+class MalformedOnceLLM(DelayedLLM):
+    """Answer the first map call with text that is not json."""
+
+    async def agenerate(self, messages, streaming=True, callbacks=None, **kwargs):
+        if self.started == 0:
+            self.started += 1
+            return "not json"
+        return await super().agenerate(messages, streaming, callbacks, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_map_cache_skips_unparsable_responses():
+    llm = MalformedOnceLLM()
+    search = build_search(llm, ["0 5"], map_cache=InMemoryCache())
+    first = await search.asearch("q")
+    assert map_points(first) == [[]]
+    second = await search.asearch("q")
+    assert map_points(second) == [[{"answer": "after 0", "score": 5}]]
+    assert second.map_responses[0].llm_calls == 1
@@ -0,0 +1,108 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+from typing import Any
+
+import pytest
+
+from graphrag.model import Entity, Relationship, TextUnit
+from graphrag.query.context_builder.source_context import count_relationships
+from graphrag.query.llm.base import BaseTextEmbedding
+from graphrag.query.structured_search.local_search.mixed_context import (
+    LocalSearchMixedContext,
+)
+from graphrag.vector_stores import VectorStoreDocument, VectorStoreSearchResult
+
+entities = [
+    Entity(id="e0", short_id="0", title="A", text_unit_ids=["t0", "t1"]),
+    Entity(id="e1", short_id="1", title="B", text_unit_ids=["t1", "t2", "t3"]),
+]
+relationships = [
+    Relationship(id="r0", short_id="0", source="A", target="B", text_unit_ids=["t1"]),
+    Relationship(id="r1", short_id="1", source="B", target="C", text_unit_ids=["t3"]),
+    Relationship(id="r2", short_id="2", source="C", target="B", text_unit_ids=["t3"]),
+]
+text_units = [
+    TextUnit(id="t0", short_id="0", text="zero"),
+    TextUnit(id="t1", short_id="1", text="one", relationship_ids=["r0"]),
+    TextUnit(id="t2", short_id="2", text="two", relationship_ids=[]),
+    TextUnit(id="t3", short_id="3", text="three"),
+]
+
+
+class WordEncoder:
+    def encode(self, text: str) -> list[str]:
+        return text.split()
+
+
+class QueryEmbedding(BaseTextEmbedding):
+    def __init__(self):
+        self.async_calls = 0
+
+    def embed(self, text: str, **kwargs: Any) -> list[float]:
+        return [1.0]
+
+    async def aembed(self, text: str, **kwargs: Any) -> list[float]:
+        self.async_calls += 1
+        return [1.0]
+
+
+class EntityVectorStore:
+    def similarity_search_by_vector(
+        self, query_embedding: list[float], k: int = 10, **kwargs: Any
+    ) -> list[VectorStoreSearchResult]:
+        return [
+            VectorStoreSearchResult(
+                document=VectorStoreDocument(id="e1", text=None, vector=None), score=1.0
+            )
+        ]
+
+    def similarity_search_by_text(
+        self, text: str, text_embedder, k: int = 10, **kwargs: Any
+    ) -> list[VectorStoreSearchResult]:
+        return self.similarity_search_by_vector(text_embedder(text), k)
+
+
+def build_context_builder(text_embedder=None) -> LocalSearchMixedContext:
+    return LocalSearchMixedContext(
+        entities=entities,
+        entity_text_embeddings=EntityVectorStore(),  # type: ignore
+        text_embedder=text_embedder,  # type: ignore
+        text_units=text_units,
+        relationships=relationships,
+        token_encoder=WordEncoder(),  # type: ignore
+    )
+
+
+def test_count_relationships_with_index():
+    context_builder = build_context_builder()
+    relationship_map = {rel.id: rel for rel in relationships}
+    for entity in entities:
+        for unit in text_units:
+            assert count_relationships(
+                unit, entity, relationship_map, context_builder.text_unit_relationships
+            ) == count_relationships(unit, entity, relationship_map)
+
+
+def test_text_unit_ranking_does_not_touch_text_units():
+    context_builder = build_context_builder(QueryEmbedding())
+    _, context_data = context_builder.build_context(query="b", max_tokens=1000)
+    # the text units of B, ranked by the number of B's relationships they mention
+    assert context_data["sources"]["id"].tolist() == ["3", "1", "2"]
+    assert all(unit.attributes is None for unit in text_units)
+
+
+@pytest.mark.asyncio
+async def test_abuild_context_matches_build_context():
+    text_embedder = QueryEmbedding()
+    context_builder = build_context_builder(text_embedder)
+    context_text, context_data = context_builder.build_context(
+        query="b", max_tokens=1000
+    )
+    async_text, async_data = await context_builder.abuild_context(
+        query="b", max_tokens=1000
+    )
+    assert text_embedder.async_calls == 1
+    assert async_text == context_text
+    assert async_data.keys() == context_data.keys()
+    assert async_data["entities"]["entity"].tolist() == ["B"]
@@ -0,0 +1,80 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+from typing import Any
+
+import pytest
+
+from graphrag.query.llm.base import BaseLLM, BaseLLMCallback
+from graphrag.query.structured_search.global_search.search import GlobalSearch
+from graphrag.query.structured_search.local_search.search import LocalSearch
+
+
+class MockLLM(BaseLLM):
+    def generate(self, messages, streaming=True, callbacks=None, **kwargs: Any):
+        return ""
+
+    def stream_generate(self, messages, callbacks=None, **kwargs: Any):
+        yield ""
+
+    async def agenerate(self, messages, streaming=True, callbacks=None, **kwargs):
+        return ""
+
+    async def astream_generate(self, messages, callbacks=None, **kwargs):
+        yield ""
+
+
+def test_scoped_local_search_does_not_leak_overrides():
+    engine = LocalSearch(
+        llm=MockLLM(),
+        context_builder=None,  # type: ignore
+        llm_params={"max_tokens": 100, "temperature": 0.5},
+    )
+    callback = BaseLLMCallback()
+    view = engine.scoped(
+        context_builder="context",  # type: ignore
+        llm_params={"temperature": 0.0, "seed": 1},
+        callbacks=[callback],
+        response_type="single paragraph",
+    )
+
+    assert view.context_builder == "context"
+    assert view.llm_params == {"max_tokens": 100, "temperature": 0.0, "seed": 1}
+    assert view.callbacks == [callback]
+    assert view.response_type == "single paragraph"
+
+    assert engine.context_builder is None
+    assert engine.llm_params == {"max_tokens": 100, "temperature": 0.5}
+    assert engine.callbacks is None
+    assert engine.response_type == "multiple paragraphs"
+
+
+def test_scoped_local_search_keeps_defaults_for_none():
+    engine = LocalSearch(llm=MockLLM(), context_builder=None)  # type: ignore
+    view = engine.scoped(response_type=None)
+    assert view.response_type == "multiple paragraphs"
+    assert view.llm_params is not engine.llm_params
+
+
+def test_scoped_search_rejects_unknown_attributes():
+    engine = LocalSearch(llm=MockLLM(), context_builder=None)  # type: ignore
+    with pytest.raises(AttributeError):
+        engine.scoped(unknown=True)
+
+
+def test_scoped_global_search_applies_llm_params_to_reduce_only():
+    engine = GlobalSearch(
+        llm=MockLLM(),
+        context_builder=None,  # type: ignore
+        map_llm_params={"max_tokens": 10},
+        reduce_llm_params={"max_tokens": 20},
+    )
+    view = engine.scoped(llm_params={"temperature": 0.3})
+
+    assert view.map_llm_params == {
+        "max_tokens": 10,
+        "response_format": {"type": "json_object"},
+    }
+    assert view.map_llm_params is not engine.map_llm_params
+    assert view.reduce_llm_params == {"max_tokens": 20, "temperature": 0.3}
+    assert engine.reduce_llm_params == {"max_tokens": 20}
+    assert view.semaphore is engine.semaphore
@@ -0,0 +1,131 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from graphrag.model import EntityTable
+from graphrag.query.input.loaders.dfs import (
+    read_entities,
+    store_entity_semantic_embeddings,
+)
+from graphrag.vector_stores import (
+    NumpyVectorStore,
+    VectorStoreDocument,
+    VectorStoreFactory,
+    VectorStoreType,
+)
+
+rng = np.random.default_rng(0)
+vectors = rng.normal(size=(50, 8)).astype(np.float32)
+ids = [f"d{i}" for i in range(len(vectors))]
+
+
+def brute_force(query: np.ndarray, rows: list[int], k: int) -> list[str]:
+    scores = [
+        float(
+            vectors[row]
+            @ query
+            / (np.linalg.norm(vectors[row]) * np.linalg.norm(query))
+        )
+        for row in rows
+    ]
+    order = sorted(range(len(rows)), key=lambda i: -scores[i])[:k]
+    return [ids[rows[i]] for i in order]
+
+
+def create_store(**kwargs) -> NumpyVectorStore:
+    store = VectorStoreFactory.get_vector_store(
+        VectorStoreType.Numpy, {"collection_name": "docs", **kwargs}
+    )
+    assert isinstance(store, NumpyVectorStore)
+    store.connect(**kwargs)
+    return store
+
+
+def test_search_matches_brute_force():
+    store = create_store()
+    store.load_documents([
+        VectorStoreDocument(id=id, text=id, vector=vector.tolist())
+        for id, vector in zip(ids, vectors, strict=True)
+    ])
+    query = rng.normal(size=8).astype(np.float32)
+
+    results = store.similarity_search_by_vector(query.tolist(), k=5)
+
+    assert [result.document.id for result in results] == brute_force(
+        query, list(range(50)), 5
+    )
+    assert results[0].score >= results[-1].score
+    assert results[0].document.text == results[0].document.id
+
+
+def test_batched_search_and_filter():
+    store = create_store()
+    store.load_vectors(ids, vectors)
+    queries = rng.normal(size=(3, 8)).astype(np.float32)
+
+    batched = store.similarity_search_by_vectors(queries, k=4)
+    for query, results in zip(queries, batched, strict=True):
+        assert [result.document.id for result in results] == brute_force(
+            query, list(range(50)), 4
+        )
+
+    store.filter_by_id(["d3", "d7", "d11", "missing"])
+    results = store.similarity_search_by_vector(queries[0].tolist(), k=10)
+    assert [result.document.id for result in results] == brute_force(
+        queries[0], [3, 7, 11], 10
+    )
+
+    store.filter_by_id([])
+    assert len(store.similarity_search_by_vector(queries[0].tolist(), k=10)) == 10
+
+
+def test_append_and_persist(tmp_path):
+    store = create_store(db_uri=str(tmp_path))
+    store.load_vectors(ids[:30], vectors[:30], attributes=[{"n": i} for i in range(30)])
+    store.load_vectors(ids[30:], vectors[30:], overwrite=False)
+    query = rng.normal(size=8).astype(np.float32)
+    expected = brute_force(query, list(range(50)), 6)
+    assert [
+        r.document.id for r in store.similarity_search_by_vector(query.tolist(), k=6)
+    ] == expected
+
+    reopened = create_store(db_uri=str(tmp_path))
+    assert len(reopened) == 50
+    results = reopened.similarity_search_by_vector(query.tolist(), k=6)
+    assert [result.document.id for result in results] == expected
+    # the reopened matrix is memory-mapped and results hold rows of it
+    vector = results[0].document.vector
+    assert isinstance(vector, np.memmap)
+    np.testing.assert_array_equal(vector, vectors[ids.index(expected[0])])
+    assert reopened.similarity_search_by_vector(vectors[2].tolist(), k=1)[
+        0
+    ].document.attributes == {"n": 2}
+
+
+def test_store_entity_table_embeddings():
+    entity_df = pd.DataFrame({
+        "id": ["e0", "e1", "e2"],
+        "short_id": ["0", "1", "2"],
+        "title": ["A", "B", "C"],
+        "description": ["a", "b", "c"],
+        "description_embedding": [[1.0, 0.0], None, [0.6, 0.8]],
+        "type": ["person", "person", "place"],
+        "community_ids": [["1"], ["1"], ["2"]],
+        "text_unit_ids": [["t0"], ["t1"], ["t2"]],
+        "degree": [1, 1, 1],
+    })
+    table = EntityTable.from_frame(entity_df)
+    table_store = create_store()
+    store_entity_semantic_embeddings(table, table_store)
+    object_store = create_store()
+    store_entity_semantic_embeddings(read_entities(entity_df), object_store)
+
+    for store in (table_store, object_store):
+        results = store.similarity_search_by_vector([0.0, 1.0], k=5)
+        assert [result.document.id for result in results] == ["e2", "e0"]
+        assert [result.document.text for result in results] == ["c", "a"]
+        assert results[0].document.attributes == {"title": "C"}
+        assert results[0].score == pytest.approx(0.8)
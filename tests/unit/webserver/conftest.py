@@ -0,0 +1,23 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+import os
+from pathlib import Path
+
+SETTINGS_ENV = "GRAPHRAG_SETTINGS_FILE"
+SETTINGS_FILE = Path(__file__).parent / "settings.yaml"
+
+_previous_settings_file: str | None = None
+
+
+def pytest_configure(config):
+    # webserver.configs loads its settings when imported, so they are set up before the tests are collected
+    global _previous_settings_file
+    _previous_settings_file = os.environ.get(SETTINGS_ENV)
+    os.environ[SETTINGS_ENV] = str(SETTINGS_FILE)
+
+
+def pytest_unconfigure(config):
+    if _previous_settings_file is None:
+        os.environ.pop(SETTINGS_ENV, None)
+    else:
+        os.environ[SETTINGS_ENV] = _previous_settings_file
@@ -0,0 +1,189 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+import asyncio
+
+import pytest
+from fastapi import Request
+
+from webserver.configs import settings
+from webserver.search.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    request_tenant,
+    set_tenant,
+)
+
+
+class Calls:
+    """Run llm calls through a controller, each one held until it is released."""
+
+    def __init__(self, controller: AdmissionController):
+        self.controller = controller
+        self.admitted: list[str] = []
+        self.events: dict[str, asyncio.Event] = {}
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    def start(self, tenant: str, name: str) -> asyncio.Task:
+        self.events[name] = asyncio.Event()
+
+        async def call():
+            set_tenant(tenant)
+            async with self.controller.slot():
+                self.admitted.append(name)
+                await self.events[name].wait()
+
+        self.tasks[name] = asyncio.create_task(call())
+        return self.tasks[name]
+
+    async def finish(self, name: str):
+        self.events[name].set()
+        await self.tasks[name]
+        await settle()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_queued_calls_are_admitted_round_robin_by_tenant():
+    controller = AdmissionController(max_concurrency=1)
+    calls = Calls(controller)
+    calls.start("a", "a0")
+    await settle()
+    for i in range(1, 4):
+        calls.start("a", f"a{i}")
+    calls.start("b", "b0")
+    calls.start("b", "b1")
+    await settle()
+    assert calls.admitted == ["a0"]
+    assert controller.queue_depth == 5
+
+    for name in ["a0", "a1", "b0", "a2", "b1", "a3"]:
+        await calls.finish(name)
+
+    # "b" does not wait behind every queued call of "a"
+    assert calls.admitted == ["a0", "a1", "b0", "a2", "b1", "a3"]
+    assert controller.active == 0
+    assert controller.stats()["admitted"] == 6
+
+
+async def test_tenant_concurrency_leaves_slots_to_other_tenants():
+    controller = AdmissionController(max_concurrency=3, tenant_concurrency=2)
+    calls = Calls(controller)
+    for i in range(4):
+        calls.start("a", f"a{i}")
+    await settle()
+    assert calls.admitted == ["a0", "a1"]
+    assert controller.active == 2
+
+    calls.start("b", "b0")
+    await settle()
+    assert calls.admitted == ["a0", "a1", "b0"]
+
+    await calls.finish("a0")
+    assert calls.admitted == ["a0", "a1", "b0", "a2"]
+    for name in ["a1", "b0", "a2", "a3"]:
+        await calls.finish(name)
+    assert controller.active == 0
+    assert controller.queue_depth == 0
+
+
+async def test_cancelled_while_queued():
+    controller = AdmissionController(max_concurrency=1)
+    calls = Calls(controller)
+    calls.start("a", "a0")
+    calls.start("b", "b0")
+    calls.start("c", "c0")
+    await settle()
+    assert controller.queue_depth == 2
+
+    calls.tasks["b0"].cancel()
+    await settle()
+    assert controller.queue_depth == 1
+    assert controller.stats()["queued_tenants"] == 1
+
+    await calls.finish("a0")
+    assert calls.admitted == ["a0", "c0"]
+    await calls.finish("c0")
+    assert controller.active == 0
+
+
+async def test_cancelled_right_after_admission_gives_the_slot_back():
+    controller = AdmissionController(max_concurrency=1)
+    calls = Calls(controller)
+    calls.start("a", "a0")
+    calls.start("b", "b0")
+    calls.start("c", "c0")
+    await settle()
+
+    # releasing "a0" admits "b0", which is cancelled before it gets to run
+    calls.events["a0"].set()
+    await asyncio.sleep(0)
+    calls.tasks["b0"].cancel()
+    await settle()
+
+    assert calls.tasks["b0"].cancelled()
+    assert calls.admitted == ["a0", "c0"]
+    assert controller.active == 1
+    await calls.finish("c0")
+    assert controller.active == 0
+    assert controller.queue_depth == 0
+
+
+async def test_check_rejects_when_the_queue_is_full():
+    controller = AdmissionController(max_concurrency=1, max_queue=2)
+    calls = Calls(controller)
+    calls.start("a", "a0")
+    calls.start("a", "a1")
+    await settle()
+    controller.check()
+
+    calls.start("b", "b0")
+    await settle()
+    with pytest.raises(AdmissionRejected):
+        controller.check()
+    assert controller.stats()["rejected"] == 1
+
+    for name in ["a0", "a1", "b0"]:
+        await calls.finish(name)
+    controller.check()
+
+
+async def test_saturated_once_the_queue_reaches_the_degrade_threshold():
+    controller = AdmissionController(max_concurrency=1, degrade_queue=2)
+    calls = Calls(controller)
+    calls.start("a", "a0")
+    calls.start("a", "a1")
+    await settle()
+    assert not controller.saturated
+
+    calls.start("b", "b0")
+    await settle()
+    assert controller.saturated
+
+    await calls.finish("a0")
+    assert not controller.saturated
+    for name in ["a1", "b0"]:
+        await calls.finish(name)
+
+
+def test_degrading_is_off_by_default():
+    controller = AdmissionController(max_concurrency=1)
+    assert not controller.saturated
+    controller.check()
+
+
+def test_request_tenant_comes_from_the_gateway_header_or_client(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    request = Request({
+        "type": "http",
+        "headers": [(b"x-tenant", b"alice")],
+        "client": ("10.0.0.1", 5000),
+    })
+    assert request_tenant(request) == "10.0.0.1"
+
+    monkeypatch.setattr(settings, "admission_tenant_header", "X-Tenant")
+    assert request_tenant(request) == "alice"
+    assert request_tenant(Request({"type": "http", "headers": []})) is None
@@ -0,0 +1,193 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+from types import SimpleNamespace
+
+import pytest
+
+from graphrag.query.structured_search.base import SearchResult
+from graphrag.query.structured_search.global_search.reduce_system_prompt import (
+    NO_DATA_ANSWER,
+)
+from graphrag.query.structured_search.global_search.search import (
+    FailedMapResult,
+    GlobalSearchResult,
+)
+from webserver import gtypes
+from webserver.gtypes.chat_request import ChatCompletionMessageParam
+from webserver.search import answercache
+from webserver.search.answercache import AnswerCache
+
+
+class FakeEmbedder:
+    """Embed the questions of a fixed table."""
+
+    def __init__(self, vectors: dict[str, list[float]]):
+        self.vectors = vectors
+        self.calls = 0
+
+    async def aembed(self, text: str) -> list[float]:
+        self.calls += 1
+        return self.vectors[text]
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(answercache, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def versions(monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+    versions = {}
+    monkeypatch.setattr(
+        answercache,
+        "get_artifacts_version",
+        lambda input_dir: versions.get(input_dir, "1"),
+    )
+    return versions
+
+
+def request(
+    question: str, model: str = "index-local", **kwargs
+) -> gtypes.ChatCompletionRequest:
+    message = ChatCompletionMessageParam(content=question)
+    return gtypes.ChatCompletionRequest(model=model, messages=[message], **kwargs)
+
+
+def result(response: str = "the answer") -> SearchResult:
+    return SearchResult(
+        response=response,
+        context_data={},
+        context_text="",
+        completion_time=1,
+        llm_calls=1,
+        prompt_tokens=10,
+    )
+
+
+def global_result(
+    map_responses: list[SearchResult], batches: int = 2
+) -> GlobalSearchResult:
+    return GlobalSearchResult(
+        response="the answer",
+        context_data={},
+        context_text=[f"batch {i}" for i in range(batches)],
+        map_responses=map_responses,
+        reduce_context_data="",
+        reduce_context_text="",
+        completion_time=1,
+        llm_calls=1,
+        prompt_tokens=10,
+    )
+
+
+RELEVANT = [{"answer": "a", "score": 50}]
+IRRELEVANT = [{"answer": "", "score": 0}]
+
+
+def map_response(points: list[dict], failed: bool = False) -> SearchResult:
+    cls = FailedMapResult if failed else SearchResult
+    return cls(
+        response=points,
+        context_data="",
+        context_text="",
+        completion_time=1,
+        llm_calls=1,
+        prompt_tokens=1,
+    )
+
+
+async def test_exact_match(clock, versions):
+    cache = AnswerCache(max_size=10)
+    await cache.put(request("What is  GraphRAG? "), result())
+
+    cached = await cache.get(request("What is GraphRAG?"))
+    assert cached is not None
+    assert cached.response == "the answer"
+    assert cached.prompt_tokens == 10
+    assert await cache.get(request("What is GraphRAG?", model="index-global")) is None
+    assert await cache.get(request("What is GraphRAG?", temperature=0.5)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+async def test_similar_question(clock, versions):
+    embedder = FakeEmbedder({
+        "what is graphrag": [1.0, 0.0],
+        "what's graphrag": [0.99, 0.1],
+        "who wrote it": [0.0, 1.0],
+    })
+    cache = AnswerCache(max_size=10, similarity_threshold=0.95, text_embedder=embedder)  # type: ignore
+    await cache.put(request("what is graphrag"), result())
+
+    cached = await cache.get(request("what's graphrag"))
+    assert cached is not None
+    assert cached.response == "the answer"
+    assert await cache.get(request("who wrote it")) is None
+
+
+async def test_entries_expire(clock, versions):
+    cache = AnswerCache(max_size=10, ttl=60)
+    await cache.put(request("question"), result())
+    clock[0] += 59
+    assert await cache.get(request("question")) is not None
+    clock[0] += 1
+    assert await cache.get(request("question")) is None
+
+
+async def test_entries_are_invalidated_when_the_artifacts_change(clock, versions):
+    cache = AnswerCache(max_size=10)
+    await cache.put(request("question"), result())
+    await cache.put(request("question", model="other-local"), result())
+
+    versions[answercache.get_artifacts_dir("index")] = "2"
+
+    assert await cache.get(request("question")) is None
+    assert await cache.get(request("question", model="other-local")) is not None
+
+
+async def test_least_recently_used_entries_are_evicted(clock, versions):
+    cache = AnswerCache(max_size=2)
+    await cache.put(request("a"), result())
+    await cache.put(request("b"), result())
+    assert await cache.get(request("a")) is not None
+    await cache.put(request("c"), result())
+
+    assert await cache.get(request("b")) is None
+    assert await cache.get(request("a")) is not None
+    assert await cache.get(request("c")) is not None
+
+
+async def test_disabled_by_default(clock, versions):
+    cache = AnswerCache()
+    await cache.put(request("question"), result())
+    assert await cache.get(request("question")) is None
+
+
+@pytest.mark.parametrize(
+    ("answer", "cached"),
+    [
+        (result(), True),
+        (result(""), False),
+        (result(NO_DATA_ANSWER), False),
+        (global_result([map_response(RELEVANT), map_response(IRRELEVANT)]), True),
+        # no relevant key points
+        (global_result([map_response(IRRELEVANT), map_response(IRRELEVANT)]), False),
+        # a map batch failed
+        (
+            global_result([
+                map_response(RELEVANT),
+                map_response(IRRELEVANT, failed=True),
+            ]),
+            False,
+        ),
+        # a map batch was dropped at the deadline
+        (global_result([map_response(RELEVANT)]), False),
+    ],
+)
+async def test_only_complete_answers_are_cached(clock, versions, answer, cached):
+    cache = AnswerCache(max_size=10)
+    await cache.put(request("question", model="index-global"), answer)
+    assert (
+        await cache.get(request("question", model="index-global")) is not None
+    ) == cached
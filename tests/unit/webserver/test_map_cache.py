@@ -0,0 +1,63 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+from types import SimpleNamespace
+from unittest import mock
+
+from webserver.search import globalsearch
+from webserver.search.globalsearch import MapResultCache
+
+
+async def test_map_cache_evicts_least_recently_used():
+    cache = MapResultCache(max_size=2)
+    await cache.set("a", [1])
+    await cache.set("b", [2])
+    assert await cache.get("a") == [1]
+    await cache.set("c", [3])
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == [1]
+    assert await cache.get("c") == [3]
+    assert len(cache) == 2
+
+
+async def test_map_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(globalsearch, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    cache = MapResultCache(ttl=10)
+    await cache.set("a", [1])
+    now[0] += 9
+    assert await cache.get("a") == [1]
+    now[0] += 1
+    assert await cache.get("a") is None
+    assert len(cache) == 0
+
+
+async def test_map_cache_children_share_nothing():
+    cache = MapResultCache()
+    child = cache.child("index:")
+    await child.set("a", [1])
+    assert await cache.get("a") is None
+    await cache.clear()
+    assert await child.get("a") == [1]
+
+
+async def test_registry_clears_map_cache_when_artifacts_change(monkeypatch):
+    from webserver.search import registry
+
+    cache = MapResultCache()
+    monkeypatch.setattr(registry, "map_cache", cache)
+    version = ["1"]
+    monkeypatch.setattr(registry, "get_artifacts_version", lambda _dir: version[0])
+    monkeypatch.setattr(
+        registry, "load_global_context", mock.AsyncMock(return_value=object())
+    )
+
+    context_registry = registry.ContextRegistry()
+    await cache.set("a", [1])
+    await context_registry.get_global_context("index")
+    await context_registry.get_global_context("index")
+    assert await cache.get("a") == [1]
+
+    version[0] = "2"
+    await context_registry.get_global_context("index")
+    assert await cache.get("a") is None
@@ -19,12 +19,35 @@ class Settings(BaseSettings):
     lancedb_uri: str = (
         "./lancedb"
     )
+    embedding_cache_size: int = 10000  # 查询向量缓存条数
+    embedding_cache_dir: str | None = None  # 设置后查询向量也会缓存到该目录
+    embedding_cache_dir_size: int = 100000  # 目录中最多保留的查询向量条数
+    answer_cache_size: int = 0  # 问答缓存条数，0 表示关闭
+    answer_cache_ttl: int = 3600  # 问答缓存有效期（秒）
+    answer_cache_similarity: float | None = None  # 问题向量相似度阈值，为空时只匹配相同问题
+    map_cache_type: str = "none"  # 全局搜索 map 结果缓存：none / memory / file
+    map_cache_dir: str = "./cache/global_map"  # map_cache_type 为 file 时的缓存目录
+    map_cache_size: int = 10000  # map_cache_type 为 memory 时的缓存条数
+    map_cache_ttl: int = 86400  # map_cache_type 为 memory 时的缓存有效期（秒）
+    http_max_connections: int | None = None  # 每个模型接口的连接池大小，为空时使用 global_search.concurrency
+    admission_concurrency: int | None = None  # 全服务同时进行的模型调用数，为空时使用 global_search.concurrency
+    admission_tenant_concurrency: int | None = None  # 每个用户同时进行的模型调用数，为空时不单独限制
+    admission_tenant_header: str | None = None  # 网关认证后写入用户标识的请求头，为空时按客户端地址区分用户
+    admission_max_queue: int = 0  # 排队的模型调用数达到该值时拒绝新请求（429），0 表示不拒绝
+    admission_degrade_queue: int = 0  # 排队的模型调用数达到该值时全局搜索降级，0 表示不降级
+    admission_degraded_map_quorum: float = 0.5  # 降级时全局搜索只等待该比例的 map 批次
     llm: LLMParameters
     embeddings: TextEmbeddingConfig
     global_search: GlobalSearchConfig
     local_search: LocalSearchConfig
     encoding_model: str = "cl100k_base"
 
+    def get_http_max_connections(self) -> int:
+        return self.http_max_connections or self.global_search.concurrency
+
+    def get_admission_concurrency(self) -> int:
+        return self.admission_concurrency or self.global_search.concurrency
+
     def is_azure_client(self):
         return self.llm.type == LLMType.AzureOpenAIChat or settings.llm.type == LLMType.AzureOpenAI
 
@@ -67,4 +90,5 @@ def load_settings_from_yaml(file_path: str) -> Settings:
     )
 
 
-settings = load_settings_from_yaml("settings.yaml")
+# 默认读取工作目录下的 settings.yaml，可通过 GRAPHRAG_SETTINGS_FILE 指定其他路径
+settings = load_settings_from_yaml(os.environ.get("GRAPHRAG_SETTINGS_FILE", "settings.yaml"))
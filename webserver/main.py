@@ -1,14 +1,14 @@
 """Fast API接口."""
 import asyncio
+import json
 import logging
 import os
 import re
 import time
 import uuid
-from collections.abc import Generator
 
 import tiktoken
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
@@ -17,7 +17,9 @@ from openai.types import CompletionUsage
 from openai.types.chat import ChatCompletion, ChatCompletionChunk, ChatCompletionMessage
 from openai.types.chat.chat_completion_chunk import Choice, ChoiceDelta
 
+from graphrag.llm.openai import aclose_http_clients
 from graphrag.query.context_builder.conversation_history import ConversationHistory
+from graphrag.query.llm.cached_embedding import CachedTextEmbedding
 from graphrag.query.llm.oai import ChatOpenAI, OpenAIEmbedding
 from graphrag.query.question_gen.local_gen import LocalQuestionGen
 from graphrag.query.structured_search.base import SearchResult
@@ -25,10 +27,23 @@ from graphrag.query.structured_search.direct.search import Direct
 from graphrag.query.structured_search.global_search.callbacks import (
     GlobalSearchLLMCallback,
 )
-from graphrag.query.structured_search.global_search.search import GlobalSearch
+from graphrag.query.structured_search.global_search.search import (
+    GlobalSearch,
+    GlobalSearchResult,
+)
 from graphrag.query.structured_search.local_search.search import LocalSearch
 from webserver import const, gtypes, search
 from webserver.configs import settings
+from webserver.search import (
+    AdmissionRejected,
+    AdmittedLLM,
+    AdmittedTextEmbedding,
+    admission_controller,
+    answer_cache,
+    create_model_limiter,
+    request_tenant,
+    set_tenant,
+)
 
 app = FastAPI()
 app.add_middleware(
@@ -42,7 +57,12 @@ app.add_middleware(
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-llm = ChatOpenAI(
+STREAM_QUEUE_SIZE = 256
+
+token_encoder = tiktoken.get_encoding("cl100k_base")
+
+# every engine shares these models, so all llm calls of the server go through one admission controller
+llm = AdmittedLLM(ChatOpenAI(
     api_key=settings.llm.api_key,
     api_base=settings.llm.api_base,
     model=settings.llm.model,
@@ -53,9 +73,10 @@ llm = ChatOpenAI(
     api_version=settings.llm.api_version,
     organization=settings.llm.organization,
     request_timeout=settings.llm.request_timeout,
-)
+    max_connections=settings.get_http_max_connections(),
+), admission_controller, create_model_limiter(settings.llm, token_encoder))
 
-text_embedder = OpenAIEmbedding(
+text_embedder = CachedTextEmbedding(AdmittedTextEmbedding(OpenAIEmbedding(
     api_key=settings.embeddings.llm.api_key,
     api_base=settings.embeddings.llm.api_base,
     api_type=settings.get_api_type(),
@@ -68,9 +89,12 @@ text_embedder = OpenAIEmbedding(
     organization=settings.embeddings.llm.organization,
     encoding_name=settings.encoding_model,
     request_timeout=settings.embeddings.llm.request_timeout,
-)
+    max_connections=settings.get_http_max_connections(),
+), admission_controller, create_model_limiter(settings.embeddings.llm, token_encoder)),
+    max_size=settings.embedding_cache_size, cache_dir=settings.embedding_cache_dir,
+    max_disk_size=settings.embedding_cache_dir_size)
 
-token_encoder = tiktoken.get_encoding("cl100k_base")
+answer_cache.text_embedder = text_embedder
 
 local_search: LocalSearch
 global_search: GlobalSearch
@@ -78,42 +102,76 @@ direct: Direct
 question_gen: LocalQuestionGen
 
 
-class CustomSearchCallback(GlobalSearchLLMCallback):
-    stop_sign = "<<STOP>><<停止>>🅿️<<STOP>><<停止>>"
+class StreamCallback(GlobalSearchLLMCallback):
+    """把全局搜索 map 阶段的进度放入流式响应的队列，并记录生成回答的模型用量."""
 
-    def __init__(self):
+    def __init__(self, queue: asyncio.Queue):
         super().__init__()
-        self.token_queue = asyncio.Queue()
+        self.queue = queue
         self.usage: CompletionUsage | None = None
 
-    def on_map_response_start(self, map_response_contexts: list[str]):
-        super().on_map_response_start(map_response_contexts)
-        return map_response_contexts
-
-    def on_map_response_end(self, map_response_outputs: list[SearchResult]):
-        super().on_map_response_end(map_response_outputs)
-        return map_response_outputs
-
-    def on_llm_new_token(self, token: str):
-        """Synchronous method to handle new tokens."""
-        super().on_llm_new_token(token)
-        asyncio.create_task(self.async_on_llm_new_token(token))  # Schedule async method
-
-    def on_llm_stop(self, usage: CompletionUsage):
+    def on_llm_stop(self, usage: CompletionUsage | None):
         super().on_llm_stop(usage)
         self.usage = usage
-        asyncio.create_task(self.async_on_llm_new_token(CustomSearchCallback.stop_sign))  # Schedule async method
 
-    async def async_on_llm_new_token(self, token: str):
-        """Asynchronous version to handle new tokens."""
-        await self.token_queue.put(token)
+    def on_map_response_start(self, map_response_contexts: list[str]):
+        super().on_map_response_start(map_response_contexts)
+        total = 1 if isinstance(map_response_contexts, str) else len(map_response_contexts)
+        self.on_map_response_progress(0, total)
+
+    def on_map_response_progress(self, completed: int, total: int):
+        try:
+            self.queue.put_nowait(("progress", {"completed": completed, "total": total}))
+        except asyncio.QueueFull:
+            # progress events are informational, drop them rather than block the map phase
+            pass
+
+
+class CompletionStream:
+    """一次流式回答的 SSE 数据帧，所有分块共用同一个 id."""
+
+    done = "data: [DONE]\n\n"
+
+    def __init__(self, model: str):
+        self.id = f"chatcmpl-{uuid.uuid4().hex}"
+        self.created = int(time.time())
+        self.model = model
+        # token chunks only differ in their content, so render the rest of the json once
+        head = json.dumps({
+            "id": self.id,
+            "object": "chat.completion.chunk",
+            "created": self.created,
+            "model": model,
+        }, ensure_ascii=False)
+        self._token_prefix = f'data: {head[:-1]}, "choices": [{{"index": 0, "delta": {{"role": "assistant", "content": '
+        self._token_suffix = '}, "finish_reason": null}]}\n\n'
+
+    def token(self, content: str) -> str:
+        return f"{self._token_prefix}{json.dumps(content, ensure_ascii=False)}{self._token_suffix}"
+
+    def final(self, content: str, usage: CompletionUsage | None = None) -> str:
+        chunk = ChatCompletionChunk(
+            id=self.id,
+            created=self.created,
+            model=self.model,
+            object="chat.completion.chunk",
+            choices=[
+                Choice(
+                    index=0,
+                    finish_reason="stop",
+                    delta=ChoiceDelta(
+                        role="assistant",
+                        content=content
+                    )
+                )
+            ],
+            usage=usage
+        )
+        return f"data: {chunk.json()}\n\n"
 
-    async def generate_tokens(self) -> Generator[str, None, None]:
-        while True:
-            token = await self.token_queue.get()
-            yield token
-            if token == CustomSearchCallback.stop_sign:
-                break
+    @staticmethod
+    def event(name: str, data: dict) -> str:
+        return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 
 @app.on_event("startup")
@@ -128,31 +186,46 @@ async def startup_event():
     question_gen = await search.build_local_question_gen(llm, token_encoder=token_encoder)
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # the llm clients share pooled connections per endpoint, close them once
+    await aclose_http_clients()
+
+
 async def generate_ref_links(response: str, model: str) -> str:
     it = re.findall(r"(\[Data:(\w+)\((.+?)\)\])", response)
     if it:
         base_url = f"{settings.website_address}/v1/references"
         lines = [response, "### 参考来源"]
         index_id = model.removesuffix("-global").removesuffix("-local").removesuffix("-direct")
-        input_dir = os.path.join(settings.data, index_id, "artifacts")
+        input_dir = search.get_artifacts_dir(index_id)
+        citations = [
+            (source, key, [id for id in ids.replace(" ", "").split(",") if id.isdigit()])
+            for source, key, ids in it
+        ]
+        # resolve every cited record of the response in one batch
+        try:
+            data = await search.get_many_index_data(
+                input_dir,
+                [(key.lower(), int(id)) for _, key, id_list in citations for id in id_list]
+            )
+        except Exception as e:
+            logger.warning("错误: %s，%s", e, index_id)
+            data = {}
         reference = {}
         cache = []
         i = 1
-        for source, key, ids in it:
+        for source, key, id_list in citations:
             if source not in reference:
                 reference[source] = []
-            id_list = ids.replace(" ", "").split(",")
             for id in id_list:
-                try:
-                    if id.isdigit() and (key, id) not in cache:
-                        cache.append((key, id))
-                        url = f"{base_url}/{index_id}/{key.lower()}/{id}"
-                        data = await search.get_index_data(input_dir, key.lower(), int(id))
-                        reference[source].append(f"<sup>[{i}]({url})</sup>")
-                        lines.append(f"{i}. [{const.KEYS[key]}{id}：{data["title"]}]({url})")
-                        i += 1
-                except Exception as e:
-                    print(f"错误: {e}\n{const.KEYS[key]}：{id}")
+                if (key, id) in cache or (key.lower(), int(id)) not in data:
+                    continue
+                cache.append((key, id))
+                url = f"{base_url}/{index_id}/{key.lower()}/{id}"
+                reference[source].append(f"<sup>[{i}]({url})</sup>")
+                lines.append(f"{i}. [{const.KEYS.get(key, key)}{id}：{data[(key.lower(), int(id))]['title']}]({url})")
+                i += 1
         for key, value in reference.items():
             lines[0] = lines[0].replace(key, "".join(value))
         lines[0] = lines[0].replace("</sup><sup>", "，")
@@ -160,51 +233,79 @@ async def generate_ref_links(response: str, model: str) -> str:
     return response
 
 
-async def generate_chunks(callback, request_model, future: gtypes.TypedFuture[SearchResult]):
-    usage = None
-    while not future.done():
-        async for token in callback.generate_tokens():
-            if token == CustomSearchCallback.stop_sign:
-                usage = callback.usage
-                break
-            chunk = ChatCompletionChunk(
-                id=f"chatcmpl-{uuid.uuid4().hex}",
-                created=int(time.time()),
-                model=request_model,
-                object="chat.completion.chunk",
-                choices=[
-                    Choice(
-                        index=len(callback.response) - 1,
-                        finish_reason=None,
-                        delta=ChoiceDelta(
-                            role="assistant",
-                            content=token
-                        )
-                    )
-                ]
-            )
-            yield chunk.json() + "\n"
+async def stream_search(request, search, conversation_history, cacheable: bool = True):
+    """把 astream_search 的输出转成 SSE 数据帧.
 
-    result: SearchResult = future.result()
-    chunk = ChatCompletionChunk(
-        id=f"chatcmpl-{uuid.uuid4().hex}",
-        created=int(time.time()),
-        model=request_model,
-        object="chat.completion.chunk",
-        choices=[
-            Choice(
-                index=len(callback.response) - 1,
-                finish_reason="stop",
-                delta=ChoiceDelta(
-                    role="assistant",
-                    # content=result.context_data["entities"].head().to_string()
-                    content=await generate_ref_links(result.response, request_model)
-                )
-            ),
-        ],
-        usage=usage
+    搜索在单独的任务中运行，通过有界队列把进度和 token 交给响应，客户端读取慢时搜索会等待；
+    客户端断开时响应被关闭，搜索任务随之取消。
+    """
+    stream = CompletionStream(request.model)
+    queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+    callback = StreamCallback(queue)
+    search = search.scoped(callbacks=[callback])
+    task = asyncio.create_task(
+        _produce_stream(search, request.messages[-1].content, conversation_history, queue)
+    )
+    tokens = []
+    try:
+        while True:
+            kind, value = await queue.get()
+            if kind == "token":
+                tokens.append(value)
+                yield stream.token(value)
+            elif kind == "progress":
+                yield stream.event("map_progress", value)
+            elif kind == "error":
+                yield stream.event("error", {"message": str(value)})
+                yield stream.done
+                return
+            else:
+                break
+        response = "".join(tokens)
+        if cacheable:
+            await answer_cache.put(request, stream_result(search, callback, response))
+        yield stream.final(await generate_ref_links(response, request.model), usage=callback.usage)
+        yield stream.done
+    finally:
+        # the response is closed early when the client disconnects, stop the search and its pending llm calls
+        if not task.done():
+            logger.info("client disconnected, cancelling the search")
+            task.cancel()
+
+
+def stream_result(search, callback: StreamCallback, response: str) -> SearchResult:
+    """流式回答的搜索结果，全局搜索带上 map 阶段的结果，以便问答缓存判断回答是否完整."""
+    prompt_tokens = callback.usage.prompt_tokens if callback.usage else 0
+    if isinstance(search, GlobalSearch):
+        return GlobalSearchResult(
+            response=response, context_data={}, context_text=callback.map_response_contexts,
+            map_responses=callback.map_response_outputs, reduce_context_data="", reduce_context_text="",
+            completion_time=0, llm_calls=0, prompt_tokens=prompt_tokens
+        )
+    return SearchResult(
+        response=response, context_data={}, context_text="", completion_time=0, llm_calls=0,
+        prompt_tokens=prompt_tokens
     )
-    yield chunk.json()
+
+
+async def _produce_stream(search, query: str, conversation_history, queue: asyncio.Queue):
+    try:
+        async for item in search.astream_search(query, conversation_history):
+            # the first item is the context records, the rest are response tokens
+            if isinstance(item, str) and item:
+                await queue.put(("token", item))
+    except Exception as e:
+        logger.exception("流式搜索失败")
+        await queue.put(("error", e))
+    await queue.put(("done", None))
+
+
+async def replay_chunks(request_model, result: SearchResult):
+    """以流式格式返回缓存的回答."""
+    stream = CompletionStream(request_model)
+    yield stream.token(result.response)
+    yield stream.final(await generate_ref_links(result.response, request_model), usage=result_usage(result))
+    yield stream.done
 
 
 async def initialize_search(
@@ -213,15 +314,48 @@ async def initialize_search(
     context: str = None,
     community_level: int = 2
 ) -> LocalSearch | GlobalSearch:
-    search.context_builder = await switch_context(context, community_level)
-    if request.response_type:
-        search.response_type = request.response_type
-    search.llm_params.update(request.llm_chat_params())
-    return search
+    # the engines are shared by all requests, so per-request settings go into a scoped view
+    return search.scoped(
+        context_builder=await switch_context(context, community_level),
+        llm_params=request.llm_chat_params(),
+        response_type=request.response_type,
+    )
+
+
+async def run_until_disconnected(http_request: Request, coro):
+    """Run a search, cancelling it when the client disconnects before it is done."""
+    task = asyncio.create_task(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=1)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                logger.info("client disconnected, cancelling the search")
+                raise HTTPException(status_code=499, detail="client disconnected")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def handle_sync_response(
+    request, search, conversation_history, http_request: Request, cacheable: bool = True
+):
+    result = await run_until_disconnected(
+        http_request,
+        search.asearch(request.messages[-1].content, conversation_history=conversation_history)
+    )
+    if cacheable:
+        await answer_cache.put(request, result)
+    return await make_completion_response(request, result)
+
 
+def result_usage(result: SearchResult) -> CompletionUsage:
+    """搜索结果只记录了提示词的 token 数."""
+    return CompletionUsage(completion_tokens=-1, prompt_tokens=result.prompt_tokens, total_tokens=-1)
 
-async def handle_sync_response(request, search, conversation_history):
-    result = await search.asearch(request.messages[-1].content, conversation_history=conversation_history)
+
+async def make_completion_response(request, result: SearchResult):
     from openai.types.chat.chat_completion import Choice
     completion = ChatCompletion(
         id=f"chatcmpl-{uuid.uuid4().hex}",
@@ -238,34 +372,24 @@ async def handle_sync_response(request, search, conversation_history):
                 )
             )
         ],
-        usage=CompletionUsage(
-            completion_tokens=-1,
-            prompt_tokens=result.prompt_tokens,
-            total_tokens=-1
-        )
+        usage=result_usage(result)
     )
     return JSONResponse(content=jsonable_encoder(completion))
 
 
-async def handle_stream_response(request, search, conversation_history):
-    callback = CustomSearchCallback()
-    future = gtypes.TypedFuture[SearchResult]()
-
-    async def run_search():
-        result = await search.asearch(request.messages[-1].content, conversation_history)
-        future.set_result(result)
-
-    search.callbacks = [callback]
-    asyncio.create_task(run_search())
-    return StreamingResponse(generate_chunks(callback, request.model, future), media_type="text/event-stream")
+async def handle_stream_response(request, search, conversation_history, cacheable: bool = True):
+    return StreamingResponse(
+        stream_search(request, search, conversation_history, cacheable), media_type="text/event-stream"
+    )
 
 
 @app.post("/v1/chat/completions")
-async def chat_completions(request: gtypes.ChatCompletionRequest):
+async def chat_completions(request: gtypes.ChatCompletionRequest, http_request: Request):
     if not local_search or not global_search or not direct:
         logger.error("graphrag search engines is not initialized")
         raise HTTPException(status_code=500, detail="graphrag search engines is not initialized")
 
+    set_tenant(request_tenant(http_request))
     try:
         conversation_history = None
         if len(request.messages) > 1:
@@ -277,26 +401,53 @@ async def chat_completions(request: gtypes.ChatCompletionRequest):
         elif request.model.endswith("global"):
             search = await initialize_search(request, global_search, request.model, request.community_level)
         else:
-            direct.llm_params.update(request.llm_chat_params())
-            search = direct
+            search = direct.scoped(llm_params=request.llm_chat_params())
+
+        cached = await answer_cache.get(request)
+        if cached is not None:
+            logger.info("命中问答缓存: %s", request.model)
+            if not request.stream:
+                return await make_completion_response(request, cached)
+            return StreamingResponse(replay_chunks(request.model, cached), media_type="text/event-stream")
+
+        admission_controller.check()
+        degraded = False
+        if isinstance(search, GlobalSearch) and admission_controller.saturated:
+            # only wait for the fastest map batches while the llm queue is long
+            logger.info("模型调用排队过多，全局搜索降级")
+            search = search.scoped(map_quorum=min(search.map_quorum, settings.admission_degraded_map_quorum))
+            # the degraded answer skips the slowest map batches, don't replay it after the load spike
+            degraded = True
 
         if not request.stream:
-            return await handle_sync_response(request, search, conversation_history)
+            return await handle_sync_response(
+                request, search, conversation_history, http_request, cacheable=not degraded
+            )
         else:
-            return await handle_stream_response(request, search, conversation_history)
+            return await handle_stream_response(request, search, conversation_history, cacheable=not degraded)
+    except HTTPException:
+        raise
+    except AdmissionRejected as e:
+        logger.warning("拒绝请求: %s", e)
+        raise HTTPException(status_code=429, detail="server is busy, please retry later", headers={"Retry-After": "5"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/v1/advice_questions", response_model=gtypes.QuestionGenResult)
-async def get_advice_question(request: gtypes.ChatQuestionGen):
+async def get_advice_question(request: gtypes.ChatQuestionGen, http_request: Request):
+    set_tenant(request_tenant(http_request))
+    try:
+        admission_controller.check()
+    except AdmissionRejected:
+        raise HTTPException(status_code=429, detail="server is busy, please retry later", headers={"Retry-After": "5"})
     if request.model.endswith("local"):
         local_context = await switch_context(request.model, request.community_level)
-        question_gen.context_builder = local_context
+        generator = question_gen.scoped(context_builder=local_context)
     else:
         raise NotImplementedError(f"model {request.model} is not supported")
     question_history = [message.content for message in request.messages if message.role == "user"]
-    candidate_questions = await question_gen.agenerate(
+    candidate_questions = await generator.agenerate(
         question_history=question_history, context_data=None, question_count=5
     )
     # the original generated question is "- what about xxx?"
@@ -308,15 +459,27 @@ async def get_advice_question(request: gtypes.ChatQuestionGen):
     return resp
 
 
+@app.get("/v1/stats")
+async def get_stats():
+    return {
+        "admission": admission_controller.stats(),
+        "embedding_cache": text_embedder.stats(),
+        "answer_cache": {"hits": answer_cache.hits, "misses": answer_cache.misses},
+    }
+
+
 @app.get("/v1/references/{index_id}/{datatype}/{idx}", response_class=HTMLResponse)
 async def get_reference(index_id: str, datatype: str, idx: int):
     input_dir = os.path.join(settings.data, index_id, "artifacts")
     if not os.path.exists(input_dir):
         raise HTTPException(status_code=404, detail=f"{index_id} not found")
-    if datatype not in ["documents", "entities", "claims", "sources", "reports", "relationships"]:
+    if datatype not in search.DATATYPES:
         raise HTTPException(status_code=404, detail=f"{datatype} not found")
 
-    data = await search.get_index_data(input_dir, datatype, idx)
+    try:
+        data = await search.get_index_data(input_dir, datatype, idx)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     html_file_path = os.path.join("webserver", "templates", f"{datatype}_template.html")
     with open(html_file_path, encoding="utf-8") as file:
         html_content = file.read()
@@ -327,11 +490,13 @@ async def get_reference(index_id: str, datatype: str, idx: int):
 
 async def switch_context(model: str, community_level: int = 2):
     if model.endswith("global"):
-        input_dir = os.path.join(settings.data, model.removesuffix("-global"), "artifacts")
-        context_builder = await search.load_global_context(input_dir, token_encoder, community_level)
+        context_builder = await search.context_registry.get_global_context(
+            model.removesuffix("-global"), token_encoder, community_level
+        )
     elif model.endswith("local"):
-        input_dir = os.path.join(settings.data, model.removesuffix("-local"), "artifacts")
-        context_builder = await search.load_local_context(input_dir, text_embedder, token_encoder, community_level)
+        context_builder = await search.context_registry.get_local_context(
+            model.removesuffix("-local"), text_embedder, token_encoder, community_level
+        )
     else:
         raise NotImplementedError(f"model {model} is not supported")
     return context_builder
@@ -1,8 +1,43 @@
+from .admission import (
+    AdmissionRejected,
+    AdmittedLLM,
+    AdmittedTextEmbedding,
+    admission_controller,
+    create_model_limiter,
+    request_tenant,
+    set_tenant,
+)
+from .answercache import answer_cache
 from .direct import build_direct_engine
 from .globalsearch import build_global_search_engine, load_global_context
-from .indexdata import get_index_data
+from .indexdata import DATATYPES, get_index_data, get_many_index_data, load_index_data
 from .localsearch import (
     build_local_question_gen,
     build_local_search_engine,
     load_local_context,
 )
+from .registry import context_registry, get_artifacts_dir, get_artifacts_version
+
+__all__ = [
+    "DATATYPES",
+    "AdmissionRejected",
+    "AdmittedLLM",
+    "AdmittedTextEmbedding",
+    "admission_controller",
+    "answer_cache",
+    "build_direct_engine",
+    "build_global_search_engine",
+    "build_local_question_gen",
+    "build_local_search_engine",
+    "context_registry",
+    "create_model_limiter",
+    "get_artifacts_dir",
+    "get_artifacts_version",
+    "get_index_data",
+    "get_many_index_data",
+    "load_global_context",
+    "load_index_data",
+    "load_local_context",
+    "request_tenant",
+    "set_tenant",
+]
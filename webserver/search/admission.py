@@ -0,0 +1,284 @@
+"""模型调用准入控制."""
+import asyncio
+import logging
+from collections import Counter, OrderedDict, deque
+from collections.abc import AsyncGenerator, Generator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from fastapi import Request
+
+from graphrag.config import LLMParameters
+from graphrag.llm.limiting import LLMLimiter, create_tpm_rpm_limiters
+from graphrag.query.llm.base import BaseLLM, BaseLLMCallback, BaseTextEmbedding
+from webserver.configs import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT = "default"
+
+# 当前请求所属的用户，搜索中创建的任务会继承它
+current_tenant: ContextVar[str] = ContextVar("current_tenant", default=DEFAULT_TENANT)
+
+
+class AdmissionRejected(Exception):
+    """排队的模型调用过多，拒绝新请求."""
+
+
+class AdmissionController:
+    """全服务共享的模型调用准入控制.
+
+    同时进行的调用数不超过 max_concurrency，每个用户不超过 tenant_concurrency；
+    排队的调用按用户轮流放行，一个用户的大量调用（如全局搜索的 map 阶段）不会饿死其他用户。
+    放行后再经过调用方模型的 TPM/RPM 限流。
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        tenant_concurrency: int | None = None,
+        max_queue: int = 0,
+        degrade_queue: int = 0,
+    ):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be positive, got {max_concurrency}")
+        self.max_concurrency = max_concurrency
+        self.tenant_concurrency = tenant_concurrency or max_concurrency
+        self.max_queue = max_queue
+        self.degrade_queue = degrade_queue
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._active_by_tenant: Counter[str] = Counter()
+        self._waiters: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    @property
+    def saturated(self) -> bool:
+        """排队的调用数达到降级阈值."""
+        return 0 < self.degrade_queue <= self.queue_depth
+
+    def check(self):
+        """请求开始前检查，排队的调用数达到上限时抛出 AdmissionRejected."""
+        if 0 < self.max_queue <= self.queue_depth:
+            self.rejected += 1
+            raise AdmissionRejected(f"{self.queue_depth} llm calls are queued")
+
+    @asynccontextmanager
+    async def slot(self, limiter: "ModelLimiter | None" = None, num_tokens: int = 0):
+        """占用一个调用名额，退出时归还."""
+        tenant = current_tenant.get()
+        await self._acquire(tenant)
+        try:
+            if limiter is not None:
+                await limiter.acquire(num_tokens)
+            yield
+        finally:
+            self._release(tenant)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "queued_tenants": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait": self.total_wait / self.admitted if self.admitted else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+    async def _acquire(self, tenant: str):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        future = loop.create_future()
+        self._waiters.setdefault(tenant, deque()).append(future)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # admitted just before being cancelled, give the slot back
+                self._release(tenant)
+            else:
+                self._discard(tenant, future)
+            raise
+        wait = loop.time() - start
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def _dispatch(self):
+        while self.active < self.max_concurrency:
+            tenant = next(
+                (t for t in self._waiters if self._active_by_tenant[t] < self.tenant_concurrency), None
+            )
+            if tenant is None:
+                return
+            waiters = self._waiters[tenant]
+            future = waiters.popleft()
+            if waiters:
+                # round robin: the tenant goes to the back of the line
+                self._waiters.move_to_end(tenant)
+            else:
+                del self._waiters[tenant]
+            if future.done():
+                continue
+            self.active += 1
+            self.admitted += 1
+            self._active_by_tenant[tenant] += 1
+            future.set_result(None)
+
+    def _release(self, tenant: str):
+        self.active -= 1
+        self._active_by_tenant[tenant] -= 1
+        if self._active_by_tenant[tenant] <= 0:
+            del self._active_by_tenant[tenant]
+        self._dispatch()
+
+    def _discard(self, tenant: str, future: asyncio.Future):
+        waiters = self._waiters.get(tenant)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(future)
+        except ValueError:
+            return
+        if not waiters:
+            del self._waiters[tenant]
+
+
+class ModelLimiter:
+    """一个模型的 TPM/RPM 限流."""
+
+    def __init__(self, limiter: LLMLimiter, tokens_per_minute: int = 0, token_encoder=None):
+        self.limiter = limiter
+        self.tokens_per_minute = tokens_per_minute
+        self.token_encoder = token_encoder
+
+    async def acquire(self, num_tokens: int):
+        if self.tokens_per_minute:
+            # aiolimiter rejects acquiring more than the whole bucket
+            num_tokens = min(num_tokens, self.tokens_per_minute)
+        await self.limiter.acquire(max(num_tokens, 1))
+
+    def count_tokens(self, messages: str | list[Any]) -> int:
+        if self.token_encoder is None or not self.limiter.needs_token_count:
+            return 0
+        if isinstance(messages, str):
+            return len(self.token_encoder.encode(messages))
+        return sum(len(self.token_encoder.encode(message.get("content") or "")) for message in messages)
+
+
+class AdmittedLLM(BaseLLM):
+    """经过准入控制的对话模型，其余属性转发给原模型."""
+
+    def __init__(self, llm: BaseLLM, controller: AdmissionController, limiter: ModelLimiter | None = None):
+        self.llm = llm
+        self.controller = controller
+        self.limiter = limiter
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    def generate(
+        self,
+        messages: str | list[Any],
+        streaming: bool = True,
+        callbacks: list[BaseLLMCallback] | None = None,
+        **kwargs: Any,
+    ) -> str:
+        return self.llm.generate(messages, streaming=streaming, callbacks=callbacks, **kwargs)
+
+    def stream_generate(
+        self,
+        messages: str | list[Any],
+        callbacks: list[BaseLLMCallback] | None = None,
+        **kwargs: Any,
+    ) -> Generator[str, None, None]:
+        return self.llm.stream_generate(messages, callbacks=callbacks, **kwargs)
+
+    async def agenerate(
+        self,
+        messages: str | list[Any],
+        streaming: bool = True,
+        callbacks: list[BaseLLMCallback] | None = None,
+        **kwargs: Any,
+    ) -> str:
+        async with self.controller.slot(self.limiter, self._count_tokens(messages)):
+            return await self.llm.agenerate(messages, streaming=streaming, callbacks=callbacks, **kwargs)
+
+    async def astream_generate(
+        self,
+        messages: str | list[Any],
+        callbacks: list[BaseLLMCallback] | None = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[str, None]:
+        async with self.controller.slot(self.limiter, self._count_tokens(messages)):
+            async for token in self.llm.astream_generate(messages, callbacks=callbacks, **kwargs):
+                yield token
+
+    def _count_tokens(self, messages: str | list[Any]) -> int:
+        return self.limiter.count_tokens(messages) if self.limiter else 0
+
+
+class AdmittedTextEmbedding(BaseTextEmbedding):
+    """经过准入控制的向量模型，其余属性转发给原模型."""
+
+    def __init__(
+        self, text_embedder: BaseTextEmbedding, controller: AdmissionController, limiter: ModelLimiter | None = None
+    ):
+        self.text_embedder = text_embedder
+        self.controller = controller
+        self.limiter = limiter
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "text_embedder":
+            raise AttributeError(name)
+        return getattr(self.text_embedder, name)
+
+    def embed(self, text: str, **kwargs: Any) -> list[float]:
+        return self.text_embedder.embed(text, **kwargs)
+
+    async def aembed(self, text: str, **kwargs: Any) -> list[float]:
+        num_tokens = self.limiter.count_tokens(text) if self.limiter else 0
+        async with self.controller.slot(self.limiter, num_tokens):
+            return await self.text_embedder.aembed(text, **kwargs)
+
+
+def set_tenant(tenant: str | None):
+    """设置当前请求所属的用户."""
+    current_tenant.set(tenant or DEFAULT_TENANT)
+
+
+def request_tenant(http_request: Request) -> str | None:
+    """请求所属的用户：网关认证后写入 admission_tenant_header 请求头的用户，没有时为客户端地址.
+
+    不使用请求体中客户端自己填写的 user，否则客户端换个 user 就能占用更多名额.
+    """
+    if settings.admission_tenant_header:
+        tenant = http_request.headers.get(settings.admission_tenant_header)
+        if tenant:
+            return tenant
+    return http_request.client.host if http_request.client else None
+
+
+def create_model_limiter(config: LLMParameters, token_encoder=None) -> ModelLimiter | None:
+    """按模型配置的 tokens_per_minute / requests_per_minute 创建限流，都为 0 时不限流."""
+    if not config.tokens_per_minute and not config.requests_per_minute:
+        return None
+    return ModelLimiter(create_tpm_rpm_limiters(config), config.tokens_per_minute, token_encoder)
+
+
+admission_controller = AdmissionController(
+    max_concurrency=settings.get_admission_concurrency(),
+    tenant_concurrency=settings.admission_tenant_concurrency,
+    max_queue=settings.admission_max_queue,
+    degrade_queue=settings.admission_degrade_queue,
+)
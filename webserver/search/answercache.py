@@ -0,0 +1,192 @@
+"""问答缓存."""
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from graphrag.query.llm.base import BaseTextEmbedding
+from graphrag.query.structured_search.base import SearchResult
+from graphrag.query.structured_search.global_search.reduce_system_prompt import NO_DATA_ANSWER
+from graphrag.query.structured_search.global_search.search import (
+    FailedMapResult,
+    GlobalSearchResult,
+)
+from webserver import gtypes
+from webserver.configs import settings
+
+from .registry import get_artifacts_dir, get_artifacts_version
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_SEARCH_MODES = ("-local", "-global")
+
+
+@dataclass
+class _CachedAnswer:
+    scope: tuple
+    question: str
+    version: str
+    created: float
+    response: str
+    prompt_tokens: int
+    embedding: np.ndarray | None = None
+
+
+class AnswerCache:
+    """Cache of final search answers for deterministic requests.
+
+    Only local/global requests with temperature 0 are cached. An answer is reused when the scope
+    (model, community level, response type, seed and conversation history) matches and either the
+    normalized question is identical or, if similarity_threshold is set, the cosine similarity of the
+    question embeddings reaches the threshold. Entries expire after ttl seconds and are ignored as soon
+    as the index artifacts change. Answers that may come from a transient failure (an empty or no-data
+    answer, a failed map batch or map batches dropped at the deadline) are not cached.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 0,
+        ttl: float = 3600,
+        similarity_threshold: float | None = None,
+        text_embedder: BaseTextEmbedding | None = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.text_embedder = text_embedder
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, _CachedAnswer] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    async def get(self, request: gtypes.ChatCompletionRequest) -> SearchResult | None:
+        """Return the cached answer of the request, or None."""
+        scope = self._scope(request)
+        if scope is None:
+            return None
+        version = _index_version(request.model)
+        question = _normalize(request.messages[-1].content)
+        entry = self._entries.get((scope, question))
+        if entry is not None and not self._is_valid(entry, version):
+            del self._entries[(scope, question)]
+            entry = None
+        if entry is None and self.similarity_threshold is not None and self.text_embedder:
+            entry = await self._get_similar(scope, question, version)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end((entry.scope, entry.question))
+        return SearchResult(
+            response=entry.response,
+            context_data={},
+            context_text="",
+            completion_time=0,
+            llm_calls=0,
+            prompt_tokens=entry.prompt_tokens,
+        )
+
+    async def put(self, request: gtypes.ChatCompletionRequest, result: SearchResult):
+        """Cache the answer of the request."""
+        scope = self._scope(request)
+        if scope is None or not is_complete_answer(result):
+            return
+        question = _normalize(request.messages[-1].content)
+        embedding = None
+        if self.similarity_threshold is not None and self.text_embedder:
+            embedding = await self._embed(question)
+        self._entries[(scope, question)] = _CachedAnswer(
+            scope=scope,
+            question=question,
+            version=_index_version(request.model),
+            created=time.time(),
+            response=result.response,
+            prompt_tokens=result.prompt_tokens,
+            embedding=embedding,
+        )
+        self._entries.move_to_end((scope, question))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def _scope(self, request: gtypes.ChatCompletionRequest) -> tuple | None:
+        if not self.enabled or request.temperature != 0 or not request.model.endswith(_SEARCH_MODES):
+            return None
+        history = tuple((message.role, message.content) for message in request.messages[:-1])
+        return request.model, request.community_level, request.response_type, request.seed, history
+
+    def _is_valid(self, entry: _CachedAnswer, version: str) -> bool:
+        return entry.version == version and time.time() - entry.created < self.ttl
+
+    async def _get_similar(self, scope: tuple, question: str, version: str) -> _CachedAnswer | None:
+        candidates = [
+            entry for entry in self._entries.values()
+            if entry.scope == scope and entry.embedding is not None and self._is_valid(entry, version)
+        ]
+        if not candidates:
+            return None
+        embedding = await self._embed(question)
+        if embedding is None:
+            return None
+        similarities = np.stack([entry.embedding for entry in candidates]) @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        return candidates[best]
+
+    async def _embed(self, question: str) -> np.ndarray | None:
+        try:
+            embedding = np.asarray(await self.text_embedder.aembed(question), dtype=float)
+        except Exception as e:
+            logger.warning("问题向量化失败: %s", e)
+            return None
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else None
+
+
+def is_complete_answer(result: SearchResult) -> bool:
+    """Check that an answer was built from the whole context, without failed or dropped llm calls."""
+    if not isinstance(result.response, str) or not result.response or result.response == NO_DATA_ANSWER:
+        return False
+    if isinstance(result, GlobalSearchResult):
+        batches = result.context_text if isinstance(result.context_text, list) else [result.context_text]
+        if len(result.map_responses) < len(batches):
+            return False
+        if any(isinstance(response, FailedMapResult) for response in result.map_responses):
+            return False
+        if not any(
+            isinstance(point, dict) and point.get("score", 0) > 0
+            for response in result.map_responses
+            if isinstance(response.response, list)
+            for point in response.response
+        ):
+            return False
+    return True
+
+
+def _normalize(question: str) -> str:
+    return _WHITESPACE.sub(" ", question).strip()
+
+
+def _index_version(model: str) -> str:
+    index_id = model
+    for suffix in _SEARCH_MODES:
+        index_id = index_id.removesuffix(suffix)
+    return get_artifacts_version(get_artifacts_dir(index_id))
+
+
+answer_cache = AnswerCache(
+    max_size=settings.answer_cache_size,
+    ttl=settings.answer_cache_ttl,
+    similarity_threshold=settings.answer_cache_similarity,
+)
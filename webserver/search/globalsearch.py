@@ -1,6 +1,13 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
 import pandas as pd
 import tiktoken
 
+from graphrag.config.enums import CacheType
+from graphrag.index.cache import PipelineCache, load_cache
+from graphrag.index.config.cache import PipelineFileCacheConfig
 from graphrag.query.context_builder.builders import GlobalContextBuilder
 from graphrag.query.indexer_adapters import read_indexer_entities, read_indexer_reports
 from graphrag.query.llm.base import BaseLLM
@@ -15,6 +22,88 @@ from webserver import const
 from webserver.configs import settings
 
 
+def global_context_builder_params() -> dict:
+    return {
+        "use_community_summary": False,
+        "shuffle_data": True,
+        "include_community_rank": True,
+        "min_community_rank": 0,
+        "community_rank_name": "rank",
+        "include_community_weight": True,
+        "community_weight_name": "occurrence weight",
+        "normalize_community_weight": True,
+        "max_tokens": settings.global_search.max_tokens,
+        "context_name": "Reports",
+    }
+
+
+class MapResultCache(PipelineCache):
+    """内存中的 map 结果缓存，按最近使用淘汰，条目在 ttl 秒后过期.
+
+    缓存键包含 map 批次的报告内容，索引更新后旧条目不会再命中；注册表重新加载全局上下文时会清空缓存，
+    及时释放这些条目.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 86400, name: str = ""):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._name = name
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Any:
+        key = f"{self._name}{key}"
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created, value = entry
+        if time.monotonic() - created >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, debug_data: dict | None = None) -> None:
+        if self.max_size <= 0:
+            return
+        key = f"{self._name}{key}"
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def has(self, key: str) -> bool:
+        return await self.get(key) is not None
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(f"{self._name}{key}", None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def child(self, name: str) -> PipelineCache:
+        return MapResultCache(self.max_size, self.ttl, name)
+
+
+def load_map_cache() -> PipelineCache | None:
+    """按配置创建 map 结果缓存."""
+    match CacheType(settings.map_cache_type):
+        case CacheType.none:
+            return None
+        case CacheType.memory:
+            return MapResultCache(max_size=settings.map_cache_size, ttl=settings.map_cache_ttl)
+        case CacheType.file:
+            return load_cache(PipelineFileCacheConfig(base_dir=settings.map_cache_dir), ".")
+        case _:
+            raise ValueError(f"Unsupported map cache type: {settings.map_cache_type}")
+
+
+# shared by every global search engine, so the registry can clear it when an index changes
+map_cache = load_map_cache()
+
+
 async def load_global_context(
     input_dir: str,
     token_encoder: tiktoken.Encoding | None = None,
@@ -24,31 +113,22 @@ async def load_global_context(
     final_community_reports = pd.read_parquet(f"{input_dir}/{const.COMMUNITY_REPORT_TABLE}.parquet")
     final_entities = pd.read_parquet(f"{input_dir}/{const.ENTITY_EMBEDDING_TABLE}.parquet")
 
-    reports = read_indexer_reports(final_community_reports, final_nodes, community_level)
-    entities = read_indexer_entities(final_nodes, final_entities, community_level)
+    reports = read_indexer_reports(final_community_reports, final_nodes, community_level, columnar=True)
+    entities = read_indexer_entities(final_nodes, final_entities, community_level, columnar=True)
 
     context_builder = GlobalCommunityContext(
         community_reports=reports,
         entities=entities,  # default to None if you don't want to use community weights for ranking
         token_encoder=token_encoder,
     )
+    # render the report rows for the engine's options now instead of on the first query
+    context_builder.prepare(**global_context_builder_params())
     return context_builder
 
 
 async def build_global_search_engine(llm: BaseLLM, context_builder=None, callback: GlobalSearchLLMCallback = None,
                                      token_encoder: tiktoken.Encoding | None = None) -> GlobalSearch:
-    context_builder_params = {
-        "use_community_summary": False,
-        "shuffle_data": True,
-        "include_community_rank": True,
-        "min_community_rank": 0,
-        "community_rank_name": "rank",
-        "include_community_weight": True,
-        "community_weight_name": "occurrence weight",
-        "normalize_community_weight": True,
-        "max_tokens": settings.global_search.max_tokens,
-        "context_name": "Reports",
-    }
+    context_builder_params = global_context_builder_params()
 
     map_llm_params = {
         "max_tokens": settings.global_search.map_max_tokens,
@@ -76,6 +156,10 @@ async def build_global_search_engine(llm: BaseLLM, context_builder=None, callbac
         json_mode=settings.llm.model_supports_json,  # set this to False if your LLM model does not support JSON mode.
         context_builder_params=context_builder_params,
         concurrent_coroutines=settings.global_search.concurrency,
+        map_deadline=settings.global_search.map_deadline,
+        map_quorum=settings.global_search.map_quorum,
+        map_min_score=settings.global_search.map_min_score,
+        map_cache=map_cache,
         callbacks=[callback] if callback else None,
         # free form text describing the response type and format, can be anything,
         # e.g. prioritized list, single paragraph, multiple paragraphs, multiple-page report
@@ -1,244 +1,271 @@
 """索引."""
+import logging
 import os
-from typing import Optional, cast
+from collections.abc import Iterable
+from typing import Any
 
 import pandas as pd
 
 from webserver import const
 
+from .registry import get_artifacts_version
+
 pd.set_option("display.max_columns", None)
 
+logger = logging.getLogger(__name__)
+
+DATATYPES = ["documents", "entities", "claims", "sources", "reports", "relationships"]
+
+
+def _key(value: Any) -> str | None:
+    """Normalize an id read from parquet into a lookup key, so that 3, 3.0 and "3" all match."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _build_index(series: pd.Series) -> dict[str, int]:
+    """Map each key of a column to the position of its first row."""
+    index: dict[str, int] = {}
+    for position, value in enumerate(series.tolist()):
+        key = _key(value)
+        if key is not None:
+            index.setdefault(key, position)
+    return index
+
+
+def _as_list(value: Any) -> list:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return []
+    return list(value)
+
+
+class IndexData:
+    """某个索引的参考数据.
+
+    The artifact tables are read once and hash indexes are built on `id`, `human_readable_id`,
+    entity name and community id, so that every lookup is O(1) instead of a scan over a table.
+    Lookups return new dicts and never modify the cached tables.
+    """
+
+    def __init__(self, input_dir: str):
+        self.input_dir = input_dir
+        self.documents = pd.read_parquet(f"{input_dir}/{const.DOCUMENT_TABLE}.parquet")
+        self.nodes = pd.read_parquet(f"{input_dir}/{const.ENTITY_TABLE}.parquet")
+        self.text_units = pd.read_parquet(f"{input_dir}/{const.TEXT_UNIT_TABLE}.parquet")
+        self.entities = pd.read_parquet(f"{input_dir}/{const.ENTITY_EMBEDDING_TABLE}.parquet")
+        self.relationships = pd.read_parquet(f"{input_dir}/{const.RELATIONSHIP_TABLE}.parquet")
+        self.communities = pd.read_parquet(f"{input_dir}/{const.COMMUNITY_TABLE}.parquet")
+        self.reports = pd.read_parquet(f"{input_dir}/{const.COMMUNITY_REPORT_TABLE}.parquet")
+        covariate_file = f"{input_dir}/{const.COVARIATE_TABLE}.parquet"
+        self.covariates = pd.read_parquet(covariate_file) if os.path.exists(covariate_file) else None
+
+        self._document_by_id = _build_index(self.documents["id"])
+        self._text_unit_by_id = _build_index(self.text_units["id"])
+        self._entity_by_id = _build_index(self.entities["id"])
+        self._entity_by_hrid = _build_index(self.entities["human_readable_id"])
+        self._entity_by_name = _build_index(self.entities["name"])
+        self._relationship_by_id = _build_index(self.relationships["id"])
+        self._relationship_by_hrid = _build_index(self.relationships["human_readable_id"])
+        self._community_by_id = _build_index(self.communities["id"])
+        self._report_by_community = _build_index(self.reports["community"])
+        self._claim_by_hrid = (
+            _build_index(self.covariates["human_readable_id"]) if self.covariates is not None else {}
+        )
+        self._nodes_by_title: dict[str, list[int]] = {}
+        for position, title in enumerate(self.nodes["title"].tolist()):
+            self._nodes_by_title.setdefault(title, []).append(position)
+
+    def get(self, datatype: str, idx: int) -> dict[str, Any]:
+        """Get one record of the given type by the id used in the references."""
+        if datatype == "documents":
+            return self.get_doc(idx)
+        elif datatype == "entities":
+            return self.get_entity(idx)
+        elif datatype == "claims":
+            return self.get_claim(idx)
+        elif datatype == "sources":
+            return self.get_source(idx)
+        elif datatype == "reports":
+            return self.get_report(idx)
+        elif datatype == "relationships":
+            return self.get_relationship(idx)
+        else:
+            raise ValueError(f"Unknown datatype: {datatype}")
+
+    def get_many(self, keys: Iterable[tuple[str, int]]) -> dict[tuple[str, int], dict[str, Any]]:
+        """Resolve a batch of (datatype, id) references at once, skipping the ones that are not found."""
+        result = {}
+        for datatype, idx in keys:
+            if (datatype, idx) in result:
+                continue
+            try:
+                result[(datatype, idx)] = self.get(datatype, idx)
+            except (ValueError, IndexError) as e:
+                logger.warning("错误: %s，%s：%s", e, datatype, idx)
+        return result
+
+    def get_doc(self, idx: int) -> dict[str, Any]:
+        if not 0 <= idx < len(self.documents):
+            raise ValueError(f"Not Found document id {idx}")
+        document = self.documents.iloc[idx].to_dict()
+        document["title"] = document["title"].removesuffix(".txt")
+        return document
 
-async def get_index_data(input_dir: str, datatype: str, idx: int) -> pd.Series:
-    document_df = pd.read_parquet(f"{input_dir}/{const.DOCUMENT_TABLE}.parquet")
-    entity_df = pd.read_parquet(f"{input_dir}/{const.ENTITY_TABLE}.parquet")
-    text_unit_df = pd.read_parquet(f"{input_dir}/{const.TEXT_UNIT_TABLE}.parquet")
-    entity_embedding_df = pd.read_parquet(f"{input_dir}/{const.ENTITY_EMBEDDING_TABLE}.parquet")
-    relationship_df = pd.read_parquet(f"{input_dir}/{const.RELATIONSHIP_TABLE}.parquet")
-    community_df = pd.read_parquet(f"{input_dir}/{const.COMMUNITY_TABLE}.parquet")
-    report_df = pd.read_parquet(f"{input_dir}/{const.COMMUNITY_REPORT_TABLE}.parquet")
-    if datatype == "documents":
-        return await get_doc(document_df, idx)
-    elif datatype == "entities":
-        return await get_entity(document_df, entity_df, text_unit_df, entity_embedding_df, report_df, idx)
-    elif datatype == "claims":
-        return await get_claim(input_dir, idx)
-    elif datatype == "sources":
-        return await get_source(document_df, text_unit_df, entity_embedding_df, relationship_df, idx)
-    elif datatype == "reports":
-        return await get_report(document_df, text_unit_df, relationship_df, community_df, report_df, idx)
-    elif datatype == "relationships":
-        return await get_relationship(document_df, text_unit_df, entity_embedding_df, relationship_df, idx)
-    else:
-        raise ValueError(f"Unknown datatype: {datatype}")
-
-
-async def get_doc(document_df: pd.DataFrame, idx: int) -> pd.Series:
-    document_series = document_df.iloc[idx]
-    document_series["title"] = document_series["title"].removesuffix(".txt")
-    return document_series
-
-
-# async def get_entity(input_dir: str, row_id: Optional[int] = None) -> Entity:
-#     entity_df = pd.read_parquet(f"{input_dir}/{consts.ENTITY_TABLE}.parquet")
-#     entity_embedding_df = pd.read_parquet(f"{input_dir}/{consts.ENTITY_EMBEDDING_TABLE}.parquet")
-
-#     entities = read_indexer_entities(entity_df, entity_embedding_df, consts.COMMUNITY_LEVEL)
-#     # TODO optimize performance using like database or dict in memory
-#     for entity in entities:
-#         if int(entity.short_id) == row_id:
-#             return entity
-#     raise ValueError(f"Not Found entity id {row_id}")
-
-
-async def get_entity(
-    document_df: pd.DataFrame,
-    entity_df: pd.DataFrame,
-    text_unit_df: pd.DataFrame,
-    entity_embedding_df: pd.DataFrame,
-    report_df: pd.DataFrame,
-    idx: int
-) -> pd.Series:
-    """提取实体信息."""
-    entity_df = cast(
-        pd.DataFrame,
-        entity_df[["level", "title", "degree", "community", "x", "y"]]
-    )
-    entity_embedding_df.rename(
-        columns={"name": "title"},
-        inplace=True
-    )
-    entity_df = entity_df.merge(entity_embedding_df, on="title", how="inner")
-    entities = entity_df[entity_df["human_readable_id"] == idx]
-    entity = entities.iloc[0]
-    entity["communities"] = {}
-    for row in entities.itertuples():
-        entity["communities"][row.level] = (
-            row.community,
-            report_df[
-                report_df["community"] == row.community
-            ].iloc[0]["title"]
-        ) if row.community else None
-    entity["sources"] = {}
-    for source_id in entity["text_unit_ids"]:
-        text_unit = text_unit_df[text_unit_df["id"] == source_id]
-        title = document_df[
-            document_df["id"] == text_unit["document_ids"].iloc[0][0]
-        ].iloc[0]["title"].removesuffix(".txt")
-        if not entity["sources"].get(title):
-            entity["sources"][title] = []
-        entity["sources"][title].append(text_unit.index[0])
-    for source_list in entity["sources"].values():
-        source_list.sort()
-    return entity
-
-
-# async def get_claim(input_dir: str, row_id: Optional[int] = None) -> Covariate:
-#     covariate_file = f"{input_dir}/{consts.COVARIATE_TABLE}.parquet"
-#     if os.path.exists(covariate_file):
-#         covariate_df = pd.read_parquet(covariate_file)
-#         claims = read_indexer_covariates(covariate_df)
-#     else:
-#         raise ValueError(f"No claims {input_dir} of id {row_id} found")
-#     # TODO optimize performance using like database or dict in memory
-#     for claim in claims:
-#         if int(claim.short_id) == row_id:
-#             return claim
-#     raise ValueError(f"Not Found claim id {row_id}")
-
-
-async def get_claim(input_dir: str, row_id: Optional[int] = None) -> pd.Series:
-    covariate_file = f"{input_dir}/{const.COVARIATE_TABLE}.parquet"
-    if os.path.exists(covariate_file):
-        covariate_df = pd.read_parquet(covariate_file)
-        return covariate_df[covariate_df["human_readable_id"] == str(row_id)].iloc[0]
-    raise ValueError(f"No claims {input_dir} of id {row_id} found")
-
-
-# async def get_source(input_dir: str, row_id: Optional[int] = None) -> TextUnit:
-#     text_unit_df = pd.read_parquet(f"{input_dir}/{consts.TEXT_UNIT_TABLE}.parquet")
-#     text_units = read_indexer_text_units(text_unit_df)
-#     # TODO optimize performance using like database or dict in memory
-#     for text_unit in text_units:
-#         if int(text_unit.short_id) == row_id:
-#             return text_unit
-#     raise ValueError(f"Not Found source id {row_id}")
-
-
-async def get_source(
-    document_df: pd.DataFrame,
-    text_unit_df: pd.DataFrame,
-    entity_embedding_df: pd.DataFrame,
-    relationship_df: pd.DataFrame,
-    row_id: int
-) -> pd.Series:
-    text_unit = text_unit_df.rename(
-        columns={
-            "document_ids": "documents",
-            "entity_ids": "entities",
-            "relationship_ids": "relationships"
+    def get_entity(self, idx: int) -> dict[str, Any]:
+        """提取实体信息."""
+        position = self._entity_by_hrid.get(str(idx))
+        if position is None:
+            raise ValueError(f"Not Found entity id {idx}")
+        entity_row = self.entities.iloc[position].to_dict()
+        name = entity_row.pop("name")
+        node_positions = self._nodes_by_title.get(name)
+        if not node_positions:
+            raise ValueError(f"Not Found entity id {idx}")
+        nodes = self.nodes.iloc[node_positions]
+
+        first_node = nodes.iloc[0]
+        entity = {
+            "level": first_node["level"],
+            "title": name,
+            "degree": first_node["degree"],
+            "community": first_node["community"],
+            "x": first_node["x"],
+            "y": first_node["y"],
+            **entity_row,
         }
-    ).iloc[row_id]
-    for i, id in enumerate(text_unit["documents"]):
-        index = document_df[document_df["id"] == id].index[0]
-        document = document_df[document_df["id"] == id].iloc[0]
-        text_unit["documents"][i] = (index, document["title"].removesuffix(".txt"))
-    for i, id in enumerate(text_unit["entities"]):
-        entity = entity_embedding_df[entity_embedding_df["id"] == id].iloc[0]
-        text_unit["entities"][i] = (entity["human_readable_id"], entity["name"])
-    text_unit["entities"].sort()
-    for i, id in enumerate(text_unit["relationships"]):
-        relationship = relationship_df[relationship_df["id"] == id].iloc[0]
-        text_unit["relationships"][i] = (int(relationship["human_readable_id"]), f"{relationship['source']} ↔ {relationship['target']}")
-    text_unit["relationships"].sort()
-    text_unit["title"] = text_unit["text"].replace("\n", "")
-    if len(text_unit["title"]) > 50:
-        text_unit["title"] = text_unit["title"][:50] + "..."
-    return text_unit
-
-
-# async def get_report(input_dir: str, row_id: Optional[int] = None) -> CommunityReport:
-#     entity_df = pd.read_parquet(f"{input_dir}/{consts.ENTITY_TABLE}.parquet")
-#     report_df = pd.read_parquet(f"{input_dir}/{consts.COMMUNITY_REPORT_TABLE}.parquet")
-#     reports = read_indexer_reports(report_df, entity_df, consts.COMMUNITY_LEVEL)
-#     # TODO optimize performance using like database or dict in memory
-#     for report in reports:
-#         if int(report.short_id) == row_id:
-#             return report
-#     raise ValueError(f"Not Found report id {row_id}")
-
-
-async def get_report(
-    document_df: pd.DataFrame,
-    text_unit_df: pd.DataFrame,
-    relationship_df: pd.DataFrame,
-    community_df: pd.DataFrame,
-    report_df: pd.DataFrame,
-    row_id: int
-) -> pd.Series:
-    report_df = report_df.merge(
-        community_df.rename(columns={"id": "community"})[["community", "relationship_ids", "text_unit_ids"]],
-        on="community",
-        how="inner"
-    ).rename(columns={"relationship_ids": "relationships"})
-    report = report_df[report_df["community"].astype(int) == row_id].iloc[0]
-    for i, relationship_id in enumerate(report["relationships"]):
-        relationship = relationship_df[relationship_df["id"] == relationship_id].iloc[0]
-        report["relationships"][i] = (int(relationship["human_readable_id"]), f"{relationship['source']} ↔ {relationship['target']}")
-    report["relationships"].sort()
-    report["sources"] = {}
-    for source_id in report["text_unit_ids"][0].split(","):
-        text_unit = text_unit_df[text_unit_df["id"] == source_id]
-        title = document_df[
-            document_df["id"] == text_unit["document_ids"].iloc[0][0]
-        ].iloc[0]["title"].removesuffix(".txt")
-        if not report["sources"].get(title):
-            report["sources"][title] = []
-        report["sources"][title].append(text_unit.index[0])
-    for source_list in report["sources"].values():
-        source_list.sort()
-    return report
-
-
-# async def get_relationship(input_dir: str, row_id: Optional[int] = None) -> Relationship:
-#     relationship_df = pd.read_parquet(f"{input_dir}/{consts.RELATIONSHIP_TABLE}.parquet")
-#     relationships = read_indexer_relationships(relationship_df)
-#     # TODO optimize performance using like database or dict in memory
-#     for relationship in relationships:
-#         if int(relationship.short_id) == row_id:
-#             return relationship
-#     raise ValueError(f"Not Found relationship id {row_id}")
-
-
-async def get_relationship(
-    document_df: pd.DataFrame,
-    text_unit_df: pd.DataFrame,
-    entity_embedding_df: pd.DataFrame,
-    relationship_df: pd.DataFrame,
-    row_id: int
-) -> pd.Series:
-    relationship = relationship_df[relationship_df["human_readable_id"] == str(row_id)].iloc[0]
-    relationship["source"] = (
-        entity_embedding_df[
-            entity_embedding_df["name"] == relationship["source"]
-        ].iloc[0]["human_readable_id"],
-        relationship["source"]
-    )
-    relationship["target"] = (
-        entity_embedding_df[
-            entity_embedding_df["name"] == relationship["target"]
-        ].iloc[0]["human_readable_id"],
-        relationship["target"]
-    )
-    relationship["sources"] = {}
-    for source_id in relationship["text_unit_ids"]:
-        text_unit = text_unit_df[text_unit_df["id"] == source_id]
-        title = document_df[
-            document_df["id"] == text_unit["document_ids"].iloc[0][0]
-        ].iloc[0]["title"].removesuffix(".txt")
-        if not relationship["sources"].get(title):
-            relationship["sources"][title] = []
-        relationship["sources"][title].append(text_unit.index[0])
-        relationship["sources"][title].sort()
-    relationship["title"] = f"{relationship['source'][1]} ↔ {relationship['target'][1]}"
-    return relationship
+        entity["communities"] = {}
+        for level, community in zip(nodes["level"].tolist(), nodes["community"].tolist(), strict=True):
+            report_position = self._report_by_community.get(_key(community))
+            entity["communities"][level] = (
+                community,
+                self.reports.iloc[report_position]["title"]
+            ) if report_position is not None else None
+        entity["sources"] = self._get_sources(_as_list(entity_row["text_unit_ids"]))
+        return entity
+
+    def get_claim(self, idx: int) -> dict[str, Any]:
+        if self.covariates is None:
+            raise ValueError(f"No claims {self.input_dir} of id {idx} found")
+        position = self._claim_by_hrid.get(str(idx))
+        if position is None:
+            raise ValueError(f"Not Found claim id {idx}")
+        return self.covariates.iloc[position].to_dict()
+
+    def get_source(self, idx: int) -> dict[str, Any]:
+        if not 0 <= idx < len(self.text_units):
+            raise ValueError(f"Not Found source id {idx}")
+        text_unit = self.text_units.iloc[idx].to_dict()
+        text_unit["documents"] = [
+            (position, self.documents.iloc[position]["title"].removesuffix(".txt"))
+            for position in (
+                self._document_by_id.get(id) for id in _as_list(text_unit.pop("document_ids"))
+            )
+            if position is not None
+        ]
+        text_unit["entities"] = sorted(
+            (entity["human_readable_id"], entity["name"])
+            for entity in (
+                self._get_row(self.entities, self._entity_by_id, id)
+                for id in _as_list(text_unit.pop("entity_ids", None))
+            )
+            if entity is not None
+        )
+        text_unit["relationships"] = self._get_relationship_titles(
+            _as_list(text_unit.pop("relationship_ids", None))
+        )
+        text_unit["title"] = text_unit["text"].replace("\n", "")
+        if len(text_unit["title"]) > 50:
+            text_unit["title"] = text_unit["title"][:50] + "..."
+        return text_unit
+
+    def get_report(self, idx: int) -> dict[str, Any]:
+        position = self._report_by_community.get(str(idx))
+        community_position = self._community_by_id.get(str(idx))
+        if position is None or community_position is None:
+            raise ValueError(f"Not Found report id {idx}")
+        report = self.reports.iloc[position].to_dict()
+        community = self.communities.iloc[community_position]
+        report["relationships"] = self._get_relationship_titles(_as_list(community["relationship_ids"]))
+        # the community text unit ids are stored as comma separated strings
+        text_unit_ids = [
+            text_unit_id
+            for text_unit_ids in _as_list(community["text_unit_ids"])
+            for text_unit_id in text_unit_ids.split(",")
+        ]
+        report["text_unit_ids"] = text_unit_ids
+        report["sources"] = self._get_sources(text_unit_ids)
+        return report
+
+    def get_relationship(self, idx: int) -> dict[str, Any]:
+        position = self._relationship_by_hrid.get(str(idx))
+        if position is None:
+            raise ValueError(f"Not Found relationship id {idx}")
+        relationship = self.relationships.iloc[position].to_dict()
+        for end in ["source", "target"]:
+            entity = self._get_row(self.entities, self._entity_by_name, relationship[end])
+            relationship[end] = (
+                entity["human_readable_id"] if entity is not None else None,
+                relationship[end]
+            )
+        relationship["sources"] = self._get_sources(_as_list(relationship["text_unit_ids"]))
+        relationship["title"] = f"{relationship['source'][1]} ↔ {relationship['target'][1]}"
+        return relationship
+
+    @staticmethod
+    def _get_row(df: pd.DataFrame, index: dict[str, int], key: Any) -> pd.Series | None:
+        position = index.get(_key(key))  # type: ignore
+        return df.iloc[position] if position is not None else None
+
+    def _get_relationship_titles(self, relationship_ids: list[str]) -> list[tuple[int, str]]:
+        return sorted(
+            (int(relationship["human_readable_id"]), f"{relationship['source']} ↔ {relationship['target']}")
+            for relationship in (
+                self._get_row(self.relationships, self._relationship_by_id, id) for id in relationship_ids
+            )
+            if relationship is not None
+        )
+
+    def _get_sources(self, text_unit_ids: list[str]) -> dict[str, list[int]]:
+        """Group text units by the title of their first document."""
+        sources: dict[str, list[int]] = {}
+        for text_unit_id in text_unit_ids:
+            position = self._text_unit_by_id.get(text_unit_id)
+            if position is None:
+                continue
+            document_ids = _as_list(self.text_units.iloc[position]["document_ids"])
+            document = self._get_row(self.documents, self._document_by_id, document_ids[0]) if document_ids else None
+            if document is None:
+                continue
+            sources.setdefault(document["title"].removesuffix(".txt"), []).append(position)
+        for source_list in sources.values():
+            source_list.sort()
+        return sources
+
+
+_index_data_cache: dict[str, tuple[str, IndexData]] = {}
+
+
+async def load_index_data(input_dir: str) -> IndexData:
+    """Get the cached reference data of an index, reloading it when the artifacts change."""
+    version = get_artifacts_version(input_dir)
+    cached = _index_data_cache.get(input_dir)
+    if cached and cached[0] == version:
+        return cached[1]
+    index_data = IndexData(input_dir)
+    _index_data_cache[input_dir] = (version, index_data)
+    return index_data
+
+
+async def get_index_data(input_dir: str, datatype: str, idx: int) -> dict[str, Any]:
+    index_data = await load_index_data(input_dir)
+    return index_data.get(datatype, idx)
+
+
+async def get_many_index_data(
+    input_dir: str, keys: Iterable[tuple[str, int]]
+) -> dict[tuple[str, int], dict[str, Any]]:
+    index_data = await load_index_data(input_dir)
+    return index_data.get_many(keys)
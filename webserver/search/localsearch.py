@@ -1,4 +1,7 @@
+import hashlib
+import logging
 import os
+import re
 
 import pandas as pd
 import tiktoken
@@ -27,6 +30,8 @@ from graphrag.vector_stores.lancedb import LanceDBVectorStore
 from webserver import const
 from webserver.configs import settings
 
+logger = logging.getLogger(__name__)
+
 
 async def load_local_context(
     input_dir: str,
@@ -38,7 +43,8 @@ async def load_local_context(
     entity_df = pd.read_parquet(f"{input_dir}/{const.ENTITY_TABLE}.parquet")
     entity_embedding_df = pd.read_parquet(f"{input_dir}/{const.ENTITY_EMBEDDING_TABLE}.parquet")
 
-    entities = read_indexer_entities(entity_df, entity_embedding_df, community_level)
+    # columnar tables keep the embeddings in one matrix and share interned ids between tables
+    entities = read_indexer_entities(entity_df, entity_embedding_df, community_level, columnar=True)
 
     vector_store_args = (
         settings.embeddings.vector_store if settings.embeddings.vector_store else {}
@@ -48,12 +54,14 @@ async def load_local_context(
 
     description_embedding_store = __get_embedding_description_store(
         entities=entities,
+        input_dir=input_dir,
+        community_level=community_level,
         vector_store_type=vector_store_type,
         config_args=vector_store_args,
     )
 
     relationship_df = pd.read_parquet(f"{input_dir}/{const.RELATIONSHIP_TABLE}.parquet")
-    relationships = read_indexer_relationships(relationship_df)
+    relationships = read_indexer_relationships(relationship_df, columnar=True)
 
     covariate_file = f"{input_dir}/{const.COVARIATE_TABLE}.parquet"
     if os.path.exists(covariate_file):
@@ -64,10 +72,10 @@ async def load_local_context(
         covariates = None
 
     report_df = pd.read_parquet(f"{input_dir}/{const.COMMUNITY_REPORT_TABLE}.parquet")
-    reports = read_indexer_reports(report_df, entity_df, community_level)
+    reports = read_indexer_reports(report_df, entity_df, community_level, columnar=True)
 
     text_unit_df = pd.read_parquet(f"{input_dir}/{const.TEXT_UNIT_TABLE}.parquet")
-    text_units = read_indexer_text_units(text_unit_df)
+    text_units = read_indexer_text_units(text_unit_df, columnar=True)
 
     context_builder = LocalSearchMixedContext(
         community_reports=reports,
@@ -86,17 +94,30 @@ async def load_local_context(
 
 def __get_embedding_description_store(
         entities: list[Entity],
+        input_dir: str,
+        community_level: int,
         vector_store_type: str = VectorStoreType.LanceDB,
         config_args: dict | None = None,
 ):
     """Get the embedding description store."""
-    if not config_args:
-        config_args = {}
+    config_args = {**config_args} if config_args else {}
 
     collection_name = config_args.get(
         "query_collection_name", "entity_description_embeddings"
     )
     config_args.update({"collection_name": collection_name})
+
+    if vector_store_type == VectorStoreType.LanceDB and config_args.get("overwrite", True):
+        # keep one persistent table per index and community level, named after the content hash
+        # of the entity artifacts, so the table is only written when the index changes
+        return __get_persistent_description_store(
+            entities=entities,
+            input_dir=input_dir,
+            community_level=community_level,
+            collection_name=collection_name,
+            db_uri=config_args.get("db_uri", settings.lancedb_uri),
+        )
+
     description_embedding_store = VectorStoreFactory.get_vector_store(
         vector_store_type=vector_store_type, kwargs=config_args
     )
@@ -111,7 +132,7 @@ def __get_embedding_description_store(
         store_entity_semantic_embeddings(
             entities=entities, vectorstore=description_embedding_store
         )
-    else:
+    elif vector_store_type != VectorStoreType.Numpy:
         # load description embeddings to an in-memory lancedb vectorstore
         # and connect to a remote db, specify url and port values.
         description_embedding_store = LanceDBVectorStore(
@@ -131,6 +152,68 @@ def __get_embedding_description_store(
     return description_embedding_store
 
 
+def __get_persistent_description_store(
+        entities: list[Entity],
+        input_dir: str,
+        community_level: int,
+        collection_name: str,
+        db_uri: str,
+) -> LanceDBVectorStore:
+    """Open the description embedding table of an index, building it first if it does not exist."""
+    index_id = os.path.basename(os.path.dirname(os.path.abspath(input_dir)))
+    content_hash = __hash_artifacts(
+        [
+            f"{input_dir}/{const.ENTITY_TABLE}.parquet",
+            f"{input_dir}/{const.ENTITY_EMBEDDING_TABLE}.parquet",
+        ],
+        salt=str(community_level),
+    )
+    table_prefix = f"{collection_name}-level{community_level}-"
+    description_embedding_store = LanceDBVectorStore(
+        collection_name=f"{table_prefix}{content_hash[:16]}"
+    )
+    description_embedding_store.connect(
+        db_uri=os.path.join(db_uri, re.sub(r"[^\w.-]", "_", index_id))
+    )
+    db_connection = description_embedding_store.db_connection
+    try:
+        description_embedding_store.document_collection = db_connection.open_table(
+            description_embedding_store.collection_name
+        )
+    except (FileNotFoundError, ValueError):
+        logger.info("building %s for index %s", description_embedding_store.collection_name, index_id)
+        store_entity_semantic_embeddings(
+            entities=entities, vectorstore=description_embedding_store
+        )
+        # drop the tables written for earlier versions of the index
+        for table_name in __list_tables(db_connection):
+            if table_name.startswith(table_prefix) and table_name != description_embedding_store.collection_name:
+                db_connection.drop_table(table_name)
+    return description_embedding_store
+
+
+def __hash_artifacts(paths: list[str], salt: str = "") -> str:
+    """Hash the content of artifact files."""
+    digest = hashlib.sha256(salt.encode("utf-8"))
+    for path in paths:
+        with open(path, "rb") as file:
+            while chunk := file.read(1 << 20):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def __list_tables(db_connection) -> list[str]:
+    """List all tables of a lancedb connection, following its pagination."""
+    table_names: list[str] = []
+    while page := [
+        name
+        for name in db_connection.table_names(page_token=table_names[-1] if table_names else None, limit=100)
+        if name not in table_names
+    ]:
+        table_names.extend(page)
+    return table_names
+
+
 async def build_local_question_gen(llm: BaseLLM, context_builder: LocalContextBuilder = None,
                                    token_encoder: tiktoken.Encoding | None = None) -> LocalQuestionGen:
     local_context_params = {
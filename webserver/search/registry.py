@@ -0,0 +1,123 @@
+"""索引上下文注册表."""
+import asyncio
+import hashlib
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import tiktoken
+
+from graphrag.query.context_builder.builders import (
+    GlobalContextBuilder,
+    LocalContextBuilder,
+)
+from graphrag.query.llm.base import BaseTextEmbedding
+from webserver.configs import settings
+
+from .globalsearch import MapResultCache, load_global_context, map_cache
+from .localsearch import load_local_context
+
+logger = logging.getLogger(__name__)
+
+ContextBuilder = LocalContextBuilder | GlobalContextBuilder
+
+
+def get_artifacts_dir(index_id: str) -> str:
+    """Return the artifacts directory of an index."""
+    return os.path.join(settings.data, index_id, "artifacts")
+
+
+def get_artifacts_version(input_dir: str) -> str:
+    """Fingerprint the artifacts directory from the name, size and mtime of every file in it.
+
+    Any re-run of the indexer rewrites the parquet tables and stats.json, which changes the fingerprint.
+    """
+    entries = [f"{os.stat(input_dir).st_mtime_ns}"]
+    with os.scandir(input_dir) as it:
+        for entry in sorted(it, key=lambda e: e.name):
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.md5("\n".join(entries).encode("utf-8")).hexdigest()  # noqa: S324
+
+
+@dataclass
+class _RegistryEntry:
+    version: str
+    context_builder: ContextBuilder
+
+
+class ContextRegistry:
+    """Process-wide cache of context builders keyed by (mode, index_id, community_level).
+
+    Each context builder is built once from the index artifacts and shared by all requests,
+    so callers must treat it as read-only. An entry is rebuilt when the artifacts version changes.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple[str, str, int], _RegistryEntry] = {}
+        self._locks: dict[tuple[str, str, int], asyncio.Lock] = {}
+
+    async def get_local_context(
+        self,
+        index_id: str,
+        embedder: BaseTextEmbedding,
+        token_encoder: tiktoken.Encoding | None = None,
+        community_level: int = 2,
+    ) -> LocalContextBuilder:
+        """Get the shared local context builder of an index."""
+        return await self._get(
+            ("local", index_id, community_level),
+            lambda input_dir: load_local_context(
+                input_dir, embedder, token_encoder, community_level
+            ),
+        )  # type: ignore
+
+    async def get_global_context(
+        self,
+        index_id: str,
+        token_encoder: tiktoken.Encoding | None = None,
+        community_level: int = 2,
+    ) -> GlobalContextBuilder:
+        """Get the shared global context builder of an index."""
+        return await self._get(
+            ("global", index_id, community_level),
+            lambda input_dir: load_global_context(
+                input_dir, token_encoder, community_level
+            ),
+        )  # type: ignore
+
+    def invalidate(self, index_id: str | None = None) -> None:
+        """Drop the cached context builders of an index, or of every index if none is given."""
+        for key in list(self._entries):
+            if index_id is None or key[1] == index_id:
+                del self._entries[key]
+
+    async def _get(
+        self,
+        key: tuple[str, str, int],
+        loader: Callable[[str], Awaitable[ContextBuilder]],
+    ) -> ContextBuilder:
+        input_dir = get_artifacts_dir(key[1])
+        version = get_artifacts_version(input_dir)
+        entry = self._entries.get(key)
+        if entry and entry.version == version:
+            return entry.context_builder
+
+        # only one request builds a missing entry, the others wait for it
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry and entry.version == version:
+                return entry.context_builder
+            logger.info("loading %s context of %s at community level %s", *key)
+            if entry is not None and key[0] == "global" and isinstance(map_cache, MapResultCache):
+                # the artifacts changed, drop the map results of the old reports
+                await map_cache.clear()
+            context_builder = await loader(input_dir)
+            self._entries[key] = _RegistryEntry(version, context_builder)
+            return context_builder
+
+
+context_registry = ContextRegistry()